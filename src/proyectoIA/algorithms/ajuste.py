@@ -0,0 +1,259 @@
+"""
+Ajuste automático de beam_width (beam_search) y epsilon (dynamic weighting).
+
+Se corren ambas búsquedas sobre un corpus de mapas con varios valores de cada
+parámetro y, para cada valor, se ajusta un modelo lineal que predice el
+tiempo (en escala logarítmica) y el costo relativo al óptimo a partir de
+características del mapa: tamaño, densidad de veneno y agrupamiento.
+
+Uso (desde la carpeta src):
+    python -m proyectoIA.algorithms.ajuste --salida modelo.json
+    python -m proyectoIA.algorithms.ajuste --tamanos 50 200 1000 --semillas 3 --salida modelo.json
+
+Luego, en código:
+    modelos = cargar_modelos("modelo.json")
+    modelos["epsilon"].max_tiempo = 0.05       # segundos por búsqueda
+    dynamic_weighting_search(n, inicio, meta, grid, epsilon=modelos["epsilon"])
+    modelos["beam_width"].max_costo = 1.2      # a lo más 20 % sobre el óptimo
+    beam_search(n, inicio, meta, grid, beam_width=modelos["beam_width"])
+"""
+import argparse
+import json
+import math
+import sys
+import time
+
+import numpy as np
+
+from .beam_search import beam_search
+from .campo_distancias import CampoDistancias
+from .dynamic import dynamic_weighting_search
+from .generador import GENERADORES
+from .grid import COSTO_VENENO
+
+VERSION_MODELO = 1
+
+# Valores candidatos de cada parámetro
+BEAM_WIDTHS = (3, 5, 10, 30, 100, 300)
+EPSILONS = (0, 0.5, 1, 2, 3, 5)
+
+# parámetro -> (búsqueda, candidatos)
+PARAMETROS = {
+    "beam_width": (beam_search, BEAM_WIDTHS),
+    "epsilon": (dynamic_weighting_search, EPSILONS),
+}
+
+# Costo relativo asignado cuando la búsqueda no encuentra camino
+COSTO_SIN_CAMINO = 10.0
+
+TAMANOS_POR_DEFECTO = (50, 100, 200, 500)
+DENSIDADES_POR_DEFECTO = (0.1, 0.3, 0.5)
+
+
+def caracteristicas(grid):
+    """
+    Retorna [log10(celdas), densidad, agrupamiento] del tablero.
+    agrupamiento: fracción de los vecinos de las celdas con veneno que
+    también tienen veneno (cercano a la densidad si el veneno es aleatorio,
+    cercano a 1 si forma bloques o muros).
+    """
+    celdas = np.frombuffer(grid.costos, dtype=np.uint8).reshape(grid.rows + 2, grid.ancho)
+    veneno = celdas == COSTO_VENENO
+    num_venenos = int(veneno.sum())
+
+    densidad = num_venenos / (grid.rows * grid.cols)
+    agrupamiento = 0.0
+    if num_venenos:
+        pares = int((veneno[:, 1:] & veneno[:, :-1]).sum()) + int((veneno[1:] & veneno[:-1]).sum())
+        # Cada par cuenta como vecino para las dos celdas; se normaliza por 4 vecinos
+        agrupamiento = 2 * pares / (4 * num_venenos)
+    return [math.log10(grid.rows * grid.cols), densidad, agrupamiento]
+
+
+def corpus_generado(tamanos=TAMANOS_POR_DEFECTO, generadores=tuple(GENERADORES),
+                    semillas=2, densidades=DENSIDADES_POR_DEFECTO):
+    """Lista de (grid, inicio, meta) con los generadores de generador.py"""
+    corpus = []
+    for nombre_generador in generadores:
+        for tamano in tamanos:
+            for semilla in range(semillas):
+                if nombre_generador == "aleatorio":
+                    for densidad in densidades:
+                        corpus.append(GENERADORES[nombre_generador](tamano, tamano, densidad, semilla))
+                else:
+                    corpus.append(GENERADORES[nombre_generador](tamano, tamano, semilla))
+    return corpus
+
+
+def medir(parametro, corpus, candidatos=None):
+    """
+    Corre la búsqueda del parámetro con cada candidato sobre cada mapa.
+    Retorna una lista de {caracteristicas, candidato, tiempo, costo} donde
+    costo es el costo del camino dividido por el costo óptimo.
+    """
+    funcion, por_defecto = PARAMETROS[parametro]
+    candidatos = candidatos or por_defecto
+
+    mediciones = []
+    for grid, inicio, meta in corpus:
+        optimo = CampoDistancias(None, meta, grid).distancia(inicio)
+        if optimo is None:
+            continue
+        x = caracteristicas(grid)
+        for candidato in candidatos:
+            t0 = time.perf_counter()
+            camino = funcion((grid.rows, grid.cols), inicio, meta, grid, **{parametro: candidato})
+            tiempo = time.perf_counter() - t0
+
+            costo = COSTO_SIN_CAMINO
+            if camino is not None and optimo > 0:
+                costo = sum(grid.costos[grid.indice(pos)] for pos in camino[1:]) / optimo
+            elif camino is not None:
+                costo = 1.0
+            mediciones.append({
+                "caracteristicas": x,
+                "candidato": candidato,
+                "tiempo": tiempo,
+                "costo": costo,
+            })
+    return mediciones
+
+
+def _ajustar_lineal(filas, valores):
+    """Mínimos cuadrados de valores ~ [1, caracteristicas]"""
+    X = np.array([[1.0] + fila for fila in filas])
+    coeficientes, *_ = np.linalg.lstsq(X, np.array(valores), rcond=None)
+    return [float(c) for c in coeficientes]
+
+
+class ModeloParametros:
+    """
+    Modelo ajustado para un parámetro. Para cada candidato guarda los
+    coeficientes de log(tiempo) y de costo relativo sobre [1, caracteristicas].
+
+    max_tiempo / max_costo: objetivo por defecto de elegir(). Se puede pasar
+    el modelo directamente como beam_width=... o epsilon=... y la búsqueda
+    llama a elegir(grid).
+    """
+
+    def __init__(self, parametro, coeficientes, max_tiempo=None, max_costo=None):
+        self.parametro = parametro
+        # candidato -> {"tiempo": [...], "costo": [...]}
+        self.coeficientes = coeficientes
+        self.max_tiempo = max_tiempo
+        self.max_costo = max_costo
+
+    @classmethod
+    def ajustar(cls, parametro, mediciones):
+        por_candidato = {}
+        for medicion in mediciones:
+            por_candidato.setdefault(medicion["candidato"], []).append(medicion)
+
+        coeficientes = {}
+        for candidato, filas in por_candidato.items():
+            x = [m["caracteristicas"] for m in filas]
+            coeficientes[candidato] = {
+                "tiempo": _ajustar_lineal(x, [math.log(max(m["tiempo"], 1e-6)) for m in filas]),
+                "costo": _ajustar_lineal(x, [m["costo"] for m in filas]),
+            }
+        return cls(parametro, coeficientes)
+
+    def predecir(self, grid):
+        """Lista de (candidato, tiempo estimado en segundos, costo relativo estimado)"""
+        x = [1.0] + caracteristicas(grid)
+        predicciones = []
+        for candidato, modelo in self.coeficientes.items():
+            log_tiempo = sum(c * v for c, v in zip(modelo["tiempo"], x))
+            costo = sum(c * v for c, v in zip(modelo["costo"], x))
+            predicciones.append((candidato, math.exp(log_tiempo), max(costo, 1.0)))
+        return predicciones
+
+    def elegir(self, grid, max_tiempo=None, max_costo=None):
+        """
+        Elige el candidato para el tablero:
+        - con max_tiempo: el de menor costo entre los que cumplen el tiempo
+        - con max_costo: el más rápido entre los que cumplen el costo
+        - sin objetivo: el de menor costo
+        Si ninguno cumple, el más cercano a la cota (el más rápido o el de
+        menor costo según corresponda).
+        """
+        max_tiempo = self.max_tiempo if max_tiempo is None else max_tiempo
+        max_costo = self.max_costo if max_costo is None else max_costo
+        predicciones = self.predecir(grid)
+
+        factibles = [p for p in predicciones
+                     if (max_tiempo is None or p[1] <= max_tiempo)
+                     and (max_costo is None or p[2] <= max_costo)]
+        if factibles:
+            if max_costo is not None:
+                return min(factibles, key=lambda p: (p[1], p[2]))[0]
+            return min(factibles, key=lambda p: (p[2], p[1]))[0]
+        if max_costo is not None:
+            return min(predicciones, key=lambda p: (p[2], p[1]))[0]
+        return min(predicciones, key=lambda p: (p[1], p[2]))[0]
+
+    def como_dict(self):
+        return {
+            "parametro": self.parametro,
+            # JSON no admite claves numéricas: se guarda como lista de pares
+            "coeficientes": [[candidato, modelo] for candidato, modelo in self.coeficientes.items()],
+        }
+
+    @classmethod
+    def desde_dict(cls, datos):
+        return cls(datos["parametro"], {candidato: modelo for candidato, modelo in datos["coeficientes"]})
+
+
+def guardar_modelos(ruta, modelos):
+    datos = {
+        "version": VERSION_MODELO,
+        "caracteristicas": ["log10_celdas", "densidad", "agrupamiento"],
+        "modelos": {parametro: modelo.como_dict() for parametro, modelo in modelos.items()},
+    }
+    with open(ruta, "w", encoding="utf-8") as file:
+        json.dump(datos, file, indent=2)
+
+
+def cargar_modelos(ruta):
+    """Retorna {parametro: ModeloParametros} desde un archivo de guardar_modelos"""
+    with open(ruta, encoding="utf-8") as file:
+        datos = json.load(file)
+    if datos.get("version") != VERSION_MODELO:
+        raise ValueError(f"Versión de modelo no soportada en '{ruta}': {datos.get('version')}")
+    return {parametro: ModeloParametros.desde_dict(modelo) for parametro, modelo in datos["modelos"].items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ajuste de beam_width y epsilon")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=TAMANOS_POR_DEFECTO)
+    parser.add_argument("--generadores", nargs="+", choices=sorted(GENERADORES), default=sorted(GENERADORES))
+    parser.add_argument("--semillas", type=int, default=2, help="mapas distintos por configuración")
+    parser.add_argument("--densidades", type=float, nargs="+", default=DENSIDADES_POR_DEFECTO,
+                        help="densidades de veneno del generador aleatorio")
+    parser.add_argument("--parametros", nargs="+", choices=sorted(PARAMETROS), default=sorted(PARAMETROS))
+    parser.add_argument("--salida", required=True, help="archivo JSON donde guardar el modelo")
+    args = parser.parse_args(argv)
+
+    corpus = corpus_generado(args.tamanos, args.generadores, args.semillas, args.densidades)
+    print(f"Corpus: {len(corpus)} mapas")
+
+    modelos = {}
+    for parametro in args.parametros:
+        t0 = time.perf_counter()
+        mediciones = medir(parametro, corpus)
+        modelos[parametro] = ModeloParametros.ajustar(parametro, mediciones)
+        print(f"\n{parametro}: {len(mediciones)} mediciones en {time.perf_counter() - t0:.1f} s")
+        print(f"  {'valor':>8} {'tiempo medio':>14} {'costo medio':>12}")
+        for candidato in modelos[parametro].coeficientes:
+            filas = [m for m in mediciones if m["candidato"] == candidato]
+            tiempo = sum(m["tiempo"] for m in filas) / len(filas)
+            costo = sum(m["costo"] for m in filas) / len(filas)
+            print(f"  {candidato:>8} {tiempo * 1000:>11.2f} ms {costo:>12.3f}")
+
+    guardar_modelos(args.salida, modelos)
+    print(f"\nModelo guardado en '{args.salida}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
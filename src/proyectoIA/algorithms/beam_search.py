@@ -1,3 +1,10 @@
+from array import array
+from contextlib import nullcontext
+import time
+
+from .grid import INTERVALO_PROGRESO, como_grid, dimensiones
+
+
 # Calcula la distancia manhattan entre 2 puntos
 def manhattan(pos1, pos2):
     return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
@@ -21,14 +28,14 @@ def moverDerecha(posicion):
 def isPosibleArriba(posicion):
     return posicion[0] - 1 >= 0
 
-def isPosibleAbajo(posicion, n):
-    return posicion[0] + 1 < n
+def isPosibleAbajo(posicion, rows):
+    return posicion[0] + 1 < rows
 
 def isPosibleIzquierda(posicion):
     return posicion[1] - 1 >= 0
 
-def isPosibleDerecha(posicion, n):
-    return posicion[1] + 1 < n
+def isPosibleDerecha(posicion, cols):
+    return posicion[1] + 1 < cols
 
 def isNodoMeta(meta, posicion):
     return meta[0] == posicion[0] and meta[1] == posicion[1]
@@ -36,16 +43,20 @@ def isNodoMeta(meta, posicion):
 
 def calcular_beam_width(n, num_obstaculos):
     """
-    n: tamaño del tablero (nxn)
+    n: tamaño del tablero (n para nxn o tupla (rows, cols))
     num_obstaculos: cantidad de obstáculos en el tablero
     """
-    densidad = num_obstaculos / (n * n)
+    rows, cols = dimensiones(n)
+    densidad = num_obstaculos / (rows * cols)
     
-    if n <= 10:
+    # El lado mayor determina la escala del tablero
+    lado = max(rows, cols)
+    
+    if lado <= 10:
         base = 5
-    elif n <= 30:
+    elif lado <= 30:
         base = 4
-    elif n <= 50:
+    elif lado <= 50:
         base = 3
     else:
         base = 3
@@ -70,15 +81,16 @@ def expandir_nodo(nodo_actual, meta, obstaculos, n, indice_padre):
     """
     posicion_actual = nodo_actual[0]
     g_actual = nodo_actual[2]
+    rows, cols = dimensiones(n)
     
     sucesores = []
     
     # Definir movimientos posibles
     movimientos = [
         (isPosibleArriba(posicion_actual), moverArriba, "arriba"),
-        (isPosibleAbajo(posicion_actual, n), moverAbajo, "abajo"),
+        (isPosibleAbajo(posicion_actual, rows), moverAbajo, "abajo"),
         (isPosibleIzquierda(posicion_actual), moverIzquierda, "izquierda"),
-        (isPosibleDerecha(posicion_actual, n), moverDerecha, "derecha")
+        (isPosibleDerecha(posicion_actual, cols), moverDerecha, "derecha")
     ]
     
     for es_posible, mover, direccion in movimientos:
@@ -113,74 +125,468 @@ def reconstruir_camino(closedList, indice_meta):
     return camino
 
 
-def beam_search(n, inicio, meta, obstaculos):
+def reconstruir_camino_grid(grid, cerrados_pos, cerrados_padre, indice_meta):
+    """
+    Igual que reconstruir_camino pero sobre los buffers planos
+    de beam_search (posición e índice del padre de cada nodo)
+    """
+    camino = []
+    indice_actual = indice_meta
     
-    # Convertir obstáculos a set para búsquedas O(1)
-    obstaculos_set = set(obstaculos) if not isinstance(obstaculos, set) else obstaculos
+    while indice_actual != -1:
+        camino.append(grid.posicion(cerrados_pos[indice_actual]))
+        indice_actual = cerrados_padre[indice_actual]
     
-    beamWidth = calcular_beam_width(n, len(obstaculos))
+    camino.reverse()
+    return camino
+
+
+# Sucesores mínimos para usar selección parcial en seleccionar_mejores;
+# con menos, ordenar la lista completa es más rápido
+MIN_SELECCION_PARCIAL = 1000
+
+
+def seleccionar_mejores(sucesores, k):
+    """
+    Los k sucesores de menor f_n, en el mismo orden (estable) que ordenar
+    todo y tomar los primeros k. Con muchos sucesores se hace una selección
+    parcial (np.partition) y solo se ordenan los k elegidos.
+    """
+    if len(sucesores) <= k or len(sucesores) < MIN_SELECCION_PARCIAL:
+        sucesores.sort(key=lambda x: x[4])
+        return sucesores[:k]
+
+    # numpy solo hace falta aquí: importarlo al cargar el módulo demora el
+    # arranque de todo lo que usa beam_search (la línea de comandos)
+    import numpy as np
+    f = np.fromiter((s[4] for s in sucesores), dtype=np.int64, count=len(sucesores))
+    umbral = np.partition(f, k - 1)[k - 1]
+    # Todos los de f menor al umbral y los primeros con f igual, como en el sort estable
+    menores = np.flatnonzero(f < umbral)
+    iguales = np.flatnonzero(f == umbral)[:k - len(menores)]
+    elegidos = np.concatenate((menores, iguales))
+    elegidos = elegidos[np.argsort(f[elegidos], kind="stable")]
+    return [sucesores[i] for i in elegidos.tolist()]
+
+
+# Nodos mínimos del beam por proceso para repartir la expansión;
+# con menos, comunicar los bloques cuesta más que expandirlos
+MIN_NODOS_POR_PROCESO = 256
+
+
+def expandir_bloque(grid, bloque, meta_row, meta_col):
+    """
+    Expande un bloque del beam en un proceso trabajador.
+    bloque: lista de (índice del nodo, celda, g_n)
+    Retorna los sucesores (celda, índice del padre, g_n, h_n, f_n) en el
+    mismo orden que la expansión secuencial, sin filtrar los visitados
+    (eso lo hace el proceso principal, que es el único que los conoce).
+    """
+    costos = grid.costos
+    ancho = grid.ancho
+    movimientos = ((-ancho, -1, 0), (ancho, 1, 0), (-1, 0, -1), (1, 0, 1))
     
-    # closedList: [posicion, indice_padre, g_n, h_n]
-    closedList = []
+    sucesores = []
+    for indice_nodo, actual, g_actual in bloque:
+        row, col = divmod(actual, ancho)
+        for desplazamiento, d_row, d_col in movimientos:
+            costo_movimiento = costos[actual + desplazamiento]
+            if costo_movimiento:
+                g_n = g_actual + costo_movimiento
+                h_n = abs(row + d_row - meta_row) + abs(col + d_col - meta_col)
+                sucesores.append((actual + desplazamiento, indice_nodo, g_n, h_n, g_n + h_n))
+    return sucesores
+
+
+def beam_search(n, inicio, meta, obstaculos, progreso=None, estadisticas=None,
+                beam_width=None, procesos=1):
+    """
+    beam_width: ancho del beam, al menos 1 (None: se calcula con
+    calcular_beam_width; ValueError si es menor que 1).
+    Con anchos grandes (cientos o miles) se encuentran mejores caminos.
+    También puede ser un modelo de ajuste.py, que elige el ancho según el
+    tablero.
+    procesos: con más de 1, la expansión de beams anchos se reparte entre
+    procesos que comparten el tablero en memoria compartida. El resultado es
+    el mismo que con un proceso.
+    progreso / estadisticas: ver estadisticas.py.
+    """
+    t_preparacion = time.perf_counter()
     
-    visitados = set()
-    visitados.add(inicio)
+    # Tablero compacto (se reutiliza si obstaculos ya es un Grid)
+    grid = como_grid(n, obstaculos)
+    costos = grid.costos
+    ancho = grid.ancho
+    
+    if beam_width is None:
+        num_obstaculos = grid.contar_venenos() if obstaculos is grid else len(obstaculos)
+        beamWidth = calcular_beam_width((grid.rows, grid.cols), num_obstaculos)
+    elif hasattr(beam_width, "elegir"):
+        beamWidth = beam_width.elegir(grid)
+    else:
+        beamWidth = beam_width
+    if beamWidth < 1:
+        raise ValueError(f"beam_width debe ser al menos 1: {beamWidth!r}")
+    
+    idx_inicio = grid.indice(inicio)
+    idx_meta = grid.indice(meta)
+    meta_row, meta_col = divmod(idx_meta, ancho)
+    
+    # Movimientos: arriba, abajo, izquierda, derecha
+    # (desplazamiento, cambio de fila, cambio de columna)
+    movimientos = ((-ancho, -1, 0), (ancho, 1, 0), (-1, 0, -1), (1, 0, 1))
+    
+    # closedList en buffers planos: posición, índice del padre y g_n de cada nodo
+    cerrados_pos = array('i', [idx_inicio])
+    cerrados_padre = array('i', [-1])
+    cerrados_g = array('i', [0])
     
     h_inicial = manhattan(inicio, meta)
-    closedList.append([inicio, None, 0, h_inicial])
     
     if inicio == meta:
         return [inicio]
     
+    # Marcas reutilizables del tablero: visitada si marca == visitada
+    buffers = grid.tomar_buffers()
+    visitados = buffers.marcas
+    visitada = buffers.iniciar()
+    visitados[idx_inicio] = visitada
+    
     openList = [0]
     iteracion = 0
-    max_iteraciones = n * n * 2
+    max_iteraciones = grid.rows * grid.cols * 2
     
     # Detección de estancamiento
     mejor_h_previo = h_inicial
     iteraciones_sin_mejora = 0
     
-    while openList and iteracion < max_iteraciones:
+    # Contadores (se actualizan una vez por iteración)
+    nodos_expandidos = 0
+    inserciones = 0
+    truncamientos = 0
+    max_frontera = 0
+    siguiente_reporte = INTERVALO_PROGRESO if progreso is not None else -1
+    
+    # Pool de procesos solo si el beam puede llegar a repartirse
+    contexto_pool = nullcontext()
+    if procesos > 1 and beamWidth >= 2 * MIN_NODOS_POR_PROCESO:
+        from .lote import _ejecutar_en_worker, pool_compartido
+        contexto_pool = pool_compartido(grid, procesos)
+    
+    indice_meta = -1
+    salida = "max_iteraciones"
+    t_busqueda = time.perf_counter()
+    with contexto_pool as pool:
+        while openList and iteracion < max_iteraciones:
+            iteracion += 1
+            todos_sucesores = []
+            
+            nodos_expandidos += len(openList)
+            if siguiente_reporte != -1 and nodos_expandidos >= siguiente_reporte:
+                siguiente_reporte = nodos_expandidos + INTERVALO_PROGRESO
+                if progreso(nodos_expandidos, len(openList)):
+                    salida = "cancelado"
+                    break
+            
+            if pool is not None and len(openList) >= 2 * MIN_NODOS_POR_PROCESO:
+                # Expandir en paralelo y filtrar en el orden secuencial
+                num_bloques = min(procesos, len(openList) // MIN_NODOS_POR_PROCESO)
+                tam_bloque = -(-len(openList) // num_bloques)
+                trabajos = []
+                for inicio_bloque in range(0, len(openList), tam_bloque):
+                    bloque = [(indice_nodo, cerrados_pos[indice_nodo], cerrados_g[indice_nodo])
+                              for indice_nodo in openList[inicio_bloque:inicio_bloque + tam_bloque]]
+                    trabajos.append((expandir_bloque, (bloque, meta_row, meta_col)))
+                
+                for sucesores in pool.map(_ejecutar_en_worker, trabajos):
+                    for sucesor in sucesores:
+                        posicion = sucesor[0]
+                        if posicion == idx_meta:
+                            cerrados_pos.append(posicion)
+                            cerrados_padre.append(sucesor[1])
+                            cerrados_g.append(sucesor[2])
+                            indice_meta = len(cerrados_pos) - 1
+                            break
+                        if visitados[posicion] != visitada:
+                            todos_sucesores.append(sucesor)
+                            visitados[posicion] = visitada
+                    if indice_meta != -1:
+                        break
+                openList = []
+            
+            # Expandir beam actual
+            for indice_nodo in openList:
+                actual = cerrados_pos[indice_nodo]
+                g_actual = cerrados_g[indice_nodo]
+                row, col = divmod(actual, ancho)
+                
+                for desplazamiento, d_row, d_col in movimientos:
+                    posicion = actual + desplazamiento
+                    costo_movimiento = costos[posicion]
+                    # Costo 0: fuera del tablero
+                    if not costo_movimiento:
+                        continue
+                    g_n = g_actual + costo_movimiento
+                    
+                    if posicion == idx_meta:
+                        cerrados_pos.append(posicion)
+                        cerrados_padre.append(indice_nodo)
+                        cerrados_g.append(g_n)
+                        indice_meta = len(cerrados_pos) - 1
+                        break
+                    
+                    if visitados[posicion] != visitada:
+                        h_n = abs(row + d_row - meta_row) + abs(col + d_col - meta_col)
+                        todos_sucesores.append((posicion, indice_nodo, g_n, h_n, g_n + h_n))
+                        visitados[posicion] = visitada
+                
+                if indice_meta != -1:
+                    break
+            
+            if indice_meta != -1:
+                salida = "meta"
+                break
+            
+            if not todos_sucesores:
+                salida = "agotado"
+                break
+            
+            inserciones += len(todos_sucesores)
+            if len(todos_sucesores) > max_frontera:
+                max_frontera = len(todos_sucesores)
+            if len(todos_sucesores) > beamWidth:
+                truncamientos += len(todos_sucesores) - beamWidth
+            
+            # Seleccionar los w mejores
+            mejores_sucesores = seleccionar_mejores(todos_sucesores, beamWidth)
+            
+            mejor_h_actual = min(s[3] for s in mejores_sucesores)
+            if mejor_h_actual >= mejor_h_previo:
+                iteraciones_sin_mejora += 1
+                if iteraciones_sin_mejora > beamWidth * 2:
+                    salida = "estancamiento"  # Probablemente no hay camino
+                    break
+            else:
+                iteraciones_sin_mejora = 0
+                mejor_h_previo = mejor_h_actual
+            
+            # Actualizar openList
+            openList = []
+            for posicion, indice_padre, g_n, h_n, f_n in mejores_sucesores:
+                cerrados_pos.append(posicion)
+                cerrados_padre.append(indice_padre)
+                cerrados_g.append(g_n)
+                openList.append(len(cerrados_pos) - 1)
+    
+    t_reconstruccion = time.perf_counter()
+    camino = None
+    if salida == "meta":
+        camino = reconstruir_camino_grid(grid, cerrados_pos, cerrados_padre, indice_meta)
+    grid.devolver_buffers(buffers)
+    
+    if progreso is not None and salida != "cancelado":
+        progreso(nodos_expandidos, len(openList))
+    
+    if estadisticas is not None:
+        estadisticas.registrar(
+            "beam_search", salida, t_preparacion, t_busqueda, t_reconstruccion,
+            expansiones=nodos_expandidos,
+            inserciones=inserciones,
+            max_frontera=max_frontera,
+            truncamientos=truncamientos,
+            iteraciones=iteracion,
+        )
+    
+    return camino
+
+
+# Tamaño mínimo del rastro antes de compactarlo por primera vez
+COMPACTACION_MINIMA = 4096
+
+
+def compactar_rastro(rastro_pos, rastro_padre, beam):
+    """
+    Deja en el rastro solo los nodos que son ancestros del beam actual.
+    Retorna (rastro_pos, rastro_padre, beam) con los índices renumerados.
+    Un padre siempre tiene un índice menor que sus hijos, así que basta
+    con recorrer el rastro una vez en orden.
+    """
+    vivos = bytearray(len(rastro_pos))
+    for indice_nodo, _, _ in beam:
+        while indice_nodo != -1 and not vivos[indice_nodo]:
+            vivos[indice_nodo] = 1
+            indice_nodo = rastro_padre[indice_nodo]
+    
+    nuevo_indice = array('i', [-1]) * len(rastro_pos)
+    nuevo_pos = array('i')
+    nuevo_padre = array('i')
+    for indice_nodo in range(len(rastro_pos)):
+        if vivos[indice_nodo]:
+            nuevo_indice[indice_nodo] = len(nuevo_pos)
+            nuevo_pos.append(rastro_pos[indice_nodo])
+            padre = rastro_padre[indice_nodo]
+            nuevo_padre.append(nuevo_indice[padre] if padre != -1 else -1)
+    
+    beam = [(nuevo_indice[indice_nodo], posicion, g_n) for indice_nodo, posicion, g_n in beam]
+    return nuevo_pos, nuevo_padre, beam
+
+
+def beam_search_acotado(n, inicio, meta, obstaculos, limite_memoria=None,
+                        progreso=None, estadisticas=None):
+    """
+    Variante de beam_search con memoria acotada. Expande y selecciona
+    exactamente igual que beam_search (retorna el mismo camino), pero:
+    - las celdas visitadas se marcan en un bitset (1 bit por celda)
+    - solo se guarda el rastro de padres de los nodos que siguen siendo
+      ancestros del beam; el resto se descarta al compactar el rastro
+    
+    limite_memoria: bytes máximos para el bitset y el rastro (None: sin
+    límite). Si el rastro no cabe ni después de compactarlo se lanza
+    MemoryError.
+    progreso / estadisticas: ver estadisticas.py.
+    """
+    t_preparacion = time.perf_counter()
+    
+    grid = como_grid(n, obstaculos)
+    costos = grid.costos
+    ancho = grid.ancho
+    
+    num_obstaculos = grid.contar_venenos() if obstaculos is grid else len(obstaculos)
+    beamWidth = calcular_beam_width((grid.rows, grid.cols), num_obstaculos)
+    
+    idx_inicio = grid.indice(inicio)
+    idx_meta = grid.indice(meta)
+    meta_row, meta_col = divmod(idx_meta, ancho)
+    
+    movimientos = ((-ancho, -1, 0), (ancho, 1, 0), (-1, 0, -1), (1, 0, 1))
+    
+    # Bitset de visitados: bit (i & 7) del byte i >> 3
+    visitados = bytearray((grid.size + 7) >> 3)
+    visitados[idx_inicio >> 3] |= 1 << (idx_inicio & 7)
+    
+    # Rastro de padres (posición e índice del padre de cada nodo)
+    rastro_pos = array('i', [idx_inicio])
+    rastro_padre = array('i', [-1])
+    bytes_por_nodo = rastro_pos.itemsize + rastro_padre.itemsize
+    if limite_memoria is not None and len(visitados) > limite_memoria:
+        raise MemoryError(f"El bitset de visitados ({len(visitados)} bytes) supera el límite de {limite_memoria} bytes")
+    
+    if inicio == meta:
+        return [inicio]
+    
+    # Beam: (índice en el rastro, posición, g_n)
+    beam = [(0, idx_inicio, 0)]
+    umbral_compactacion = COMPACTACION_MINIMA
+    iteracion = 0
+    max_iteraciones = grid.rows * grid.cols * 2
+    
+    mejor_h_previo = manhattan(inicio, meta)
+    iteraciones_sin_mejora = 0
+    
+    nodos_expandidos = 0
+    inserciones = 0
+    truncamientos = 0
+    max_frontera = 0
+    siguiente_reporte = INTERVALO_PROGRESO if progreso is not None else -1
+    
+    indice_meta = -1
+    salida = "max_iteraciones"
+    t_busqueda = time.perf_counter()
+    while beam and iteracion < max_iteraciones:
         iteracion += 1
         todos_sucesores = []
         
-        # Expandir beam actual
-        for indice_nodo in openList:
-            nodo = closedList[indice_nodo]
-            sucesores = expandir_nodo(nodo, meta, obstaculos_set, n, indice_nodo)
+        nodos_expandidos += len(beam)
+        if siguiente_reporte != -1 and nodos_expandidos >= siguiente_reporte:
+            siguiente_reporte = nodos_expandidos + INTERVALO_PROGRESO
+            if progreso(nodos_expandidos, len(beam)):
+                salida = "cancelado"
+                break
+        
+        for indice_nodo, actual, g_actual in beam:
+            row, col = divmod(actual, ancho)
             
-            for sucesor in sucesores:
-                indice_padre, posicion, g_n, h_n, f_n = sucesor
+            for desplazamiento, d_row, d_col in movimientos:
+                posicion = actual + desplazamiento
+                costo_movimiento = costos[posicion]
+                if not costo_movimiento:
+                    continue
+                g_n = g_actual + costo_movimiento
                 
-                if posicion == meta:
-                    closedList.append([posicion, indice_padre, g_n, h_n])
-                    return reconstruir_camino(closedList, len(closedList) - 1)
+                if posicion == idx_meta:
+                    rastro_pos.append(posicion)
+                    rastro_padre.append(indice_nodo)
+                    indice_meta = len(rastro_pos) - 1
+                    break
                 
-                if posicion not in visitados:
-                    todos_sucesores.append((posicion, indice_padre, g_n, h_n, f_n))
-                    visitados.add(posicion)
+                bit = 1 << (posicion & 7)
+                if not visitados[posicion >> 3] & bit:
+                    h_n = abs(row + d_row - meta_row) + abs(col + d_col - meta_col)
+                    todos_sucesores.append((posicion, indice_nodo, g_n, h_n, g_n + h_n))
+                    visitados[posicion >> 3] |= bit
+            
+            if indice_meta != -1:
+                break
+        
+        if indice_meta != -1:
+            salida = "meta"
+            break
         
         if not todos_sucesores:
-            return None
+            salida = "agotado"
+            break
         
-        todos_sucesores.sort(key=lambda x: x[4])
+        inserciones += len(todos_sucesores)
+        if len(todos_sucesores) > max_frontera:
+            max_frontera = len(todos_sucesores)
+        if len(todos_sucesores) > beamWidth:
+            truncamientos += len(todos_sucesores) - beamWidth
         
-        # Seleccionar los w mejores
-        mejores_sucesores = todos_sucesores[:beamWidth]
+        mejores_sucesores = seleccionar_mejores(todos_sucesores, beamWidth)
         
         mejor_h_actual = min(s[3] for s in mejores_sucesores)
         if mejor_h_actual >= mejor_h_previo:
             iteraciones_sin_mejora += 1
             if iteraciones_sin_mejora > beamWidth * 2:
-                return None  # Probablemente no hay camino
+                salida = "estancamiento"
+                break
         else:
             iteraciones_sin_mejora = 0
             mejor_h_previo = mejor_h_actual
         
-        # Actualizar openList
-        openList = []
+        beam = []
         for posicion, indice_padre, g_n, h_n, f_n in mejores_sucesores:
-            closedList.append([posicion, indice_padre, g_n, h_n])
-            openList.append(len(closedList) - 1)
+            rastro_pos.append(posicion)
+            rastro_padre.append(indice_padre)
+            beam.append((len(rastro_pos) - 1, posicion, g_n))
+        
+        # Compactar cuando el rastro se duplica desde la última compactación
+        # o cuando ya no cabe en el límite
+        usados = len(visitados) + len(rastro_pos) * bytes_por_nodo
+        excede = limite_memoria is not None and usados > limite_memoria
+        if len(rastro_pos) >= umbral_compactacion or excede:
+            rastro_pos, rastro_padre, beam = compactar_rastro(rastro_pos, rastro_padre, beam)
+            umbral_compactacion = max(COMPACTACION_MINIMA, 2 * len(rastro_pos))
+            usados = len(visitados) + len(rastro_pos) * bytes_por_nodo
+            if limite_memoria is not None and usados > limite_memoria:
+                raise MemoryError(f"El rastro del beam ({usados} bytes) supera el límite de {limite_memoria} bytes")
+    
+    t_reconstruccion = time.perf_counter()
+    camino = None
+    if salida == "meta":
+        camino = reconstruir_camino_grid(grid, rastro_pos, rastro_padre, indice_meta)
+    
+    if progreso is not None and salida != "cancelado":
+        progreso(nodos_expandidos, len(beam))
     
-    return None
\ No newline at end of file
+    if estadisticas is not None:
+        estadisticas.registrar(
+            "beam_search_acotado", salida, t_preparacion, t_busqueda, t_reconstruccion,
+            expansiones=nodos_expandidos,
+            inserciones=inserciones,
+            max_frontera=max_frontera,
+            truncamientos=truncamientos,
+            iteraciones=iteracion,
+        )
+    
+    return camino
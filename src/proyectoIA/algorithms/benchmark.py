@@ -0,0 +1,213 @@
+"""
+Benchmark de las búsquedas (beam_search, dynamic_weighting_search y variantes).
+
+Uso (desde la carpeta src):
+    python -m proyectoIA.algorithms.benchmark --salida resultados.json
+    python -m proyectoIA.algorithms.benchmark --baseline resultados.json
+    python -m proyectoIA.algorithms.benchmark --tamanos 10 100 1000 4000 --semillas 3
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from functools import partial
+
+from .beam_search import beam_search, beam_search_acotado
+from .dynamic import dynamic_weighting_bidireccional, dynamic_weighting_search
+from .estadisticas import EstadisticasBusqueda
+from .generador import GENERADORES
+from .grid import Grid
+from .jps import jump_point_search
+
+ALGORITMOS = {
+    "beam": beam_search,
+    "beam_acotado": beam_search_acotado,
+    "dw": dynamic_weighting_search,
+    # Misma búsqueda con la cola por buckets en lugar del heap
+    "dw_buckets": partial(dynamic_weighting_search, open_list="buckets"),
+    # Óptimas: A* (dynamic weighting sin peso) y su versión bidireccional
+    "dw_optimo": partial(dynamic_weighting_search, epsilon=0),
+    "dw_bi": dynamic_weighting_bidireccional,
+    "jps": jump_point_search,
+}
+
+TAMANOS_POR_DEFECTO = (10, 50, 100, 500, 1000)
+TAMANOS_COMPLETOS = (10, 50, 100, 500, 1000, 2000, 4000)
+
+# Tolerancia por defecto al comparar tiempos con el baseline (20 %)
+TOLERANCIA = 0.2
+
+
+def costo_camino(grid, camino):
+    """Suma el costo de entrar a cada celda del camino (sin contar el inicio)"""
+    costos = grid.costos
+    return sum(costos[grid.indice(pos)] for pos in camino[1:])
+
+
+def ejecutar_caso(funcion, grid, inicio, meta, medir_memoria=True):
+    """Ejecuta una búsqueda y retorna sus métricas"""
+    estadisticas = EstadisticasBusqueda()
+
+    n = (grid.rows, grid.cols)
+    t0 = time.perf_counter()
+    camino = funcion(n, inicio, meta, grid, estadisticas=estadisticas)
+    tiempo = time.perf_counter() - t0
+
+    memoria_pico = None
+    if medir_memoria:
+        # Segunda ejecución: tracemalloc vuelve más lenta la búsqueda. Sobre
+        # una copia del tablero para no reutilizar los buffers de otras
+        # búsquedas; tracemalloc no ve los BuffersBusqueda (memoria anónima
+        # fuera de Python), así que se suman las páginas que se escribieron
+        copia = Grid(grid.rows, grid.cols, bytearray(grid.costos), grid.contar_venenos())
+        tracemalloc.start()
+        funcion(n, inicio, meta, copia)
+        memoria_pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        memoria_pico += copia.bytes_buffers()
+
+    return {
+        "tiempo": tiempo,
+        "expandidos": estadisticas.expansiones,
+        "inserciones": estadisticas.inserciones,
+        "duplicados": estadisticas.duplicados,
+        "max_frontera": estadisticas.max_frontera,
+        "truncamientos": estadisticas.truncamientos,
+        "salida": estadisticas.salida,
+        "tiempos": estadisticas.tiempos,
+        "memoria_pico": memoria_pico,
+        "exito": camino is not None,
+        "costo": costo_camino(grid, camino) if camino else None,
+        "longitud": len(camino) if camino else None,
+    }
+
+
+def ejecutar_benchmark(tamanos=TAMANOS_POR_DEFECTO, generadores=tuple(GENERADORES),
+                       algoritmos=tuple(ALGORITMOS), semillas=1, densidad=0.3,
+                       medir_memoria=True):
+    """Ejecuta todas las combinaciones y retorna la lista de resultados"""
+    resultados = []
+    for nombre_generador in generadores:
+        for tamano in tamanos:
+            for semilla in range(semillas):
+                if nombre_generador == "aleatorio":
+                    grid, inicio, meta = GENERADORES[nombre_generador](tamano, tamano, densidad, semilla)
+                else:
+                    grid, inicio, meta = GENERADORES[nombre_generador](tamano, tamano, semilla)
+
+                for algoritmo in algoritmos:
+                    metricas = ejecutar_caso(ALGORITMOS[algoritmo], grid, inicio, meta, medir_memoria)
+                    resultado = {
+                        "generador": nombre_generador,
+                        "tamano": tamano,
+                        "semilla": semilla,
+                        "algoritmo": algoritmo,
+                        **metricas,
+                    }
+                    resultados.append(resultado)
+                    print(
+                        f"{nombre_generador:>10} {tamano:>5} s{semilla} {algoritmo:>10}: "
+                        f"{metricas['tiempo'] * 1000:9.2f} ms, {metricas['expandidos']:>9} expandidos, "
+                        f"costo {metricas['costo']}"
+                    )
+    return resultados
+
+
+def resumir(resultados):
+    """Agrupa por (generador, tamaño, algoritmo): mediana de tiempo, tasa de éxito, costo medio"""
+    grupos = {}
+    for r in resultados:
+        grupos.setdefault(f"{r['generador']}/{r['tamano']}/{r['algoritmo']}", []).append(r)
+
+    resumen = {}
+    for clave, casos in grupos.items():
+        costos = [c["costo"] for c in casos if c["costo"] is not None]
+        memorias = [c["memoria_pico"] for c in casos if c["memoria_pico"] is not None]
+        resumen[clave] = {
+            "tiempo_mediana": statistics.median(c["tiempo"] for c in casos),
+            "expandidos_mediana": statistics.median(c["expandidos"] for c in casos),
+            "memoria_pico_max": max(memorias) if memorias else None,
+            "tasa_exito": sum(c["exito"] for c in casos) / len(casos),
+            "costo_medio": statistics.mean(costos) if costos else None,
+        }
+    return resumen
+
+
+def comparar_con_baseline(resumen, baseline, tolerancia=TOLERANCIA):
+    """
+    Compara un resumen con el de un baseline guardado.
+    Retorna la lista de regresiones encontradas (textos).
+    """
+    regresiones = []
+    for clave, actual in resumen.items():
+        base = baseline.get(clave)
+        if base is None:
+            continue
+
+        if actual["tiempo_mediana"] > base["tiempo_mediana"] * (1 + tolerancia):
+            regresiones.append(
+                f"{clave}: tiempo {base['tiempo_mediana'] * 1000:.2f} ms -> {actual['tiempo_mediana'] * 1000:.2f} ms"
+            )
+        if actual["tasa_exito"] < base["tasa_exito"]:
+            regresiones.append(f"{clave}: tasa de éxito {base['tasa_exito']:.2f} -> {actual['tasa_exito']:.2f}")
+        if (actual["costo_medio"] is not None and base["costo_medio"] is not None
+                and actual["costo_medio"] > base["costo_medio"]):
+            regresiones.append(f"{clave}: costo medio {base['costo_medio']:.1f} -> {actual['costo_medio']:.1f}")
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de las búsquedas")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=None,
+                        help=f"lados de los mapas (por defecto {' '.join(map(str, TAMANOS_POR_DEFECTO))})")
+    parser.add_argument("--completo", action="store_true",
+                        help=f"usar los tamaños {' '.join(map(str, TAMANOS_COMPLETOS))}")
+    parser.add_argument("--generadores", nargs="+", choices=sorted(GENERADORES), default=sorted(GENERADORES))
+    parser.add_argument("--algoritmos", nargs="+", choices=sorted(ALGORITMOS), default=sorted(ALGORITMOS))
+    parser.add_argument("--semillas", type=int, default=1, help="mapas distintos por configuración")
+    parser.add_argument("--densidad", type=float, default=0.3, help="densidad de veneno del generador aleatorio")
+    parser.add_argument("--sin-memoria", action="store_true", help="no medir memoria pico (más rápido)")
+    parser.add_argument("--salida", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--baseline", help="archivo JSON de una ejecución anterior para comparar")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA,
+                        help="aumento relativo de tiempo aceptado frente al baseline")
+    args = parser.parse_args(argv)
+
+    tamanos = args.tamanos or (TAMANOS_COMPLETOS if args.completo else TAMANOS_POR_DEFECTO)
+    resultados = ejecutar_benchmark(
+        tamanos, args.generadores, args.algoritmos, args.semillas, args.densidad, not args.sin_memoria
+    )
+    resumen = resumir(resultados)
+
+    if args.salida:
+        datos = {
+            "entorno": {
+                "python": platform.python_version(),
+                "plataforma": platform.platform(),
+                "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "resultados": resultados,
+            "resumen": resumen,
+        }
+        with open(args.salida, "w", encoding="utf-8") as file:
+            json.dump(datos, file, indent=2)
+        print(f"Resultados guardados en '{args.salida}'")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["resumen"]
+        regresiones = comparar_con_baseline(resumen, baseline, args.tolerancia)
+        if regresiones:
+            print(f"\n{len(regresiones)} regresiones frente a '{args.baseline}':")
+            for regresion in regresiones:
+                print(f"  - {regresion}")
+            return 1
+        print(f"\nSin regresiones frente a '{args.baseline}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+import os
+import threading
+from collections import OrderedDict
+
+from .campo_distancias import CampoDistancias
+
+# Memoria máxima ocupada por los campos guardados (256 MiB)
+PRESUPUESTO_POR_DEFECTO = 256 << 20
+
+
+class CacheCampos:
+    """
+    Caché LRU de campos de distancias (ver campo_distancias.py).
+
+    La clave es (huella del mapa, meta): consultas repetidas sobre el mismo
+    mapa y el mismo hongo, desde cualquier posición de la hormiga, solo bajan
+    por el campo ya calculado. Cuando la memoria de los campos supera el
+    presupuesto se descartan los usados hace más tiempo.
+
+    Es seguro usarla desde varios hilos (los workers de la interfaz).
+    """
+
+    def __init__(self, presupuesto_bytes=PRESUPUESTO_POR_DEFECTO):
+        self.presupuesto_bytes = presupuesto_bytes
+        self.bytes_usados = 0
+        self.campos = OrderedDict()
+        # ruta -> (mtime_ns, tamaño, huella, grid) del último mapa leído
+        self.archivos = {}
+        self.aciertos = 0
+        self.fallos = 0
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.campos)
+
+    def campo(self, grid, meta, huella=None):
+        """
+        Retorna el campo de grid hacia meta, calculándolo si no está guardado.
+        huella: Grid.huella() si ya se conoce (el Grid la calcula una sola vez)
+        """
+        if huella is None:
+            huella = grid.huella()
+        clave = (huella, meta)
+
+        with self.lock:
+            campo = self.campos.get(clave)
+            if campo is not None:
+                self.campos.move_to_end(clave)
+                self.aciertos += 1
+                return campo
+            self.fallos += 1
+
+        # Se calcula fuera del lock para no bloquear otras consultas
+        campo = CampoDistancias(None, meta, grid)
+
+        with self.lock:
+            if clave not in self.campos:
+                self.campos[clave] = campo
+                self.bytes_usados += campo.distancias.nbytes
+                self._liberar()
+        return campo
+
+    def camino(self, grid, inicio, meta, huella=None):
+        """Camino óptimo de inicio a meta usando el campo guardado"""
+        return self.campo(grid, meta, huella).camino(inicio)
+
+    def campo_archivo(self, ruta, meta, cargar):
+        """
+        Igual que campo() para un mapa guardado en un archivo.
+        cargar(ruta) debe retornar el Grid del mapa; solo se llama si el
+        archivo cambió (fecha de modificación o tamaño) desde la última vez,
+        y en ese caso se descartan los campos de la versión anterior.
+        """
+        info = os.stat(ruta)
+        with self.lock:
+            anterior = self.archivos.get(ruta)
+
+        if anterior is not None and anterior[:2] == (info.st_mtime_ns, info.st_size):
+            huella, grid = anterior[2], anterior[3]
+        else:
+            grid = cargar(ruta)
+            huella = grid.huella()
+            with self.lock:
+                self.archivos[ruta] = (info.st_mtime_ns, info.st_size, huella, grid)
+                if anterior is not None and anterior[2] != huella:
+                    self.invalidar(anterior[2])
+
+        return self.campo(grid, meta, huella)
+
+    def invalidar(self, huella=None):
+        """Descarta los campos de un mapa (o todos si huella es None)"""
+        with self.lock:
+            for clave in [c for c in self.campos if huella is None or c[0] == huella]:
+                self.bytes_usados -= self.campos.pop(clave).distancias.nbytes
+            if huella is None:
+                self.archivos.clear()
+
+    def _liberar(self):
+        """Descarta los campos menos usados hasta quedar dentro del presupuesto"""
+        # Se mantiene al menos el último campo aunque supere el presupuesto
+        while self.bytes_usados > self.presupuesto_bytes and len(self.campos) > 1:
+            _, campo = self.campos.popitem(last=False)
+            self.bytes_usados -= campo.distancias.nbytes
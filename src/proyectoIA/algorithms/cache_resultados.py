@@ -0,0 +1,198 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from array import array
+
+from .estadisticas import EstadisticasBusqueda
+from .grid import como_grid
+
+# Caché persistente de resultados de búsquedas en SQLite (solo local).
+#
+# La clave combina la huella del contenido del mapa (Grid.huella), el inicio,
+# la meta, el algoritmo y sus parámetros, así que sirve entre ejecuciones y
+# entre procesos mientras el mapa no cambie. El camino se guarda como un
+# arreglo de int32 (row, col, row, col, ...); NULL significa "sin camino".
+
+# Carpeta por defecto: ~/.cache/proyectoIA
+DIRECTORIO_POR_DEFECTO = os.path.join(os.path.expanduser("~"), ".cache", "proyectoIA")
+ARCHIVO_POR_DEFECTO = "resultados.sqlite"
+
+# Bytes máximos de caminos guardados (64 MiB)
+PRESUPUESTO_POR_DEFECTO = 64 << 20
+
+# Al superar el presupuesto se desaloja hasta quedar en esta fracción
+FRACCION_TRAS_DESALOJO = 0.9
+
+
+def _codificar_camino(camino):
+    if camino is None:
+        return None
+    return array('i', [valor for posicion in camino for valor in posicion]).tobytes()
+
+
+def _decodificar_camino(datos):
+    if datos is None:
+        return None
+    valores = array('i')
+    valores.frombytes(datos)
+    return [(valores[i], valores[i + 1]) for i in range(0, len(valores), 2)]
+
+
+class CacheResultados:
+    """
+    Caché de caminos en disco con desalojo LRU por tamaño.
+
+    ruta: archivo SQLite (por defecto ~/.cache/proyectoIA/resultados.sqlite)
+    presupuesto_bytes: tamaño máximo de los caminos guardados
+
+    Uso:
+        cache = CacheResultados()
+        buscar_dw = cache.envolver(dynamic_weighting_search, "dw")
+        camino = buscar_dw(n, inicio, meta, obstaculos, epsilon=2)
+
+    Es seguro usarla desde varios hilos (los workers de la interfaz).
+    """
+
+    def __init__(self, ruta=None, presupuesto_bytes=PRESUPUESTO_POR_DEFECTO):
+        if ruta is None:
+            os.makedirs(DIRECTORIO_POR_DEFECTO, exist_ok=True)
+            ruta = os.path.join(DIRECTORIO_POR_DEFECTO, ARCHIVO_POR_DEFECTO)
+        self.ruta = ruta
+        self.presupuesto_bytes = presupuesto_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        self.lock = threading.Lock()
+
+        self.conexion = sqlite3.connect(ruta, check_same_thread=False)
+        with self.lock, self.conexion:
+            # WAL: varios procesos pueden leer mientras otro escribe
+            self.conexion.execute("PRAGMA journal_mode=WAL")
+            self.conexion.execute(
+                "CREATE TABLE IF NOT EXISTS resultados ("
+                " clave TEXT PRIMARY KEY,"
+                " huella TEXT NOT NULL,"
+                " camino BLOB,"
+                " tamano INTEGER NOT NULL,"
+                " usado INTEGER NOT NULL)"
+            )
+            self.conexion.execute("CREATE INDEX IF NOT EXISTS resultados_usado ON resultados (usado)")
+            self.bytes_usados = self._total_bytes()
+
+    def __len__(self):
+        with self.lock:
+            return self.conexion.execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+
+    @staticmethod
+    def clave(huella, inicio, meta, algoritmo, parametros):
+        """Clave de la consulta. TypeError si algún parámetro no es serializable a JSON"""
+        return json.dumps(
+            [huella, list(inicio), list(meta), algoritmo, sorted(parametros.items())],
+            separators=(",", ":"),
+        )
+
+    def obtener(self, clave):
+        """Retorna (encontrado, camino); camino puede ser None (búsqueda sin camino)"""
+        with self.lock:
+            fila = self.conexion.execute("SELECT camino FROM resultados WHERE clave = ?", (clave,)).fetchone()
+            if fila is None:
+                self.fallos += 1
+                return False, None
+            with self.conexion:
+                self.conexion.execute("UPDATE resultados SET usado = ? WHERE clave = ?", (time.time_ns(), clave))
+            self.aciertos += 1
+        return True, _decodificar_camino(fila[0])
+
+    def guardar(self, clave, huella, camino):
+        datos = _codificar_camino(camino)
+        tamano = len(clave) + (len(datos) if datos else 0)
+        with self.lock:
+            with self.conexion:
+                anterior = self.conexion.execute(
+                    "SELECT tamano FROM resultados WHERE clave = ?", (clave,)
+                ).fetchone()
+                self.conexion.execute(
+                    "INSERT OR REPLACE INTO resultados (clave, huella, camino, tamano, usado) VALUES (?, ?, ?, ?, ?)",
+                    (clave, huella, datos, tamano, time.time_ns()),
+                )
+            self.bytes_usados += tamano - (anterior[0] if anterior else 0)
+            if self.bytes_usados > self.presupuesto_bytes:
+                self._desalojar()
+
+    def buscar(self, funcion, n, inicio, meta, obstaculos, algoritmo=None,
+               progreso=None, estadisticas=None, **parametros):
+        """
+        Lectura a través de la caché: retorna el camino guardado o ejecuta
+        funcion(n, inicio, meta, obstaculos, **parametros) y guarda el
+        resultado. Las búsquedas canceladas no se guardan, y si algún
+        parámetro no es serializable (por ejemplo un modelo de ajuste.py)
+        se busca sin caché. En un acierto estadisticas queda con salida
+        "cache", los contadores en cero y el tiempo de la consulta.
+        """
+        t_preparacion = time.perf_counter()
+        grid = como_grid(n, obstaculos)
+        huella = grid.huella()
+        algoritmo = algoritmo or funcion.__name__
+        try:
+            clave = self.clave(huella, inicio, meta, algoritmo, parametros)
+        except TypeError:
+            return funcion(n, inicio, meta, grid, progreso=progreso, estadisticas=estadisticas, **parametros)
+
+        t_busqueda = time.perf_counter()
+        encontrado, camino = self.obtener(clave)
+        if encontrado:
+            if estadisticas is not None:
+                estadisticas.registrar(algoritmo, "cache", t_preparacion, t_busqueda)
+            return camino
+
+        if estadisticas is None:
+            estadisticas = EstadisticasBusqueda()
+        camino = funcion(n, inicio, meta, grid, progreso=progreso, estadisticas=estadisticas, **parametros)
+        if estadisticas.salida != "cancelado":
+            self.guardar(clave, huella, camino)
+        return camino
+
+    def envolver(self, funcion, algoritmo=None):
+        """Retorna una función con la misma firma que la búsqueda que usa la caché"""
+        def buscar_con_cache(n, inicio, meta, obstaculos, **parametros):
+            return self.buscar(funcion, n, inicio, meta, obstaculos, algoritmo, **parametros)
+        buscar_con_cache.__name__ = funcion.__name__
+        buscar_con_cache.__doc__ = funcion.__doc__
+        return buscar_con_cache
+
+    def invalidar(self, huella=None):
+        """Borra los resultados de un mapa (o todos si huella es None)"""
+        with self.lock:
+            with self.conexion:
+                if huella is None:
+                    self.conexion.execute("DELETE FROM resultados")
+                else:
+                    self.conexion.execute("DELETE FROM resultados WHERE huella = ?", (huella,))
+            self.bytes_usados = self._total_bytes()
+
+    def cerrar(self):
+        with self.lock:
+            self.conexion.close()
+
+    def _total_bytes(self):
+        return self.conexion.execute("SELECT COALESCE(SUM(tamano), 0) FROM resultados").fetchone()[0]
+
+    def _desalojar(self):
+        """Borra los resultados usados hace más tiempo hasta bajar del presupuesto"""
+        # Otro proceso puede haber agregado o borrado filas: recalcular
+        self.bytes_usados = self._total_bytes()
+        objetivo = int(self.presupuesto_bytes * FRACCION_TRAS_DESALOJO)
+        if self.bytes_usados <= self.presupuesto_bytes:
+            return
+
+        liberar = self.bytes_usados - objetivo
+        claves = []
+        for clave, tamano in self.conexion.execute("SELECT clave, tamano FROM resultados ORDER BY usado"):
+            claves.append((clave,))
+            liberar -= tamano
+            if liberar <= 0:
+                break
+        with self.conexion:
+            self.conexion.executemany("DELETE FROM resultados WHERE clave = ?", claves)
+        self.bytes_usados = self._total_bytes()
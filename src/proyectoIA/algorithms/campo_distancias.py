@@ -0,0 +1,130 @@
+import numpy as np
+
+from .grid import COSTO_NORMAL, COSTO_VENENO, INFINITO, como_grid
+
+# Campo de distancias exactas hacia una meta (Hongo) sobre todo el tablero.
+#
+# D(meta) = 0 y D(x) = min(costo(y) + D(y)) sobre los vecinos y de x, donde
+# costo(y) es el costo de entrar a y (1 normal, 3 veneno). Se calcula con un
+# Dijkstra inverso por buckets: como los costos solo pueden ser 1 o 3, las
+# celdas a distancia d generan candidatos a distancia d + 1 (si son normales)
+# o d + 3 (si son veneno). Cada frente de onda se procesa completo con
+# operaciones de NumPy en lugar de celda por celda.
+#
+# Con el campo calculado, el camino óptimo desde cualquier hormiga se obtiene
+# bajando por el campo en O(largo del camino), sin una búsqueda nueva.
+
+
+def calcular_distancias(grid, meta):
+    """
+    Retorna un arreglo plano (mismo orden que grid.costos, con borde) con el
+    costo mínimo desde cada celda hasta la meta. INFINITO si no hay camino.
+    """
+    return calcular_distancias_multiples(grid, [meta])
+
+
+def calcular_distancias_multiples(grid, metas):
+    """
+    Igual que calcular_distancias con varias metas a la vez: cada celda
+    queda con el costo hasta la meta más cercana. Todas las metas empiezan
+    en el frente de distancia 0, así que es una sola pasada por el tablero.
+    """
+    costos = np.frombuffer(grid.costos, dtype=np.uint8)
+    distancias = np.full(grid.size, INFINITO, dtype=np.int64)
+
+    idx_metas = np.array([grid.indice(meta) for meta in metas], dtype=np.int64)
+    distancias[idx_metas] = 0
+
+    desplazamientos = np.array(grid.desplazamientos, dtype=np.int64)
+
+    # buckets[d]: lista de arreglos de índices con distancia tentativa d
+    buckets = {0: [idx_metas]} if len(idx_metas) else {}
+    d = 0
+    while buckets:
+        pendientes = buckets.pop(d, None)
+        if pendientes is None:
+            d += 1
+            continue
+
+        frente = np.unique(np.concatenate(pendientes))
+        # Descartar entradas viejas: la celda ya se alcanzó con menor costo
+        frente = frente[distancias[frente] == d]
+
+        # Agrupar el frente por el costo de entrar a sus celdas
+        costos_frente = costos[frente]
+        for costo in (COSTO_NORMAL, COSTO_VENENO):
+            origen = frente[costos_frente == costo]
+            if not len(origen):
+                continue
+            nueva = d + costo
+            vecinos = (origen[:, None] + desplazamientos).ravel()
+            # Costo 0: fuera del tablero
+            vecinos = vecinos[costos[vecinos] != 0]
+            vecinos = vecinos[distancias[vecinos] > nueva]
+            if len(vecinos):
+                distancias[vecinos] = nueva
+                buckets.setdefault(nueva, []).append(vecinos)
+        d += 1
+
+    return distancias
+
+
+class CampoDistancias:
+    """
+    Distancias exactas de todas las celdas a una meta.
+
+    n: tamaño del tablero (n para nxn o tupla (rows, cols))
+    meta: posición (row, col) del hongo
+    obstaculos: lista de posiciones con veneno o un Grid
+    """
+
+    def __init__(self, n, meta, obstaculos):
+        self.grid = como_grid(n, obstaculos)
+        self.meta = meta
+        self.distancias = calcular_distancias(self.grid, meta)
+
+    def distancia(self, posicion):
+        """Costo mínimo desde posicion hasta la meta, None si no hay camino"""
+        valor = int(self.distancias[self.grid.indice(posicion)])
+        return None if valor == INFINITO else valor
+
+    def matriz(self):
+        """Vista rows x cols del campo (sin el borde)"""
+        grid = self.grid
+        return self.distancias.reshape(grid.rows + 2, grid.ancho)[1:-1, 1:-1]
+
+    def camino(self, inicio):
+        """
+        Camino óptimo desde inicio hasta la meta bajando por el campo.
+        Retorna None si la meta no es alcanzable.
+        """
+        return camino_desde_campo(self.grid, self.distancias, inicio)
+
+    def caminos(self, inicios):
+        """Caminos óptimos de varias hormigas a la misma meta"""
+        return [self.camino(inicio) for inicio in inicios]
+
+
+def camino_desde_campo(grid, distancias, inicio):
+    """
+    Reconstruye el camino desde inicio eligiendo en cada paso un vecino y con
+    costo(y) + D(y) == D(actual). Los empates se resuelven en el orden
+    arriba, abajo, izquierda, derecha.
+    """
+    costos = grid.costos
+    actual = grid.indice(inicio)
+    restante = int(distancias[actual])
+    if restante == INFINITO:
+        return None
+
+    camino = [inicio]
+    while restante:
+        for desplazamiento in grid.desplazamientos:
+            vecino = actual + desplazamiento
+            costo = costos[vecino]
+            if costo and int(distancias[vecino]) == restante - costo:
+                actual = vecino
+                restante -= costo
+                break
+        camino.append(grid.posicion(actual))
+    return camino
@@ -0,0 +1,51 @@
+# Listas open alternativas al heap de heapq.
+#
+# Los costos de paso son 1 o 3 y la heurística es Manhattan, así que las
+# prioridades son números pequeños. Una cola por buckets (Dial) guarda en el
+# bucket k los elementos con prioridad cuantizada k: insertar es O(1) y sacar
+# el mínimo solo avanza un puntero sobre buckets vacíos.
+
+
+class ColaBuckets:
+    """
+    Cola de prioridad por buckets con la misma forma de uso que heapq:
+    push(elemento) y pop(), donde elemento[0] es la prioridad (>= 0).
+
+    resolucion: buckets por unidad de prioridad. Prioridades que caen en el
+    mismo bucket (diferencia menor a 1 / resolucion) se sacan en orden LIFO,
+    no por su valor exacto.
+
+    El puntero al mínimo puede retroceder: con dynamic weighting un sucesor
+    puede tener menor f que el nodo que se acaba de expandir.
+    """
+
+    def __init__(self, resolucion=1):
+        self.resolucion = resolucion
+        self.buckets = [[]]
+        self.minimo = 0
+        self.tamano = 0
+
+    def __len__(self):
+        return self.tamano
+
+    def push(self, elemento):
+        clave = int(elemento[0] * self.resolucion)
+        buckets = self.buckets
+        if clave >= len(buckets):
+            # Crecer al doble para no extender en cada prioridad nueva
+            buckets.extend([] for _ in range(max(clave + 1, 2 * len(buckets)) - len(buckets)))
+        buckets[clave].append(elemento)
+        if clave < self.minimo:
+            self.minimo = clave
+        self.tamano += 1
+
+    def pop(self):
+        if not self.tamano:
+            raise IndexError("pop de una cola vacía")
+        buckets = self.buckets
+        minimo = self.minimo
+        while not buckets[minimo]:
+            minimo += 1
+        self.minimo = minimo
+        self.tamano -= 1
+        return buckets[minimo].pop()
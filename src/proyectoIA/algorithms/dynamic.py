@@ -1,83 +1,526 @@
 import heapq
+import time
+from functools import partial
+
+from .colas import ColaBuckets
+from .grid import INFINITO, INTERVALO_PROGRESO, como_grid, dimensiones
 
 def manhattan(pos1, pos2):
     return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
 
 def generar_sucesores(posicion, n, obstaculos):
+    # n puede ser un entero (tablero n x n) o una tupla (rows, cols)
+    rows, cols = dimensiones(n)
     movimientos = [(1,0), (-1,0), (0,1), (0,-1)]
     sucesores = []
     for dx, dy in movimientos:
         nx, ny = posicion[0] + dx, posicion[1] + dy
-        if 0 <= nx < n and 0 <= ny < n:
+        if 0 <= nx < rows and 0 <= ny < cols:
             sucesores.append((nx, ny))
     return sucesores
 
-def dynamic_weighting_search(n, inicio, meta, obstaculos, epsilon=3):
+def reconstruir_camino(grid, came_from, actual):
+    """
+    Reconstruye el camino siguiendo el buffer de padres
+    desde la meta hasta el inicio
+    """
+    camino = []
+    while actual != -1:
+        camino.append(grid.posicion(actual))
+        actual = came_from[actual]
+    camino.reverse()
+    return camino
+
+def dynamic_weighting_search(n, inicio, meta, obstaculos, epsilon=3, progreso=None, estadisticas=None,
+                             open_list="heap", resolucion=1):
+    """
+    epsilon: peso inicial de la heurística, o un modelo de ajuste.py que lo
+    elige según el tablero.
+    open_list: "heap" (heapq) o "buckets" (ColaBuckets, ver colas.py).
+    resolucion: buckets por unidad de f con open_list="buckets"; los f se
+    cuantizan, así que a menor resolución más empates se resuelven en LIFO.
+    progreso / estadisticas: ver estadisticas.py.
+    """
+    t_preparacion = time.perf_counter()
     
-    # Convertir obstaculos a set para búsquedas O(1)
-    if not isinstance(obstaculos, set):
-        obstaculos = set(obstaculos)
+    # Tablero compacto (se reutiliza si obstaculos ya es un Grid)
+    grid = como_grid(n, obstaculos)
+    costos = grid.costos
+    ancho = grid.ancho
+    if hasattr(epsilon, "elegir"):
+        epsilon = epsilon.elegir(grid)
     
     # N = total de nodos posibles 
-    N = n * n
+    N = grid.rows * grid.cols
+    
+    idx_inicio = grid.indice(inicio)
+    idx_meta = grid.indice(meta)
+    meta_row, meta_col = divmod(idx_meta, ancho)
     
-    # Cola de prioridad: (f_score, posición, profundidad)
-    open_list = []
-    heapq.heappush(open_list, (0, inicio, 0))
+    # Movimientos en el mismo orden que generar_sucesores:
+    # (desplazamiento, cambio de fila, cambio de columna)
+    movimientos = ((ancho, 1, 0), (-ancho, -1, 0), (1, 0, 1), (-1, 0, -1))
     
-    # Diccionario para reconstruir el camino
-    came_from = {inicio: None}
+    # Cola de prioridad: (f_score, índice de la celda, profundidad)
+    if open_list == "heap":
+        open_list = []
+        push = partial(heapq.heappush, open_list)
+        pop = partial(heapq.heappop, open_list)
+    elif open_list == "buckets":
+        open_list = ColaBuckets(resolucion)
+        push = open_list.push
+        pop = open_list.pop
+    else:
+        raise ValueError(f"open_list desconocida: {open_list!r} (se espera 'heap' o 'buckets')")
+    push((0, idx_inicio, 0))
     
-    # Diccionario con el costo real desde el inicio
-    g_score = {inicio: 0}
+    # Buffers reutilizables del tablero: padres para reconstruir el camino
+    # (-1 = sin padre) y costo real desde el inicio. Solo valen en las
+    # celdas con marca >= vista; cerrada marca las ya expandidas
+    buffers = grid.tomar_buffers()
+    came_from = buffers.padres
+    g_score = buffers.g
+    marcas = buffers.marcas
+    vista = buffers.iniciar()
+    cerrada = buffers.nueva_marca()
+    marcas[idx_inicio] = vista
+    came_from[idx_inicio] = -1
+    g_score[idx_inicio] = 0
 
-    obstaculos_set = set(obstaculos) if not isinstance(obstaculos, set) else obstaculos
-    closed_set = set()
-    nodos_explorados = 0;
+    nodos_explorados = 0
+    duplicados = 0
+    max_open = 1
+    
+    # Punto de control cada `intervalo` nodos expandidos: con estadísticas en
+    # todos (para medir el tamaño máximo de open), solo con progreso cada
+    # INTERVALO_PROGRESO, y sin ninguno nunca (-1 no se alcanza)
+    if estadisticas is not None:
+        intervalo = 1
+    else:
+        intervalo = INTERVALO_PROGRESO
+    siguiente_control = intervalo if (progreso is not None or estadisticas is not None) else -1
+    siguiente_progreso = INTERVALO_PROGRESO
+    
+    salida = "agotado"
+    t_busqueda = time.perf_counter()
     while open_list:
         # Extraer el nodo con menor f_score
-        f_actual, actual, depth = heapq.heappop(open_list)
+        f_actual, actual, depth = pop()
         
-        # Si ya procesamos este nodo, saltar (evita duplicados en el heap)
-        if actual in closed_set:
+        # Si ya procesamos este nodo, saltar (evita duplicados en la cola)
+        if marcas[actual] == cerrada:
+            duplicados += 1
             continue
         
-        closed_set.add(actual)
+        marcas[actual] = cerrada
         nodos_explorados += 1
         
-        if actual == meta:
-            # Reconstruir el camino
-            camino = []
-            while actual is not None:
-                camino.append(actual)
-                actual = came_from[actual]
+        if nodos_explorados == siguiente_control:
+            siguiente_control += intervalo
+            # Antes del pop la lista tenía un elemento más
+            if len(open_list) >= max_open:
+                max_open = len(open_list) + 1
+            if progreso is not None and nodos_explorados >= siguiente_progreso:
+                siguiente_progreso += INTERVALO_PROGRESO
+                if progreso(nodos_explorados, len(open_list)):
+                    salida = "cancelado"
+                    break
+        
+        if actual == idx_meta:
+            salida = "meta"
+            break
+        
+        g_actual = g_score[actual]
+        row, col = divmod(actual, ancho)
+        peso = epsilon * (1 - (depth / N))
+        
+        # Expandir sucesores (costo 0 = fuera del tablero)
+        for desplazamiento, d_row, d_col in movimientos:
+            sucesor = actual + desplazamiento
+            costo = costos[sucesor]
+            if not costo:
+                continue
+            tentative_g = g_actual + costo
+            if marcas[sucesor] < vista:
+                # Primera vez que se alcanza en esta búsqueda (g infinito)
+                marcas[sucesor] = vista
+            elif tentative_g >= g_score[sucesor]:
+                continue
+            # Actualizar información del nodo
+            g_score[sucesor] = tentative_g
+            came_from[sucesor] = actual
+            
+            # Calcular heurística
+            h = abs(row + d_row - meta_row) + abs(col + d_col - meta_col)
             
-            camino.reverse() 
+            # FÓRMULA DYNAMIC WEIGHTING:
+            # f = g + h + ε × (1 - depth/N) × h
+            
+            peso_dinamico = peso * h
+            f = tentative_g + h + peso_dinamico
+            
+            # Agregar a la cola de prioridad
+            push((f, sucesor, depth + 1))
+    
+    t_reconstruccion = time.perf_counter()
+    camino = None
+    if salida == "meta":
+        # Reconstruir el camino
+        camino = reconstruir_camino(grid, came_from, idx_meta)
+    grid.devolver_buffers(buffers)
+    
+    if progreso is not None and salida != "cancelado":
+        progreso(nodos_explorados, len(open_list))
+    
+    if estadisticas is not None:
+        estadisticas.registrar(
+            "dynamic_weighting", salida, t_preparacion, t_busqueda, t_reconstruccion,
+            expansiones=nodos_explorados,
+            duplicados=duplicados,
+            # Cada pop fue una expansión o un duplicado, lo que queda sigue en open
+            inserciones=nodos_explorados + duplicados + len(open_list),
+            max_frontera=max(max_open, len(open_list)),
+        )
+    
+    return camino
+
+def dynamic_weighting_bidireccional(n, inicio, meta, obstaculos, progreso=None, estadisticas=None):
+    """
+    Búsqueda óptima desde la hormiga y desde el hongo a la vez, con la
+    prioridad de meet-in-the-middle (MM): max(g + h, 2g). Equivale a
+    dynamic_weighting_search con epsilon=0 (A*) partida en dos.
+
+    Hacia adelante g_f(y) = g_f(x) + costo(y) y h es la distancia a la meta.
+    Hacia atrás g_b(x) = g_b(y) + costo(y): el costo de entrar a y se cuenta
+    al llegar a y desde x, así que los venenos pesan igual en ambos sentidos,
+    y h es la distancia al inicio.
+
+    Con 2g en la prioridad ningún lado pasa de la mitad del camino antes de
+    encontrarse con el otro. Cada vez que un lado alcanza una celda ya
+    alcanzada por el otro se actualiza mu = min(g_f + g_b); se expande el
+    lado con la menor prioridad y la búsqueda termina cuando mu no la supera.
+
+    El camino es óptimo y en mapas abiertos se expanden menos nodos que con
+    dynamic_weighting_search(epsilon=0). No acepta epsilon: con la
+    heurística inflada los dos lados se esquivan y se expanden muchos más
+    nodos que en un sentido, así que para búsquedas rápidas no óptimas
+    conviene dynamic_weighting_search.
+
+    Retorna el camino como lista de posiciones de inicio a meta o None.
+    progreso / estadisticas: ver estadisticas.py.
+    """
+    t_preparacion = time.perf_counter()
+    
+    grid = como_grid(n, obstaculos)
+    costos = grid.costos
+    ancho = grid.ancho
+    
+    idx_inicio = grid.indice(inicio)
+    idx_meta = grid.indice(meta)
+    
+    movimientos = ((ancho, 1, 0), (-ancho, -1, 0), (1, 0, 1), (-1, 0, -1))
+    
+    # Índice 0: búsqueda desde el inicio, índice 1: desde la meta
+    objetivos = (divmod(idx_meta, ancho), divmod(idx_inicio, ancho))
+    # Cola de prioridad de cada lado: (prioridad, celda, g al insertar). Una
+    # entrada es vieja si la g de la celda bajó después; una celda que
+    # mejora se vuelve a insertar aunque ya se haya expandido
+    abiertas = ([(0, idx_inicio, 0)], [(0, idx_meta, 0)])
+    # Buffers reutilizables de cada lado (ver dynamic_weighting_search).
+    # Los padres van hacia el inicio (adelante) o hacia la meta (atrás)
+    buffers = (grid.tomar_buffers(), grid.tomar_buffers())
+    g_scores = (buffers[0].g, buffers[1].g)
+    padres = (buffers[0].padres, buffers[1].padres)
+    marcas = (buffers[0].marcas, buffers[1].marcas)
+    vistas = (buffers[0].iniciar(), buffers[1].iniciar())
+    for lado, celda in ((0, idx_inicio), (1, idx_meta)):
+        marcas[lado][celda] = vistas[lado]
+        g_scores[lado][celda] = 0
+        padres[lado][celda] = -1
+    
+    # Mejor camino encontrado: costo y celda donde se unen ambos lados
+    mejor = 0 if idx_inicio == idx_meta else INFINITO
+    encuentro = idx_inicio if idx_inicio == idx_meta else -1
+    
+    nodos_explorados = 0
+    duplicados = 0
+    inserciones = 2
+    max_open = 2
+    siguiente_progreso = INTERVALO_PROGRESO if progreso is not None else -1
+    
+    salida = "agotado"
+    t_busqueda = time.perf_counter()
+    while abiertas[0] and abiertas[1]:
+        # Lado con la menor prioridad: es una cota inferior de cualquier
+        # camino que todavía no se haya encontrado
+        lado = 0 if abiertas[0][0][0] <= abiertas[1][0][0] else 1
+        open_list = abiertas[lado]
+        if mejor <= open_list[0][0]:
+            salida = "meta"
+            break
+        
+        prioridad, actual, g_insertado = heapq.heappop(open_list)
+        g_score = g_scores[lado]
+        if g_insertado != g_score[actual]:
+            duplicados += 1
+            continue
+        nodos_explorados += 1
+        
+        if nodos_explorados == siguiente_progreso:
+            siguiente_progreso += INTERVALO_PROGRESO
+            if progreso(nodos_explorados, len(abiertas[0]) + len(abiertas[1])):
+                salida = "cancelado"
+                break
+        
+        marcas_lado = marcas[lado]
+        vista = vistas[lado]
+        g_otro = g_scores[1 - lado]
+        marcas_otro = marcas[1 - lado]
+        vista_otro = vistas[1 - lado]
+        came_from = padres[lado]
+        objetivo_row, objetivo_col = objetivos[lado]
+        row, col = divmod(actual, ancho)
+        # Hacia atrás el paso cuesta lo que cuesta entrar a la celda actual
+        costo_atras = costos[actual]
+        
+        for desplazamiento, d_row, d_col in movimientos:
+            sucesor = actual + desplazamiento
+            costo = costos[sucesor]
+            if not costo:
+                continue
+            if lado:
+                costo = costo_atras
+            tentative_g = g_insertado + costo
+            if marcas_lado[sucesor] < vista:
+                marcas_lado[sucesor] = vista
+            elif tentative_g >= g_score[sucesor]:
+                continue
+            g_score[sucesor] = tentative_g
+            came_from[sucesor] = actual
             
-            print(f"Camino encontrado en {nodos_explorados} nodos explorados")
-            print(f"Longitud del camino: {len(camino)}")
+            h = abs(row + d_row - objetivo_row) + abs(col + d_col - objetivo_col)
+            if h < tentative_g:
+                # max(g + h, 2g)
+                h = tentative_g
+            heapq.heappush(open_list, (tentative_g + h, sucesor, tentative_g))
+            inserciones += 1
             
-            return camino
-        
-        # Expandir sucesores
-        for sucesor in generar_sucesores(actual, n, obstaculos):
-            costo = 3 if sucesor in obstaculos_set else 1
-            tentative_g = g_score[actual] + costo
-            if sucesor not in g_score or tentative_g < g_score[sucesor]:
-                # Actualizar información del nodo
+            # ¿El otro lado ya llegó a esta celda?
+            if marcas_otro[sucesor] >= vista_otro:
+                total = tentative_g + g_otro[sucesor]
+                if total < mejor:
+                    mejor = total
+                    encuentro = sucesor
+        
+        tam_open = len(abiertas[0]) + len(abiertas[1])
+        if tam_open > max_open:
+            max_open = tam_open
+    
+    if salida == "agotado" and encuentro != -1:
+        # Un lado se quedó sin nodos pero ya hubo un encuentro
+        salida = "meta"
+    
+    t_reconstruccion = time.perf_counter()
+    camino = None
+    if salida == "meta":
+        # Inicio -> encuentro y luego encuentro -> meta siguiendo los padres de atrás
+        camino = reconstruir_camino(grid, padres[0], encuentro)
+        actual = padres[1][encuentro]
+        while actual != -1:
+            camino.append(grid.posicion(actual))
+            actual = padres[1][actual]
+    grid.devolver_buffers(buffers[0])
+    grid.devolver_buffers(buffers[1])
+    
+    if progreso is not None and salida != "cancelado":
+        progreso(nodos_explorados, len(abiertas[0]) + len(abiertas[1]))
+    
+    if estadisticas is not None:
+        estadisticas.registrar(
+            "dynamic_weighting_bidireccional", salida, t_preparacion, t_busqueda, t_reconstruccion,
+            expansiones=nodos_explorados,
+            duplicados=duplicados,
+            inserciones=inserciones,
+            max_frontera=max_open,
+        )
+    
+    return camino
+
+def dynamic_weighting_anytime(n, inicio, meta, obstaculos, epsilon=3, decremento=0.5,
+                              progreso=None, estadisticas=None):
+    """
+    Versión anytime (estilo ARA*): generador que entrega (peso, camino)
+    cada vez que encuentra un camino más barato que el anterior.
+
+    Empieza con f = g + peso * h y peso = 1 + epsilon, que encuentra un
+    camino casi de inmediato, y después baja el peso en decremento hasta 1.
+    Cada ronda reutiliza los g ya calculados: solo se vuelven a abrir las
+    celdas de la lista open y las que mejoraron después de cerrarse
+    (inconsistentes), con las prioridades recalculadas para el nuevo peso.
+    El costo de cada camino es a lo más peso veces el óptimo y el último
+    camino entregado (cuando el generador termina) es óptimo.
+
+    No usa el peso dinámico por profundidad de dynamic_weighting_search:
+    con un peso que depende del camino no se pueden reutilizar los g
+    entre rondas.
+
+    progreso / estadisticas: ver estadisticas.py; las estadísticas se
+    actualizan antes de entregar cada camino. Si progreso retorna True el
+    generador termina sin entregar más caminos.
+
+    ValueError si decremento no es positivo (el peso nunca llegaría a 1).
+    """
+    # Se valida al llamar y no recién en el primer next() del generador
+    if not decremento > 0:
+        raise ValueError(f"decremento debe ser positivo: {decremento!r}")
+    return _dynamic_weighting_anytime(n, inicio, meta, obstaculos, epsilon, decremento,
+                                      progreso, estadisticas)
+
+
+def _dynamic_weighting_anytime(n, inicio, meta, obstaculos, epsilon, decremento,
+                               progreso, estadisticas):
+    t_preparacion = time.perf_counter()
+    
+    grid = como_grid(n, obstaculos)
+    costos = grid.costos
+    ancho = grid.ancho
+    if hasattr(epsilon, "elegir"):
+        epsilon = epsilon.elegir(grid)
+    
+    idx_inicio = grid.indice(inicio)
+    idx_meta = grid.indice(meta)
+    meta_row, meta_col = divmod(idx_meta, ancho)
+    
+    movimientos = ((ancho, 1, 0), (-ancho, -1, 0), (1, 0, 1), (-1, 0, -1))
+    
+    def heuristica(celda):
+        row, col = divmod(celda, ancho)
+        return abs(row - meta_row) + abs(col - meta_col)
+    
+    # Buffers reutilizables del tablero (ver dynamic_weighting_search). La
+    # marca cerrada cambia en cada ronda; vista se mantiene porque los g se
+    # reutilizan. La meta se marca vista desde el principio con g infinito
+    buffers = grid.tomar_buffers()
+    came_from = buffers.padres
+    g_score = buffers.g
+    marcas = buffers.marcas
+    vista = buffers.iniciar()
+    cerrada = buffers.nueva_marca()
+    marcas[idx_meta] = vista
+    g_score[idx_meta] = INFINITO
+    marcas[idx_inicio] = vista
+    g_score[idx_inicio] = 0
+    came_from[idx_inicio] = -1
+    # Celdas que mejoraron estando cerradas en la ronda actual
+    inconsistentes = set()
+    
+    # Cola de prioridad: (f, h, celda, g al insertar). Una entrada es vieja
+    # si la celda ya se cerró o su g cambió después de insertarla
+    peso = 1 + epsilon
+    h_inicio = heuristica(idx_inicio)
+    open_list = [(peso * h_inicio, h_inicio, idx_inicio, 0)]
+    
+    nodos_explorados = 0
+    duplicados = 0
+    inserciones = 1
+    max_open = 1
+    rondas = 0
+    mejor_costo = INFINITO
+    siguiente_progreso = INTERVALO_PROGRESO if progreso is not None else -1
+    
+    def llenar_estadisticas(salida, t_busqueda):
+        if estadisticas is None:
+            return
+        estadisticas.registrar(
+            "dynamic_weighting_anytime", salida, t_preparacion, t_busqueda,
+            expansiones=nodos_explorados,
+            duplicados=duplicados,
+            inserciones=inserciones,
+            max_frontera=max_open,
+            iteraciones=rondas,
+        )
+    
+    salida = "agotado"
+    t_busqueda = time.perf_counter()
+    while True:
+        rondas += 1
+        
+        # Mejorar el camino con el peso actual
+        while open_list:
+            f_actual, h_actual, actual, g_insertado = open_list[0]
+            if marcas[actual] == cerrada or g_insertado != g_score[actual]:
+                heapq.heappop(open_list)
+                duplicados += 1
+                continue
+            if g_score[idx_meta] <= f_actual:
+                break
+            heapq.heappop(open_list)
+            marcas[actual] = cerrada
+            nodos_explorados += 1
+            
+            if nodos_explorados == siguiente_progreso:
+                siguiente_progreso += INTERVALO_PROGRESO
+                if progreso(nodos_explorados, len(open_list)):
+                    salida = "cancelado"
+                    break
+            
+            g_actual = g_score[actual]
+            row, col = divmod(actual, ancho)
+            for desplazamiento, d_row, d_col in movimientos:
+                sucesor = actual + desplazamiento
+                costo = costos[sucesor]
+                if not costo:
+                    continue
+                tentative_g = g_actual + costo
+                marca = marcas[sucesor]
+                if marca < vista:
+                    marcas[sucesor] = vista
+                elif tentative_g >= g_score[sucesor]:
+                    continue
                 g_score[sucesor] = tentative_g
                 came_from[sucesor] = actual
-                
-                # Calcular heurística
-                h = manhattan(sucesor, meta)
-                
-                # FÓRMULA DYNAMIC WEIGHTING:
-                # f = g + h + ε × (1 - depth/N) × h
-                
-                peso_dinamico = epsilon * (1 - (depth / N)) * h
-                f = tentative_g + h + peso_dinamico
-                
-                # Agregar a la cola de prioridad
-                heapq.heappush(open_list, (f, sucesor, depth + 1))
-                came_from[sucesor] = actual
-    return None
+                if marca == cerrada:
+                    inconsistentes.add(sucesor)
+                else:
+                    h = abs(row + d_row - meta_row) + abs(col + d_col - meta_col)
+                    heapq.heappush(open_list, (tentative_g + peso * h, h, sucesor, tentative_g))
+                    inserciones += 1
+            
+            if len(open_list) > max_open:
+                max_open = len(open_list)
+        
+        if salida == "cancelado" or g_score[idx_meta] == INFINITO:
+            break
+        
+        # Los padres pueden haber mejorado después de fijar g de la meta, así
+        # que el camino reconstruido puede costar menos que g_score[idx_meta]:
+        # se compara su costo real para entregar solo caminos más baratos
+        camino = reconstruir_camino(grid, came_from, idx_meta)
+        costo = sum(costos[grid.indice(posicion)] for posicion in camino[1:])
+        if costo < mejor_costo:
+            mejor_costo = costo
+            llenar_estadisticas("meta", t_busqueda)
+            yield peso, camino
+        
+        if peso <= 1:
+            salida = "meta"
+            break
+        
+        # Siguiente ronda: open + inconsistentes con prioridades del nuevo peso
+        peso = max(1, peso - decremento)
+        abiertas = {celda for _, _, celda, g_insertado in open_list
+                    if marcas[celda] != cerrada and g_insertado == g_score[celda]}
+        abiertas |= inconsistentes
+        open_list = []
+        for celda in abiertas:
+            h = heuristica(celda)
+            open_list.append((g_score[celda] + peso * h, h, celda, g_score[celda]))
+        heapq.heapify(open_list)
+        inserciones += len(open_list)
+        inconsistentes = set()
+        cerrada = buffers.nueva_marca()
+    
+    grid.devolver_buffers(buffers)
+    if progreso is not None and salida != "cancelado":
+        progreso(nodos_explorados, len(open_list))
+    llenar_estadisticas(salida, t_busqueda)
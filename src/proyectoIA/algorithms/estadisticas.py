@@ -0,0 +1,78 @@
+import time
+
+# Convención de las búsquedas (beam_search, dynamic_weighting_search, ...):
+#
+# progreso: callback opcional progreso(expandidos, tam_frontera) llamado cada
+#     INTERVALO_PROGRESO (grid.py) nodos expandidos y una última vez al terminar. Si
+#     retorna True la búsqueda se cancela y retorna None.
+# estadisticas: EstadisticasBusqueda opcional que la búsqueda llena al
+#     terminar con registrar().
+
+
+class EstadisticasBusqueda:
+    """
+    Contadores y tiempos de una búsqueda. Se pasa como argumento
+    estadisticas=... a beam_search o dynamic_weighting_search y la búsqueda
+    lo llena al terminar. Sin este objeto las búsquedas no miden nada.
+
+    Contadores:
+        expansiones: nodos expandidos
+        inserciones: nodos agregados a la frontera (pushes al heap / sucesores del beam)
+        duplicados: nodos sacados del heap que ya estaban cerrados (dynamic weighting)
+        max_frontera: tamaño máximo de la lista open / del conjunto de sucesores
+        truncamientos: sucesores descartados por el ancho del beam (beam search)
+        iteraciones: iteraciones del beam (beam search)
+        salida: motivo de término ("meta", "agotado", "estancamiento",
+                "max_iteraciones", "cancelado", o "cache" si el resultado
+                salió de CacheResultados sin buscar)
+        tiempos: segundos por fase ("preparacion", "busqueda", "reconstruccion")
+    """
+
+    def __init__(self):
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Deja todos los contadores y tiempos en cero"""
+        self.algoritmo = None
+        self.expansiones = 0
+        self.inserciones = 0
+        self.duplicados = 0
+        self.max_frontera = 0
+        self.truncamientos = 0
+        self.iteraciones = 0
+        self.salida = None
+        self.tiempos = {}
+
+    def registrar(self, algoritmo, salida, t_preparacion, t_busqueda, t_reconstruccion=None, **contadores):
+        """
+        Llena el objeto al terminar una búsqueda. t_preparacion, t_busqueda
+        y t_reconstruccion son los time.perf_counter() al empezar cada fase
+        (sin t_reconstruccion la búsqueda termina en ahora). contadores:
+        expansiones=..., inserciones=..., etc.; los que no se pasan quedan
+        en cero, aunque el objeto se haya usado en otra búsqueda.
+        """
+        t_fin = time.perf_counter()
+        self.reiniciar()
+        for nombre, valor in contadores.items():
+            if nombre not in vars(self):
+                raise AttributeError(f"Contador desconocido: {nombre!r}")
+            setattr(self, nombre, valor)
+        self.algoritmo = algoritmo
+        self.salida = salida
+        if t_reconstruccion is None:
+            self.tiempos = {
+                "preparacion": t_busqueda - t_preparacion,
+                "busqueda": t_fin - t_busqueda,
+            }
+        else:
+            self.tiempos = {
+                "preparacion": t_busqueda - t_preparacion,
+                "busqueda": t_reconstruccion - t_busqueda,
+                "reconstruccion": t_fin - t_reconstruccion,
+            }
+
+    def como_dict(self):
+        return dict(vars(self))
+
+    def __repr__(self):
+        return f"EstadisticasBusqueda({self.como_dict()})"
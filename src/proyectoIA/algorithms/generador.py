@@ -0,0 +1,99 @@
+import random
+
+from .grid import COSTO_NORMAL, COSTO_VENENO, Grid
+
+# Generadores de mapas para pruebas de rendimiento.
+# Todos son deterministas dada la semilla y retornan (grid, inicio, meta).
+
+
+def mapa_aleatorio(rows, cols, densidad=0.3, semilla=0):
+    """Venenos repartidos al azar con la densidad indicada"""
+    rnd = random.Random(semilla)
+    grid = Grid(rows, cols)
+    costos = grid.costos
+    ancho = grid.ancho
+    for row in range(rows):
+        base = (row + 1) * ancho + 1
+        for col in range(cols):
+            if rnd.random() < densidad:
+                costos[base + col] = COSTO_VENENO
+
+    inicio = (0, 0)
+    meta = (rows - 1, cols - 1)
+    costos[grid.indice(inicio)] = COSTO_NORMAL
+    costos[grid.indice(meta)] = COSTO_NORMAL
+    return grid, inicio, meta
+
+
+def laberinto(rows, cols, semilla=0):
+    """
+    Laberinto generado con DFS aleatorio: las paredes son veneno y los
+    pasillos tienen costo normal. Las paredes se pueden cruzar con costo 3.
+    """
+    rnd = random.Random(semilla)
+    grid = Grid(rows, cols)
+    costos = grid.costos
+
+    # Todo empieza como pared
+    for row in range(rows):
+        inicio_fila = grid.indice((row, 0))
+        costos[inicio_fila:inicio_fila + cols] = bytes([COSTO_VENENO]) * cols
+
+    # Las celdas del laberinto son las de coordenadas pares
+    costos[grid.indice((0, 0))] = COSTO_NORMAL
+    pila = [(0, 0)]
+    while pila:
+        row, col = pila[-1]
+        vecinos = []
+        for d_row, d_col in ((-2, 0), (2, 0), (0, -2), (0, 2)):
+            n_row, n_col = row + d_row, col + d_col
+            if 0 <= n_row < rows and 0 <= n_col < cols and costos[grid.indice((n_row, n_col))] == COSTO_VENENO:
+                vecinos.append((n_row, n_col))
+        if not vecinos:
+            pila.pop()
+            continue
+        n_row, n_col = rnd.choice(vecinos)
+        # Abrir la pared intermedia y la celda vecina
+        costos[grid.indice(((row + n_row) // 2, (col + n_col) // 2))] = COSTO_NORMAL
+        costos[grid.indice((n_row, n_col))] = COSTO_NORMAL
+        pila.append((n_row, n_col))
+
+    inicio = (0, 0)
+    meta = (rows - 1, cols - 1)
+    costos[grid.indice(meta)] = COSTO_NORMAL
+    return grid, inicio, meta
+
+
+def corredor(rows, cols, semilla=0):
+    """
+    Mapa lleno de veneno con un corredor libre que serpentea de la
+    columna izquierda a la derecha.
+    """
+    rnd = random.Random(semilla)
+    grid = Grid(rows, cols)
+    costos = grid.costos
+
+    for row in range(rows):
+        inicio_fila = grid.indice((row, 0))
+        costos[inicio_fila:inicio_fila + cols] = bytes([COSTO_VENENO]) * cols
+
+    row = rnd.randrange(rows)
+    inicio = (row, 0)
+    for col in range(cols):
+        costos[grid.indice((row, col))] = COSTO_NORMAL
+        # De vez en cuando el corredor cambia de fila
+        if rnd.random() < 0.2:
+            destino = min(rows - 1, max(0, row + rnd.randint(-3, 3)))
+            paso = 1 if destino > row else -1
+            while row != destino:
+                row += paso
+                costos[grid.indice((row, col))] = COSTO_NORMAL
+    meta = (row, cols - 1)
+    return grid, inicio, meta
+
+
+GENERADORES = {
+    "aleatorio": mapa_aleatorio,
+    "laberinto": laberinto,
+    "corredor": corredor,
+}
@@ -0,0 +1,216 @@
+from array import array
+import hashlib
+import mmap
+
+# Costo de entrar a cada tipo de celda
+COSTO_NORMAL = 1
+COSTO_VENENO = 3
+# Celdas del borde: fuera del tablero
+COSTO_BORDE = 0
+
+# Valor usado como "infinito" en los buffers de g_score: el mayor int32,
+# así cabe en los buffers 'i' (4 bytes por celda)
+INFINITO = (1 << 31) - 1
+
+# Cada cuántos nodos expandidos las búsquedas llaman al callback de progreso
+INTERVALO_PROGRESO = 1000
+
+
+class Grid:
+    """
+    Tablero compacto en orden row-major.
+
+    Las celdas se guardan en un bytearray con el costo de entrar a cada una
+    (1 normal, 3 veneno). El tablero lleva un borde de una celda con costo 0,
+    así los vecinos se obtienen sumando un desplazamiento fijo al índice sin
+    revisar límites: un costo 0 indica que el vecino está fuera del mapa.
+    """
+
+    def __init__(self, rows, cols, costos=None, num_venenos=None):
+        self.rows = rows
+        self.cols = cols
+        # Ancho real de una fila incluyendo el borde
+        self.ancho = cols + 2
+        self.size = (rows + 2) * self.ancho
+
+        if costos is None:
+            costos = bytearray(self.size)
+            fila = bytes([COSTO_BORDE]) + bytes([COSTO_NORMAL]) * cols + bytes([COSTO_BORDE])
+            for row in range(rows):
+                inicio = (row + 1) * self.ancho
+                costos[inicio:inicio + self.ancho] = fila
+        elif len(costos) != self.size:
+            raise ValueError(f"Se esperaban {self.size} celdas y se recibieron {len(costos)}")
+
+        self.costos = costos
+
+        # Desplazamientos de los vecinos: arriba, abajo, izquierda, derecha
+        self.desplazamientos = (-self.ancho, self.ancho, -1, 1)
+
+        # BuffersBusqueda libres para reutilizar entre búsquedas
+        self._buffers_libres = []
+        # Cantidad de venenos: se recibe si ya se conoce (por ejemplo al
+        # compartir el tablero con otros procesos) o se calcula la primera
+        # vez que se pide
+        self._num_venenos = num_venenos
+        # Hash del contenido, se calcula la primera vez que se pide
+        self._huella = None
+
+    @classmethod
+    def desde_obstaculos(cls, rows, cols, obstaculos):
+        """
+        Crea un tablero a partir de una lista de posiciones (row, col) con veneno.
+        Las posiciones fuera del tablero se ignoran.
+        """
+        grid = cls(rows, cols)
+        costos = grid.costos
+        ancho = grid.ancho
+        for row, col in obstaculos:
+            if 0 <= row < rows and 0 <= col < cols:
+                costos[(row + 1) * ancho + col + 1] = COSTO_VENENO
+        return grid
+
+    def indice(self, posicion):
+        """Convierte una posición (row, col) al índice de la celda"""
+        row, col = posicion
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise ValueError(f"La posición {posicion} está fuera del tablero {self.rows}x{self.cols}")
+        return (row + 1) * self.ancho + col + 1
+
+    def posicion(self, indice):
+        """Convierte el índice de una celda a su posición (row, col)"""
+        row, col = divmod(indice, self.ancho)
+        return (row - 1, col - 1)
+
+    def cambiar_costo(self, posicion, costo):
+        """
+        Cambia el costo de entrar a una celda. Los cambios al tablero después
+        de usarlo en búsquedas deben pasar por aquí para descartar los
+        valores calculados una sola vez (contar_venenos y huella).
+        """
+        self.costos[self.indice(posicion)] = costo
+        self._num_venenos = None
+        self._huella = None
+
+    def contar_venenos(self):
+        """Cantidad de celdas con veneno (se cuenta una sola vez)"""
+        if self._num_venenos is None:
+            costos = self.costos
+            if isinstance(costos, (bytes, bytearray)):
+                self._num_venenos = costos.count(COSTO_VENENO)
+            else:
+                # memoryview (mmap o memoria compartida): contar sin copiar
+                import numpy as np
+                self._num_venenos = int(np.count_nonzero(np.frombuffer(costos, dtype=np.uint8) == COSTO_VENENO))
+        return self._num_venenos
+
+    def huella(self):
+        """Hash del contenido del tablero (dimensiones y costos), se calcula una sola vez"""
+        if self._huella is None:
+            h = hashlib.blake2b(digest_size=16)
+            h.update(f"{self.rows}x{self.cols}".encode())
+            h.update(self.costos)
+            self._huella = h.hexdigest()
+        return self._huella
+
+    def nuevo_buffer(self, valor, tipo='i'):
+        """Buffer plano con una entrada por celda (g_score, padres, ...)"""
+        return array(tipo, [valor]) * self.size
+
+    def tomar_buffers(self):
+        """
+        Presta un BuffersBusqueda para una búsqueda (uno libre o uno nuevo).
+        Búsquedas simultáneas (en hilos) reciben buffers distintos. Se
+        devuelve con devolver_buffers al terminar; si no se devuelve (por
+        ejemplo tras una excepción) simplemente no se reutiliza.
+        """
+        try:
+            return self._buffers_libres.pop()
+        except IndexError:
+            return BuffersBusqueda(self.size)
+
+    def devolver_buffers(self, buffers):
+        self._buffers_libres.append(buffers)
+
+    def bytes_buffers(self):
+        """Bytes de memoria escritos en los BuffersBusqueda libres (ver bytes_escritos)"""
+        return sum(buffers.bytes_escritos() for buffers in self._buffers_libres)
+
+
+def _buffer_en_cero(celdas):
+    """
+    Buffer de int32 en memoria anónima: el sistema operativo la entrega en
+    cero y solo reserva las páginas que se escriben.
+    """
+    return memoryview(mmap.mmap(-1, 4 * celdas)).cast('i')
+
+
+class BuffersBusqueda:
+    """
+    Buffers por celda (g, padres y marcas) que se reutilizan entre búsquedas
+    sobre el mismo Grid sin limpiarlos, así cada búsqueda solo toca las
+    celdas que visita y no paga por el tamaño del tablero.
+
+    g[i] y padres[i] son válidos solo si marcas[i] >= la marca retornada por
+    iniciar(); las marcas de búsquedas anteriores son menores. Una búsqueda
+    puede pedir más marcas con nueva_marca() (por ejemplo para las celdas
+    cerradas).
+    """
+
+    def __init__(self, celdas):
+        self.celdas = celdas
+        self.g = _buffer_en_cero(celdas)
+        self.padres = _buffer_en_cero(celdas)
+        self.marcas = _buffer_en_cero(celdas)
+        self.ultima_marca = 0
+
+    def iniciar(self):
+        """Empieza una búsqueda: retorna su primera marca"""
+        if self.ultima_marca > INFINITO // 2:
+            # Antes de que las marcas se desborden: volver a cero
+            self.marcas = _buffer_en_cero(self.celdas)
+            self.ultima_marca = 0
+        return self.nueva_marca()
+
+    def nueva_marca(self):
+        """Retorna una marca mayor que todas las usadas antes"""
+        self.ultima_marca += 1
+        return self.ultima_marca
+
+    def bytes_escritos(self):
+        """
+        Bytes de las páginas de memoria con algún valor distinto de cero, una
+        estimación de lo que ocupan realmente los buffers (las páginas que
+        nunca se escriben no se reservan). Para medir memoria (benchmark.py).
+        """
+        import numpy as np
+        total = 0
+        for buffer in (self.g, self.padres, self.marcas):
+            datos = np.frombuffer(buffer, dtype=np.uint8)
+            completas = len(datos) // mmap.PAGESIZE * mmap.PAGESIZE
+            paginas = int(np.count_nonzero(datos[:completas].reshape(-1, mmap.PAGESIZE).any(axis=1)))
+            total += paginas * mmap.PAGESIZE
+            if datos[completas:].any():
+                total += len(datos) - completas
+        return total
+
+
+def dimensiones(n):
+    """
+    Retorna (rows, cols) a partir del tamaño del tablero.
+    n puede ser un entero (tablero n x n) o una tupla (rows, cols).
+    """
+    if isinstance(n, tuple):
+        return n
+    return n, n
+
+
+def como_grid(n, obstaculos):
+    """
+    Retorna el Grid a usar en una búsqueda. Si obstaculos ya es un Grid
+    se usa directamente, si no se construye uno con las dimensiones de n.
+    """
+    if isinstance(obstaculos, Grid):
+        return obstaculos
+    rows, cols = dimensiones(n)
+    return Grid.desde_obstaculos(rows, cols, obstaculos)
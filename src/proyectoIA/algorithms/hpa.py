@@ -0,0 +1,543 @@
+from array import array
+import heapq
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+from .grid import COSTO_VENENO, INFINITO, INTERVALO_PROGRESO, Grid, como_grid
+
+# Búsqueda jerárquica (HPA*) para mapas muy grandes.
+#
+# El mapa se divide en clusters de tamano_cluster x tamano_cluster celdas.
+# En el borde entre dos clusters vecinos se buscan los tramos donde ninguna
+# de las dos celdas es veneno y en el centro de los más largos se pone una
+# transición: un par de celdas vecinas, una en cada cluster. Si todo el borde
+# tiene veneno se cruza por el centro.
+#
+# El grafo abstracto tiene como nodos las celdas de transición y dos tipos de
+# aristas, todas dirigidas porque el costo es el de entrar a la celda destino:
+#   - entre las dos celdas de una transición (costo de la celda destino)
+#   - entre transiciones del mismo cluster (costo mínimo dentro del cluster;
+#     en un cluster sin veneno es la distancia Manhattan)
+#
+# Una consulta conecta el inicio y la meta a las transiciones de sus clusters,
+# busca con A* en el grafo abstracto y solo después calcula el camino celda
+# por celda dentro de los clusters por los que pasa. El camino no siempre es
+# óptimo (las transiciones son una muestra del borde), pero la búsqueda
+# abstracta recorre pocos nodos aunque el mapa tenga millones de celdas.
+
+TAMANO_CLUSTER = 32
+# Máximo de transiciones por borde entre dos clusters
+MAX_TRANSICIONES_BORDE = 4
+EXTENSION_JERARQUIA = ".hpa"
+# Costo del borde y distancia inicial en distancias_entre_transiciones: mayor
+# que cualquier costo dentro de un cluster y sin desbordar int32 al sumarse
+# a sí mismo
+TOPE_CLUSTER = 1 << 29
+
+# Formato del archivo .hpa (sin pickle: solo datos, se puede leer sin
+# ejecutar nada aunque el archivo venga de otra parte):
+#   cabecera (little endian): magic "PIAHPA\0\0", versión, rows, cols,
+#     tamano_cluster, huella (16 bytes), cantidad de nodos y de aristas
+#   nodos: celdas de transición en orden de creación, int32
+#   grados: cantidad de aristas de cada nodo, int32
+#   destinos y costos de las aristas, nodo por nodo, int32
+MAGIC_JERARQUIA = b"PIAHPA\0\0"
+VERSION_JERARQUIA = 2
+CABECERA_JERARQUIA = struct.Struct("<8sIIII16sII")
+
+
+class Jerarquia:
+    """
+    Grafo abstracto precalculado de un mapa.
+
+    aristas: celda de transición -> lista de (celda destino, costo)
+    transiciones: cluster (ci, cj) -> lista de celdas de transición
+    huella: Grid.huella() del mapa con que se construyó
+    """
+
+    def __init__(self, rows, cols, tamano_cluster, huella):
+        self.rows = rows
+        self.cols = cols
+        self.tamano_cluster = tamano_cluster
+        self.huella = huella
+        self.aristas = {}
+        self.transiciones = {}
+
+    @classmethod
+    def construir(cls, grid, tamano_cluster=TAMANO_CLUSTER):
+        jerarquia = cls(grid.rows, grid.cols, tamano_cluster, grid.huella())
+        jerarquia._agregar_transiciones(grid)
+        for cluster in list(jerarquia.transiciones):
+            jerarquia._agregar_aristas_internas(grid, cluster)
+        return jerarquia
+
+    def cluster(self, posicion):
+        return (posicion[0] // self.tamano_cluster, posicion[1] // self.tamano_cluster)
+
+    def limites(self, cluster):
+        """(row0, col0, row1, col1) del cluster, row1 y col1 excluidos"""
+        t = self.tamano_cluster
+        ci, cj = cluster
+        return ci * t, cj * t, min((ci + 1) * t, self.rows), min((cj + 1) * t, self.cols)
+
+    def _agregar_transicion(self, grid, idx_a, idx_b):
+        """Transición entre la celda idx_a y la celda vecina idx_b de otro cluster"""
+        for idx in (idx_a, idx_b):
+            if idx not in self.aristas:
+                self.aristas[idx] = []
+                self.transiciones.setdefault(self.cluster(grid.posicion(idx)), []).append(idx)
+        self.aristas[idx_a].append((idx_b, grid.costos[idx_b]))
+        self.aristas[idx_b].append((idx_a, grid.costos[idx_a]))
+
+    def _agregar_transiciones(self, grid):
+        costos = grid.costos
+        ancho = grid.ancho
+        t = self.tamano_cluster
+
+        def agregar_tramos(primera, paso, cantidad, vecino):
+            # Pares de celdas (a, a + vecino) a lo largo de un borde, con
+            # a = primera + k * paso para k en range(cantidad).
+            # Un tramo es una secuencia de pares donde ninguna de las dos celdas
+            # es veneno; se pone una transición al centro de los más largos.
+            fin_borde = primera + cantidad * paso
+            if (COSTO_VENENO not in bytes(costos[primera:fin_borde:paso])
+                    and COSTO_VENENO not in bytes(costos[primera + vecino:fin_borde + vecino:paso])):
+                # Borde sin veneno (lo más común): un solo tramo
+                tramos = [(0, cantidad)]
+            else:
+                tramos = []
+                inicio_tramo = None
+                for k in range(cantidad):
+                    a = primera + k * paso
+                    libre = costos[a] != COSTO_VENENO and costos[a + vecino] != COSTO_VENENO
+                    if libre and inicio_tramo is None:
+                        inicio_tramo = k
+                    elif not libre and inicio_tramo is not None:
+                        tramos.append((inicio_tramo, k))
+                        inicio_tramo = None
+                if inicio_tramo is not None:
+                    tramos.append((inicio_tramo, cantidad))
+                if not tramos:
+                    # Todo el borde tiene veneno: se cruza por el centro
+                    tramos.append((0, cantidad))
+
+            tramos.sort(key=lambda tramo: tramo[0] - tramo[1])
+            for inicio, fin in tramos[:MAX_TRANSICIONES_BORDE]:
+                a = primera + (inicio + fin - 1) // 2 * paso
+                self._agregar_transicion(grid, a, a + vecino)
+
+        # Índices con desplazamientos desde la base de la fila, sin
+        # convertir cada posición: (row, col) está en (row + 1) * ancho + col + 1
+
+        # Bordes verticales (entre clusters de una misma fila de clusters)
+        for col in range(t - 1, self.cols - 1, t):
+            for row0 in range(0, self.rows, t):
+                row1 = min(row0 + t, self.rows)
+                agregar_tramos((row0 + 1) * ancho + col + 1, ancho, row1 - row0, 1)
+
+        # Bordes horizontales
+        for row in range(t - 1, self.rows - 1, t):
+            base = (row + 1) * ancho + 1
+            for col0 in range(0, self.cols, t):
+                col1 = min(col0 + t, self.cols)
+                agregar_tramos(base + col0, 1, col1 - col0, ancho)
+
+    def _agregar_aristas_internas(self, grid, cluster):
+        transiciones = self.transiciones[cluster]
+        limites = self.limites(cluster)
+        if _tiene_veneno(grid, limites):
+            matriz = distancias_entre_transiciones(grid, limites, transiciones)
+            for origen, costos in zip(transiciones, matriz):
+                for destino, costo in zip(transiciones, costos):
+                    if destino != origen:
+                        self.aristas[origen].append((destino, costo))
+        else:
+            # Todas las celdas cuestan 1: el costo es la distancia Manhattan
+            ancho = grid.ancho
+            for origen in transiciones:
+                o_row, o_col = divmod(origen, ancho)
+                for destino in transiciones:
+                    if destino != origen:
+                        d_row, d_col = divmod(destino, ancho)
+                        self.aristas[origen].append((destino, abs(o_row - d_row) + abs(o_col - d_col)))
+
+    def guardar(self, ruta):
+        """Escribe la jerarquía en un archivo temporal y lo renombra al terminar"""
+        nodos = array('i', self.aristas)
+        grados = array('i', (len(self.aristas[nodo]) for nodo in nodos))
+        destinos = array('i', (destino for nodo in nodos for destino, _ in self.aristas[nodo]))
+        costos = array('i', (costo for nodo in nodos for _, costo in self.aristas[nodo]))
+        cabecera = CABECERA_JERARQUIA.pack(
+            MAGIC_JERARQUIA, VERSION_JERARQUIA, self.rows, self.cols, self.tamano_cluster,
+            bytes.fromhex(self.huella), len(nodos), len(destinos),
+        )
+
+        temporal = ruta + ".tmp"
+        try:
+            with open(temporal, "wb") as file:
+                file.write(cabecera)
+                for arreglo in (nodos, grados, destinos, costos):
+                    if sys.byteorder == "big":
+                        arreglo.byteswap()
+                    arreglo.tofile(file)
+            os.replace(temporal, ruta)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+
+    @classmethod
+    def cargar(cls, ruta):
+        """Lee un archivo de guardar(). ValueError si no es válido"""
+        with open(ruta, "rb") as file:
+            datos = file.read()
+
+        if len(datos) < CABECERA_JERARQUIA.size:
+            raise ValueError(f"'{ruta}' no es una jerarquía válida")
+        magic, version, rows, cols, tamano_cluster, huella, num_nodos, num_aristas = \
+            CABECERA_JERARQUIA.unpack_from(datos)
+        if magic != MAGIC_JERARQUIA or version != VERSION_JERARQUIA:
+            raise ValueError(f"'{ruta}' no es una jerarquía válida (versión {VERSION_JERARQUIA})")
+        if len(datos) != CABECERA_JERARQUIA.size + 4 * (2 * num_nodos + 2 * num_aristas):
+            raise ValueError(f"'{ruta}' está incompleto o tiene datos de más")
+
+        valores = array('i')
+        valores.frombytes(datos[CABECERA_JERARQUIA.size:])
+        if sys.byteorder == "big":
+            valores.byteswap()
+        nodos = valores[:num_nodos]
+        grados = valores[num_nodos:2 * num_nodos]
+        destinos = valores[2 * num_nodos:2 * num_nodos + num_aristas]
+        costos = valores[2 * num_nodos + num_aristas:]
+
+        jerarquia = cls(rows, cols, tamano_cluster, huella.hex())
+        ancho = cols + 2
+        conocidos = set(nodos)
+        if len(conocidos) != num_nodos or sum(grados) != num_aristas or min(grados, default=0) < 0:
+            raise ValueError(f"'{ruta}' tiene nodos o aristas inconsistentes")
+        if not conocidos.issuperset(destinos) or min(costos, default=1) < 1:
+            raise ValueError(f"'{ruta}' tiene aristas inválidas")
+
+        arista = 0
+        for nodo, grado in zip(nodos, grados):
+            row, col = divmod(nodo, ancho)
+            if not (1 <= row <= rows and 1 <= col <= cols):
+                raise ValueError(f"'{ruta}' tiene una transición fuera del mapa")
+            jerarquia.aristas[nodo] = list(zip(destinos[arista:arista + grado], costos[arista:arista + grado]))
+            # Mismo orden de creación que en construir()
+            jerarquia.transiciones.setdefault(jerarquia.cluster((row - 1, col - 1)), []).append(nodo)
+            arista += grado
+        return jerarquia
+
+
+def _tiene_veneno(grid, limites):
+    row0, col0, row1, col1 = limites
+    costos = grid.costos
+    ancho = grid.ancho
+    for inicio in range((row0 + 1) * ancho + col0 + 1, (row1 + 1) * ancho, ancho):
+        if COSTO_VENENO in costos[inicio:inicio + col1 - col0]:
+            return True
+    return False
+
+
+def distancias_entre_transiciones(grid, limites, transiciones):
+    """
+    Costo mínimo dentro del cluster entre cada par de transiciones:
+    matriz[i][j] es el costo de ir de transiciones[i] a transiciones[j].
+
+    Se calcula para todos los orígenes a la vez con NumPy: el cluster se
+    copia a un arreglo plano con su propio borde (costo TOPE_CLUSTER), así
+    los vecinos son desplazamientos fijos como en Grid, y en cada pasada
+    cada celda toma el menor valor de sus vecinos más su propio costo hasta
+    que nada cambia. Dentro del cluster no hay celdas bloqueadas, así que
+    todos los pares tienen costo.
+    """
+    row0, col0, row1, col1 = limites
+    ancho = grid.ancho
+    alto = row1 - row0 + 2
+    ancho_local = col1 - col0 + 2
+    celdas = np.frombuffer(grid.costos, dtype=np.uint8).reshape(grid.rows + 2, ancho)
+    costos = np.full((alto, ancho_local), TOPE_CLUSTER, dtype=np.int32)
+    costos[1:-1, 1:-1] = celdas[row0 + 1:row1 + 1, col0 + 1:col1 + 1]
+    costos = costos.ravel()
+
+    filas, columnas = np.divmod(np.array(transiciones, dtype=np.int64), ancho)
+    locales = (filas - row0) * ancho_local + columnas - col0
+    distancias = np.full((len(transiciones), costos.size), TOPE_CLUSTER, dtype=np.int32)
+    distancias[np.arange(len(transiciones)), locales] = 0
+
+    # Celdas desde la primera hasta la última del interior (incluye los
+    # bordes izquierdo y derecho de cada fila, que nunca bajan de TOPE_CLUSTER)
+    a = ancho_local + 1
+    b = costos.size - ancho_local - 1
+    interior = distancias[:, a:b]
+    costos_interior = costos[a:b]
+    while True:
+        vecinos = np.minimum(distancias[:, a - 1:b - 1], distancias[:, a + 1:b + 1])
+        np.minimum(vecinos, distancias[:, a - ancho_local:b - ancho_local], out=vecinos)
+        np.minimum(vecinos, distancias[:, a + ancho_local:b + ancho_local], out=vecinos)
+        vecinos += costos_interior
+        if not (vecinos < interior).any():
+            break
+        np.minimum(interior, vecinos, out=interior)
+    return distancias[:, locales].tolist()
+
+
+def ruta_jerarquia(ruta_mapa):
+    """Archivo donde se guarda la jerarquía de un mapa (al lado del mapa)"""
+    return os.path.splitext(ruta_mapa)[0] + EXTENSION_JERARQUIA
+
+
+def cargar_jerarquia(ruta_mapa, grid, tamano_cluster=TAMANO_CLUSTER):
+    """
+    Retorna la jerarquía del mapa guardado en ruta_mapa. Si ya existe un
+    archivo .hpa del mismo mapa (misma huella y tamaño de cluster) se carga,
+    si no se construye y se intenta guardar para la próxima vez (si no se
+    puede escribir, por ejemplo en una carpeta de solo lectura, se usa igual).
+    """
+    ruta = ruta_jerarquia(ruta_mapa)
+    huella = grid.huella()
+    if os.path.exists(ruta):
+        try:
+            jerarquia = Jerarquia.cargar(ruta)
+            if jerarquia.huella == huella and jerarquia.tamano_cluster == tamano_cluster:
+                return jerarquia
+        except (OSError, ValueError, struct.error):
+            pass
+
+    jerarquia = Jerarquia.construir(grid, tamano_cluster)
+    try:
+        jerarquia.guardar(ruta)
+    except OSError:
+        pass
+    return jerarquia
+
+
+def subgrid_cluster(grid, limites):
+    """Copia las celdas de un cluster a un Grid propio (con su borde de costo 0)"""
+    row0, col0, row1, col1 = limites
+    sub = Grid(row1 - row0, col1 - col0)
+    columnas = col1 - col0
+    for row in range(row0, row1):
+        origen = grid.indice((row, col0))
+        destino = sub.indice((row - row0, 0))
+        sub.costos[destino:destino + columnas] = grid.costos[origen:origen + columnas]
+    return sub
+
+
+def dijkstra_local(sub, origen, objetivos=(), inverso=False):
+    """
+    Dijkstra dentro del Grid de un cluster desde el índice origen. Termina
+    cuando cierra todos los objetivos (o recorre todo el cluster).
+    inverso=True calcula el costo de llegar desde cada celda hasta origen.
+
+    Returns:
+        (distancias, padres): buffers planos del tamaño de sub
+    """
+    costos = sub.costos
+    distancias = sub.nuevo_buffer(INFINITO)
+    padres = sub.nuevo_buffer(-1)
+    cerrados = bytearray(sub.size)
+    pendientes = set(objetivos)
+    pendientes.discard(origen)
+
+    distancias[origen] = 0
+    open_list = [(0, origen)]
+    while open_list and (pendientes or not objetivos):
+        d, actual = heapq.heappop(open_list)
+        if cerrados[actual]:
+            continue
+        cerrados[actual] = 1
+        pendientes.discard(actual)
+
+        costo_atras = costos[actual]
+        for desplazamiento in sub.desplazamientos:
+            vecino = actual + desplazamiento
+            costo = costos[vecino]
+            # Costo 0: fuera del cluster
+            if not costo:
+                continue
+            nueva = d + (costo_atras if inverso else costo)
+            if nueva < distancias[vecino]:
+                distancias[vecino] = nueva
+                padres[vecino] = actual
+                heapq.heappush(open_list, (nueva, vecino))
+    return distancias, padres
+
+
+def distancias_en_cluster(grid, origen, limites, objetivos, inverso=False, sub=None):
+    """
+    Costo mínimo dentro del cluster desde la celda origen hasta cada objetivo
+    (o desde cada objetivo hasta origen si inverso=True).
+    Retorna un diccionario celda -> costo con los objetivos alcanzables.
+    """
+    if sub is None:
+        sub = subgrid_cluster(grid, limites)
+    row0, col0 = limites[0], limites[1]
+
+    def local(indice):
+        row, col = grid.posicion(indice)
+        return sub.indice((row - row0, col - col0))
+
+    locales = {local(objetivo): objetivo for objetivo in objetivos}
+    distancias, _ = dijkstra_local(sub, local(origen), locales, inverso)
+    return {objetivo: distancias[l] for l, objetivo in locales.items() if distancias[l] != INFINITO}
+
+
+def camino_en_cluster(grid, origen, destino, limites):
+    """Posiciones del camino mínimo de origen a destino dentro del cluster (sin origen)"""
+    sub = subgrid_cluster(grid, limites)
+    row0, col0 = limites[0], limites[1]
+    o_row, o_col = grid.posicion(origen)
+    d_row, d_col = grid.posicion(destino)
+    idx_origen = sub.indice((o_row - row0, o_col - col0))
+    idx_destino = sub.indice((d_row - row0, d_col - col0))
+
+    _, padres = dijkstra_local(sub, idx_origen, (idx_destino,))
+    tramo = []
+    actual = idx_destino
+    while actual != idx_origen:
+        row, col = sub.posicion(actual)
+        tramo.append((row + row0, col + col0))
+        actual = padres[actual]
+    tramo.reverse()
+    return tramo
+
+
+def hpa_search(n, inicio, meta, obstaculos, jerarquia=None, progreso=None, estadisticas=None):
+    """
+    Búsqueda jerárquica. Si no se pasa jerarquia se construye una para el
+    mapa (conviene construirla una vez con cargar_jerarquia y reutilizarla).
+
+    progreso / estadisticas: ver estadisticas.py; los expandidos son nodos
+    abstractos.
+    """
+    t_preparacion = time.perf_counter()
+
+    grid = como_grid(n, obstaculos)
+    if jerarquia is None:
+        jerarquia = Jerarquia.construir(grid)
+    elif jerarquia.huella != grid.huella():
+        raise ValueError("La jerarquía no corresponde al mapa (distinta huella)")
+
+    ancho = grid.ancho
+    idx_inicio = grid.indice(inicio)
+    idx_meta = grid.indice(meta)
+    meta_row, meta_col = divmod(idx_meta, ancho)
+
+    # Conectar inicio y meta con las transiciones de sus clusters
+    cluster_inicio = jerarquia.cluster(inicio)
+    cluster_meta = jerarquia.cluster(meta)
+    transiciones_inicio = jerarquia.transiciones.get(cluster_inicio, [])
+    transiciones_meta = jerarquia.transiciones.get(cluster_meta, [])
+
+    objetivos_inicio = list(transiciones_inicio)
+    if cluster_inicio == cluster_meta:
+        objetivos_inicio.append(idx_meta)
+    desde_inicio = distancias_en_cluster(
+        grid, idx_inicio, jerarquia.limites(cluster_inicio), objetivos_inicio
+    )
+    aristas_inicio = list(desde_inicio.items())
+
+    hacia_meta = distancias_en_cluster(
+        grid, idx_meta, jerarquia.limites(cluster_meta), transiciones_meta, inverso=True
+    )
+
+    # A* sobre el grafo abstracto
+    g_score = {idx_inicio: 0}
+    came_from = {idx_inicio: -1}
+    cerrados = set()
+    # (f, h, nodo): a igual f primero el más cercano a la meta
+    open_list = [(0, 0, idx_inicio)]
+    nodos_explorados = 0
+    duplicados = 0
+    inserciones = 1
+    max_open = 1
+    siguiente_progreso = INTERVALO_PROGRESO if progreso is not None else -1
+
+    salida = "agotado"
+    t_busqueda = time.perf_counter()
+    while open_list:
+        f_actual, h_actual, actual = heapq.heappop(open_list)
+        if actual in cerrados:
+            duplicados += 1
+            continue
+        cerrados.add(actual)
+        nodos_explorados += 1
+
+        if nodos_explorados == siguiente_progreso:
+            siguiente_progreso += INTERVALO_PROGRESO
+            if progreso(nodos_explorados, len(open_list)):
+                salida = "cancelado"
+                break
+
+        if actual == idx_meta:
+            salida = "meta"
+            break
+
+        if actual == idx_inicio:
+            # Si el inicio es una transición también puede cruzar al cluster vecino
+            aristas = aristas_inicio + jerarquia.aristas.get(actual, [])
+        else:
+            aristas = jerarquia.aristas.get(actual, [])
+            if actual in hacia_meta:
+                aristas = aristas + [(idx_meta, hacia_meta[actual])]
+
+        g_actual = g_score[actual]
+        for sucesor, costo in aristas:
+            tentative_g = g_actual + costo
+            if tentative_g < g_score.get(sucesor, INFINITO):
+                g_score[sucesor] = tentative_g
+                came_from[sucesor] = actual
+                row, col = divmod(sucesor, ancho)
+                h = abs(row - meta_row) + abs(col - meta_col)
+                heapq.heappush(open_list, (tentative_g + h, h, sucesor))
+                inserciones += 1
+
+        if len(open_list) > max_open:
+            max_open = len(open_list)
+
+    t_reconstruccion = time.perf_counter()
+    camino = None
+    if salida == "meta":
+        abstracto = []
+        actual = idx_meta
+        while actual != -1:
+            abstracto.append(actual)
+            actual = came_from[actual]
+        abstracto.reverse()
+        camino = refinar_camino(grid, jerarquia, abstracto)
+
+    if progreso is not None and salida != "cancelado":
+        progreso(nodos_explorados, len(open_list))
+
+    if estadisticas is not None:
+        estadisticas.registrar(
+            "hpa", salida, t_preparacion, t_busqueda, t_reconstruccion,
+            expansiones=nodos_explorados,
+            duplicados=duplicados,
+            inserciones=inserciones,
+            max_frontera=max_open,
+        )
+
+    return camino
+
+
+def refinar_camino(grid, jerarquia, abstracto):
+    """Convierte el camino abstracto en un camino celda por celda"""
+    camino = [grid.posicion(abstracto[0])]
+    for origen, destino in zip(abstracto, abstracto[1:]):
+        pos_origen = grid.posicion(origen)
+        pos_destino = grid.posicion(destino)
+        if abs(pos_origen[0] - pos_destino[0]) + abs(pos_origen[1] - pos_destino[1]) == 1:
+            camino.append(pos_destino)
+            continue
+
+        # Ambas celdas están en el mismo cluster
+        limites = jerarquia.limites(jerarquia.cluster(pos_origen))
+        camino.extend(camino_en_cluster(grid, origen, destino, limites))
+    return camino
@@ -0,0 +1,202 @@
+import heapq
+import time
+
+import numpy as np
+
+from .grid import COSTO_VENENO, INFINITO, INTERVALO_PROGRESO, como_grid
+
+# Búsqueda con saltos sobre las zonas de costo uniforme (adaptación de Jump
+# Point Search a 4 vecinos y costos 1 / 3).
+#
+# Se llaman filas interesantes a las que tienen veneno, sus vecinas y las
+# filas del inicio y la meta (igual para las columnas). Fuera de ellas todo
+# cuesta 1, y una fila vecina de una fila con veneno nunca tiene veneno
+# (si no, también sería una fila con veneno y sus vecinas serían interesantes).
+#
+# Un tramo vertical de un camino que va por una columna no interesante se
+# puede correr hasta la columna interesante más cercana sin cambiar el costo,
+# porque todas las celdas que cruza cuestan 1. Lo mismo para los tramos
+# horizontales. Por eso existe un camino óptimo que solo dobla en cruces de
+# una fila y una columna interesantes, y basta con hacer A* sobre esos cruces
+# saltando directamente de uno al siguiente:
+#
+#     costo del salto = (celdas intermedias, todas de costo 1) + costo(destino)
+#
+# En mapas grandes con pocas zonas de veneno los cruces son una fracción
+# mínima de las celdas.
+
+# Celdas revisadas por bloque al buscar las líneas con veneno
+BLOQUE_CELDAS = 1 << 20
+
+
+def manhattan(pos1, pos2):
+    return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
+
+
+def lineas_interesantes(grid, inicio, meta):
+    """Retorna (filas, columnas) interesantes ordenadas"""
+    ancho = grid.ancho
+    # Vista sin copiar (los costos pueden estar en un mmap o en memoria compartida)
+    celdas = np.frombuffer(grid.costos, dtype=np.uint8).reshape(grid.rows + 2, ancho)
+
+    # Por bloques de filas para no crear una máscara del tamaño del tablero
+    filas_veneno = []
+    hay_veneno = np.zeros(ancho, dtype=bool)
+    paso = max(1, BLOQUE_CELDAS // ancho)
+    for inicio_bloque in range(1, grid.rows + 1, paso):
+        veneno = celdas[inicio_bloque:inicio_bloque + paso] == COSTO_VENENO
+        filas_veneno.extend((np.flatnonzero(veneno.any(axis=1)) + inicio_bloque - 1).tolist())
+        hay_veneno |= veneno.any(axis=0)
+    # El borde cuesta 0: la columna c del arreglo es la columna c - 1 del tablero
+    columnas_veneno = (np.flatnonzero(hay_veneno) - 1).tolist()
+
+    filas = {inicio[0], meta[0]}
+    for row in filas_veneno:
+        filas.update((row - 1, row, row + 1))
+    columnas = {inicio[1], meta[1]}
+    for col in columnas_veneno:
+        columnas.update((col - 1, col, col + 1))
+
+    filas = sorted(row for row in filas if 0 <= row < grid.rows)
+    columnas = sorted(col for col in columnas if 0 <= col < grid.cols)
+    return filas, columnas
+
+
+def jump_point_search(n, inicio, meta, obstaculos, progreso=None, estadisticas=None):
+    """
+    A* con saltos entre cruces de filas y columnas interesantes.
+    Retorna un camino de costo óptimo (celda por celda, como las demás
+    búsquedas) o None si no hay camino.
+
+    progreso / estadisticas: ver estadisticas.py.
+    """
+    t_preparacion = time.perf_counter()
+
+    grid = como_grid(n, obstaculos)
+    costos = grid.costos
+    ancho = grid.ancho
+
+    grid.indice(inicio)
+    grid.indice(meta)
+    filas, columnas = lineas_interesantes(grid, inicio, meta)
+    num_filas = len(filas)
+    num_columnas = len(columnas)
+
+    # Nodo = i * num_columnas + j para el cruce de filas[i] y columnas[j]
+    i_inicio = filas.index(inicio[0])
+    j_inicio = columnas.index(inicio[1])
+    i_meta = filas.index(meta[0])
+    j_meta = columnas.index(meta[1])
+    nodo_inicio = i_inicio * num_columnas + j_inicio
+    nodo_meta = i_meta * num_columnas + j_meta
+    meta_row, meta_col = meta
+
+    g_score = [INFINITO] * (num_filas * num_columnas)
+    g_score[nodo_inicio] = 0
+    came_from = {}
+    closed_set = bytearray(num_filas * num_columnas)
+
+    # Cola de prioridad: (f, h, nodo). A igual f se expande primero el más
+    # cercano a la meta, así no se recorren las mesetas de f constante
+    h_inicio = manhattan(inicio, meta)
+    open_list = [(h_inicio, h_inicio, nodo_inicio)]
+    nodos_explorados = 0
+    duplicados = 0
+    inserciones = 1
+    max_open = 1
+    siguiente_progreso = INTERVALO_PROGRESO if progreso is not None else -1
+
+    salida = "agotado"
+    t_busqueda = time.perf_counter()
+    while open_list:
+        f_actual, h_actual, actual = heapq.heappop(open_list)
+        if closed_set[actual]:
+            duplicados += 1
+            continue
+        closed_set[actual] = 1
+        nodos_explorados += 1
+
+        if nodos_explorados == siguiente_progreso:
+            siguiente_progreso += INTERVALO_PROGRESO
+            if progreso(nodos_explorados, len(open_list)):
+                salida = "cancelado"
+                break
+
+        if actual == nodo_meta:
+            salida = "meta"
+            break
+
+        i, j = divmod(actual, num_columnas)
+        row = filas[i]
+        col = columnas[j]
+        g_actual = g_score[actual]
+
+        # Saltos al cruce anterior / siguiente en la misma columna y fila
+        saltos = []
+        if i > 0:
+            saltos.append((actual - num_columnas, filas[i - 1], col))
+        if i + 1 < num_filas:
+            saltos.append((actual + num_columnas, filas[i + 1], col))
+        if j > 0:
+            saltos.append((actual - 1, row, columnas[j - 1]))
+        if j + 1 < num_columnas:
+            saltos.append((actual + 1, row, columnas[j + 1]))
+
+        for sucesor, s_row, s_col in saltos:
+            # Las celdas intermedias cuestan 1, el destino puede ser veneno
+            distancia = abs(s_row - row) + abs(s_col - col)
+            tentative_g = g_actual + distancia - 1 + costos[(s_row + 1) * ancho + s_col + 1]
+            if tentative_g < g_score[sucesor]:
+                g_score[sucesor] = tentative_g
+                came_from[sucesor] = actual
+                h = abs(s_row - meta_row) + abs(s_col - meta_col)
+                heapq.heappush(open_list, (tentative_g + h, h, sucesor))
+                inserciones += 1
+
+        if len(open_list) > max_open:
+            max_open = len(open_list)
+
+    t_reconstruccion = time.perf_counter()
+    camino = None
+    if salida == "meta":
+        camino = reconstruir_camino_saltos(filas, columnas, came_from, nodo_meta)
+
+    if progreso is not None and salida != "cancelado":
+        progreso(nodos_explorados, len(open_list))
+
+    if estadisticas is not None:
+        estadisticas.registrar(
+            "jump_point_search", salida, t_preparacion, t_busqueda, t_reconstruccion,
+            expansiones=nodos_explorados,
+            duplicados=duplicados,
+            inserciones=inserciones,
+            max_frontera=max_open,
+        )
+
+    return camino
+
+
+def reconstruir_camino_saltos(filas, columnas, came_from, nodo_meta):
+    """
+    Reconstruye el camino entre cruces y rellena las celdas de cada salto
+    para retornar el camino celda por celda
+    """
+    num_columnas = len(columnas)
+    cruces = [nodo_meta]
+    while cruces[-1] in came_from:
+        cruces.append(came_from[cruces[-1]])
+    cruces.reverse()
+
+    i, j = divmod(cruces[0], num_columnas)
+    camino = [(filas[i], columnas[j])]
+    for nodo in cruces[1:]:
+        i, j = divmod(nodo, num_columnas)
+        row, col = camino[-1]
+        destino_row, destino_col = filas[i], columnas[j]
+        paso_row = (destino_row > row) - (destino_row < row)
+        paso_col = (destino_col > col) - (destino_col < col)
+        while (row, col) != (destino_row, destino_col):
+            row += paso_row
+            col += paso_col
+            camino.append((row, col))
+    return camino
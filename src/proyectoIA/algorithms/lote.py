@@ -0,0 +1,161 @@
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import shared_memory
+
+from .beam_search import beam_search
+from .dynamic import dynamic_weighting_search
+from .estadisticas import EstadisticasBusqueda
+from .grid import Grid
+
+# Algoritmos disponibles para las consultas en lote
+ALGORITMOS = {
+    "beam": beam_search,
+    "dw": dynamic_weighting_search,
+}
+
+# Consultas por tarea y tareas en vuelo por proceso en resolver_lote_streaming
+TAM_BLOQUE_STREAMING = 16
+TAREAS_POR_PROCESO = 4
+
+# Tablero compartido de cada proceso trabajador (se asigna en _inicializar_worker)
+_grid_worker = None
+_memoria_worker = None
+
+
+def _inicializar_worker(nombre_memoria, rows, cols, num_venenos):
+    """Conecta el proceso trabajador a la memoria compartida con el tablero"""
+    global _grid_worker, _memoria_worker
+
+    memoria = shared_memory.SharedMemory(name=nombre_memoria)
+
+    tamano = (rows + 2) * (cols + 2)
+    _memoria_worker = memoria
+    _grid_worker = Grid(rows, cols, memoria.buf[:tamano], num_venenos)
+
+
+def _ejecutar_en_worker(trabajo):
+    """Llama funcion(grid_compartido, *argumentos) en el proceso trabajador"""
+    funcion, argumentos = trabajo
+    return funcion(_grid_worker, *argumentos)
+
+
+@contextmanager
+def pool_compartido(grid, procesos):
+    """
+    Pool de procesos donde cada trabajador ve el tablero en memoria
+    compartida. El tablero se copia una sola vez y se libera al salir; los
+    venenos se cuentan una sola vez aquí y no en cada trabajador.
+    """
+    memoria = shared_memory.SharedMemory(create=True, size=grid.size)
+    try:
+        memoria.buf[:grid.size] = grid.costos
+        with ProcessPoolExecutor(
+            max_workers=procesos,
+            initializer=_inicializar_worker,
+            initargs=(memoria.name, grid.rows, grid.cols, grid.contar_venenos()),
+        ) as pool:
+            yield pool
+    finally:
+        memoria.close()
+        memoria.unlink()
+
+
+def _resolver_consulta(grid, algoritmo, inicio, meta, parametros):
+    """Ejecuta una consulta y mide su tiempo"""
+    funcion = ALGORITMOS[algoritmo]
+    estadisticas = EstadisticasBusqueda()
+    t0 = time.perf_counter()
+    camino = funcion((grid.rows, grid.cols), inicio, meta, grid, estadisticas=estadisticas, **parametros)
+    tiempo = time.perf_counter() - t0
+    costos = grid.costos
+    return {
+        "inicio": inicio,
+        "meta": meta,
+        "camino": camino,
+        "costo": sum(costos[grid.indice(pos)] for pos in camino[1:]) if camino else None,
+        "expansiones": estadisticas.expansiones,
+        "tiempo": tiempo,
+    }
+
+
+def _resolver_en_worker(consulta):
+    algoritmo, inicio, meta, parametros = consulta
+    return _resolver_consulta(_grid_worker, algoritmo, inicio, meta, parametros)
+
+
+def _resolver_bloque_en_worker(bloque):
+    return [_resolver_en_worker(consulta) for consulta in bloque]
+
+
+def resolver_lote(grid, consultas, algoritmo="dw", procesos=None, **parametros):
+    """
+    Resuelve muchas consultas (inicio, meta) sobre un mismo tablero.
+
+    grid: Grid ya cargado, se comparte con los procesos por memoria compartida
+    consultas: iterable de tuplas (inicio, meta)
+    algoritmo: "beam" o "dw"
+    procesos: cantidad de procesos (None = os.cpu_count(), 1 = sin pool)
+    parametros: argumentos extra de la búsqueda (por ejemplo epsilon)
+
+    Retorna una lista de diccionarios {inicio, meta, camino, costo,
+    expansiones, tiempo} en el mismo orden de las consultas. tiempo está en
+    segundos.
+    """
+    if algoritmo not in ALGORITMOS:
+        raise ValueError(f"Algoritmo desconocido '{algoritmo}', opciones: {', '.join(ALGORITMOS)}")
+
+    consultas = list(consultas)
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+
+    if procesos <= 1 or len(consultas) <= 1:
+        return [_resolver_consulta(grid, algoritmo, inicio, meta, parametros) for inicio, meta in consultas]
+
+    # Bloques grandes para reducir la comunicación entre procesos
+    tam_bloque = max(1, len(consultas) // (procesos * 4))
+    trabajos = [(algoritmo, inicio, meta, parametros) for inicio, meta in consultas]
+
+    with pool_compartido(grid, procesos) as pool:
+        # map conserva el orden de entrada
+        return list(pool.map(_resolver_en_worker, trabajos, chunksize=tam_bloque))
+
+
+def resolver_lote_streaming(grid, consultas, algoritmo="dw", procesos=None, **parametros):
+    """
+    Igual que resolver_lote pero como generador: entrega cada resultado
+    (en el orden de las consultas) apenas está listo y lee las consultas a
+    medida que hacen falta, así consultas puede ser un iterable sin fin
+    (por ejemplo las líneas de stdin) sin guardarlo entero en memoria.
+    """
+    if algoritmo not in ALGORITMOS:
+        raise ValueError(f"Algoritmo desconocido '{algoritmo}', opciones: {', '.join(ALGORITMOS)}")
+
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+
+    if procesos <= 1:
+        for inicio, meta in consultas:
+            yield _resolver_consulta(grid, algoritmo, inicio, meta, parametros)
+        return
+
+    trabajos = ((algoritmo, inicio, meta, parametros) for inicio, meta in consultas)
+    with pool_compartido(grid, procesos) as pool:
+        # Ventana acotada de tareas en vuelo: se agrega un bloque nuevo
+        # cada vez que se entrega el más antiguo
+        pendientes = deque()
+        for _ in range(procesos * TAREAS_POR_PROCESO):
+            bloque = list(islice(trabajos, TAM_BLOQUE_STREAMING))
+            if not bloque:
+                break
+            pendientes.append(pool.submit(_resolver_bloque_en_worker, bloque))
+
+        while pendientes:
+            resultados = pendientes.popleft().result()
+            bloque = list(islice(trabajos, TAM_BLOQUE_STREAMING))
+            if bloque:
+                pendientes.append(pool.submit(_resolver_bloque_en_worker, bloque))
+            yield from resultados
@@ -0,0 +1,42 @@
+from .campo_distancias import CampoDistancias, calcular_distancias_multiples
+from .grid import como_grid
+
+# Muchas hormigas y muchos hongos en el mismo mapa.
+#
+# En lugar de una búsqueda por cada par (hormiga, hongo), se calcula un solo
+# campo de distancias con todos los hongos como fuente (Dijkstra multifuente
+# inverso). Cada celda queda con el costo hasta su hongo más cercano y bajar
+# por el campo desde una hormiga termina justamente en ese hongo.
+
+
+class CampoMultifuente(CampoDistancias):
+    """
+    Distancias exactas de todas las celdas al hongo más cercano.
+
+    n: tamaño del tablero (n para nxn o tupla (rows, cols))
+    metas: lista de posiciones (row, col) de los hongos
+    obstaculos: lista de posiciones con veneno o un Grid
+
+    distancia(), matriz(), camino() y caminos() funcionan igual que en
+    CampoDistancias; camino() termina en el hongo más cercano.
+    """
+
+    def __init__(self, n, metas, obstaculos):
+        self.grid = como_grid(n, obstaculos)
+        self.metas = list(metas)
+        self.meta = None
+        self.distancias = calcular_distancias_multiples(self.grid, self.metas)
+
+    def hongo_mas_cercano(self, posicion):
+        """Hongo al que llega el camino óptimo desde posicion (None si ninguno)"""
+        camino = self.camino(posicion)
+        return camino[-1] if camino else None
+
+
+def caminos_multifuente(n, hormigas, hongos, obstaculos):
+    """
+    Camino de cada hormiga a su hongo más cercano con una sola pasada.
+    Retorna una lista en el orden de hormigas con el camino (de la hormiga
+    al hongo) o None si la hormiga no puede llegar a ningún hongo.
+    """
+    return CampoMultifuente(n, hongos, obstaculos).caminos(hormigas)
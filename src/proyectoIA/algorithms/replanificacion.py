@@ -0,0 +1,199 @@
+import heapq
+
+from .grid import COSTO_NORMAL, COSTO_VENENO, INFINITO, como_grid
+
+# Replanificación incremental con D* Lite.
+#
+# La búsqueda va desde la meta hacia la hormiga: g(s) es el costo de ir de s
+# a la meta y rhs(s) = min(costo(s') + g(s')) sobre los vecinos s' de s
+# (costo de entrar a s'). Al cambiar el costo de una celda v solo cambian las
+# aristas que entran a v, así que basta con actualizar rhs de sus vecinos y
+# reparar las celdas que quedan inconsistentes (g != rhs). El resto del
+# trabajo de las búsquedas anteriores se conserva.
+
+
+class PlanificadorIncremental:
+    """
+    Mantiene el estado de la búsqueda entre llamadas.
+
+    n: tamaño del tablero (n para nxn o tupla (rows, cols))
+    obstaculos: lista de posiciones con veneno o un Grid. Los costos se
+    copian, así que editar el planificador no modifica el Grid original.
+
+    Uso:
+        planificador = PlanificadorIncremental(n, inicio, meta, obstaculos)
+        camino = planificador.camino()
+        planificador.agregar_veneno((3, 4))
+        camino = planificador.camino()   # solo repara lo afectado
+    """
+
+    def __init__(self, n, inicio, meta, obstaculos):
+        grid = como_grid(n, obstaculos)
+        self.grid = grid
+        self.costos = bytearray(grid.costos)
+        self.ancho = grid.ancho
+
+        self.idx_inicio = grid.indice(inicio)
+        self.idx_meta = grid.indice(meta)
+        # Corrección de las claves al mover el inicio
+        self.km = 0
+
+        self.g = grid.nuevo_buffer(INFINITO)
+        self.rhs = grid.nuevo_buffer(INFINITO)
+        self.rhs[self.idx_meta] = 0
+
+        # Cola con borrado perezoso: en_cola[celda] es la clave vigente
+        self.open_list = []
+        self.en_cola = {}
+        self._encolar(self.idx_meta)
+
+        # Celdas expandidas en la última llamada a camino()
+        self.expansiones = 0
+
+    def _heuristica(self, indice):
+        row, col = divmod(indice, self.ancho)
+        i_row, i_col = divmod(self.idx_inicio, self.ancho)
+        return abs(row - i_row) + abs(col - i_col)
+
+    def _clave(self, indice):
+        minimo = min(self.g[indice], self.rhs[indice])
+        return (minimo + self._heuristica(indice) + self.km, minimo)
+
+    def _encolar(self, indice):
+        """Pone la celda en la cola si es inconsistente, si no la quita"""
+        if self.g[indice] != self.rhs[indice]:
+            clave = self._clave(indice)
+            self.en_cola[indice] = clave
+            heapq.heappush(self.open_list, (clave, indice))
+        else:
+            self.en_cola.pop(indice, None)
+
+    def _recalcular_rhs(self, indice):
+        costos = self.costos
+        g = self.g
+        mejor = INFINITO
+        for desplazamiento in self.grid.desplazamientos:
+            vecino = indice + desplazamiento
+            costo = costos[vecino]
+            if costo and costo + g[vecino] < mejor:
+                mejor = costo + g[vecino]
+        self.rhs[indice] = mejor
+
+    def _tope(self):
+        """Clave mínima vigente de la cola (descarta entradas viejas)"""
+        open_list = self.open_list
+        while open_list:
+            clave, indice = open_list[0]
+            if self.en_cola.get(indice) == clave:
+                return clave
+            heapq.heappop(open_list)
+        return (INFINITO, INFINITO)
+
+    def _calcular(self):
+        costos = self.costos
+        desplazamientos = self.grid.desplazamientos
+        g = self.g
+        rhs = self.rhs
+        inicio = self.idx_inicio
+        meta = self.idx_meta
+        expansiones = 0
+
+        while True:
+            tope = self._tope()
+            if not self.open_list or not (tope < self._clave(inicio) or rhs[inicio] != g[inicio]):
+                break
+            clave_vieja, actual = heapq.heappop(self.open_list)
+            clave_nueva = self._clave(actual)
+            if clave_vieja < clave_nueva:
+                self.en_cola[actual] = clave_nueva
+                heapq.heappush(self.open_list, (clave_nueva, actual))
+                continue
+
+            del self.en_cola[actual]
+            expansiones += 1
+            costo_actual = costos[actual]
+            if g[actual] > rhs[actual]:
+                # Sobreconsistente: fijar g y mejorar a los vecinos
+                g[actual] = rhs[actual]
+                candidato = costo_actual + g[actual]
+                for desplazamiento in desplazamientos:
+                    vecino = actual + desplazamiento
+                    if costos[vecino] and vecino != meta and candidato < rhs[vecino]:
+                        rhs[vecino] = candidato
+                        self._encolar(vecino)
+            else:
+                # Subconsistente: invalidar g y recalcular a quienes dependían de ella
+                g_vieja = g[actual]
+                g[actual] = INFINITO
+                if actual != meta:
+                    self._recalcular_rhs(actual)
+                self._encolar(actual)
+                for desplazamiento in desplazamientos:
+                    vecino = actual + desplazamiento
+                    if costos[vecino] and vecino != meta and rhs[vecino] == costo_actual + g_vieja:
+                        self._recalcular_rhs(vecino)
+                        self._encolar(vecino)
+
+        self.expansiones = expansiones
+
+    def camino(self):
+        """Camino óptimo actual de inicio a meta o None si no hay camino"""
+        self._calcular()
+        if self.g[self.idx_inicio] >= INFINITO:
+            return None
+
+        costos = self.costos
+        g = self.g
+        actual = self.idx_inicio
+        camino = [self.grid.posicion(actual)]
+        while actual != self.idx_meta:
+            mejor = None
+            mejor_costo = INFINITO
+            for desplazamiento in self.grid.desplazamientos:
+                vecino = actual + desplazamiento
+                costo = costos[vecino]
+                if costo and costo + g[vecino] < mejor_costo:
+                    mejor = vecino
+                    mejor_costo = costo + g[vecino]
+            actual = mejor
+            camino.append(self.grid.posicion(actual))
+        return camino
+
+    def cambiar_costo(self, posicion, costo):
+        """
+        Cambia el costo de entrar a una celda (COSTO_NORMAL o COSTO_VENENO).
+        ValueError con otro costo: 0 es el costo del borde y la celda
+        quedaría fuera del tablero.
+        """
+        if costo not in (COSTO_NORMAL, COSTO_VENENO):
+            raise ValueError(f"Costo inválido: {costo!r} (se espera {COSTO_NORMAL} o {COSTO_VENENO})")
+        indice = self.grid.indice(posicion)
+        costo_viejo = self.costos[indice]
+        if costo == costo_viejo:
+            return
+        self.costos[indice] = costo
+
+        # Solo cambian las aristas que entran a la celda
+        g_celda = self.g[indice]
+        for desplazamiento in self.grid.desplazamientos:
+            vecino = indice + desplazamiento
+            if not self.costos[vecino] or vecino == self.idx_meta:
+                continue
+            if costo < costo_viejo:
+                if costo + g_celda < self.rhs[vecino]:
+                    self.rhs[vecino] = costo + g_celda
+            elif self.rhs[vecino] == costo_viejo + g_celda:
+                self._recalcular_rhs(vecino)
+            self._encolar(vecino)
+
+    def agregar_veneno(self, posicion):
+        self.cambiar_costo(posicion, COSTO_VENENO)
+
+    def quitar_veneno(self, posicion):
+        self.cambiar_costo(posicion, COSTO_NORMAL)
+
+    def mover_inicio(self, posicion):
+        """Mueve la hormiga (por ejemplo al avanzar por el camino) sin perder el estado"""
+        indice = self.grid.indice(posicion)
+        self.km += self._heuristica(indice)
+        self.idx_inicio = indice
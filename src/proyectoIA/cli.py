@@ -0,0 +1,138 @@
+"""
+Consultas en lote desde la línea de comandos, sin interfaz gráfica.
+
+Cada línea de entrada es una consulta "fila_inicio col_inicio fila_meta col_meta"
+(base 0, separadas por espacios o comas; también se acepta JSON
+{"inicio": [r, c], "meta": [r, c]}). Por cada consulta se escribe una línea
+JSON (NDJSON) apenas termina, en el mismo orden de la entrada.
+
+Uso (desde la carpeta src):
+    python -m proyectoIA.cli mapa1.txt --algoritmo dw --epsilon 2 < consultas.txt
+    python -m proyectoIA.cli /ruta/mapa.bin --consultas consultas.txt --procesos 4
+    python -m proyectoIA.cli mapa.txt                # consulta de la hormiga al hongo del mapa
+    generar_consultas | python -m proyectoIA.cli mapa.txt --sin-camino | jq .costo
+
+El mapa puede ser un archivo de gui/txt/ (por nombre) o cualquier ruta.
+"""
+import argparse
+import json
+import os
+import sys
+
+from .core import load_grid_multiple
+from .algorithms.lote import ALGORITMOS, resolver_lote_streaming
+
+
+def leer_consultas(lineas, grid, errores=sys.stderr):
+    """
+    Genera (inicio, meta) a partir de líneas de texto. Las líneas vacías y
+    las que empiezan con '#' se ignoran; las inválidas se informan en
+    errores y se saltan.
+    """
+    for numero, linea in enumerate(lineas, 1):
+        linea = linea.strip()
+        if not linea or linea.startswith("#"):
+            continue
+        try:
+            if linea.startswith("{"):
+                datos = json.loads(linea)
+                inicio = tuple(datos["inicio"])
+                meta = tuple(datos["meta"])
+            else:
+                valores = [int(valor) for valor in linea.replace(",", " ").split()]
+                if len(valores) != 4:
+                    raise ValueError("se esperaban 4 números")
+                inicio = (valores[0], valores[1])
+                meta = (valores[2], valores[3])
+            # Valida que ambas posiciones estén dentro del tablero
+            grid.indice(inicio)
+            grid.indice(meta)
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Línea {numero} ignorada: {e}", file=errores)
+            continue
+        yield inicio, meta
+
+
+def entero_positivo(texto):
+    """Tipo de argparse: entero mayor que 0"""
+    try:
+        valor = int(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"se esperaba un entero: {texto!r}")
+    if valor < 1:
+        raise argparse.ArgumentTypeError(f"debe ser al menos 1: {valor}")
+    return valor
+
+
+def como_json(resultado, incluir_camino=True):
+    datos = {
+        "inicio": list(resultado["inicio"]),
+        "meta": list(resultado["meta"]),
+        "costo": resultado["costo"],
+        "pasos": len(resultado["camino"]) - 1 if resultado["camino"] else None,
+        "expansiones": resultado["expansiones"],
+        "tiempo": round(resultado["tiempo"], 6),
+    }
+    if incluir_camino:
+        datos["camino"] = [list(pos) for pos in resultado["camino"]] if resultado["camino"] else None
+    return json.dumps(datos, separators=(",", ":"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Búsquedas en lote con salida NDJSON")
+    parser.add_argument("mapa", help="nombre de un mapa de gui/txt/ o ruta a un mapa .txt / .bin")
+    parser.add_argument("--algoritmo", choices=sorted(ALGORITMOS), default="dw")
+    parser.add_argument("--beam-width", type=entero_positivo, help="ancho del beam (beam)")
+    parser.add_argument("--epsilon", type=float, help="peso inicial de la heurística (dw)")
+    parser.add_argument("--consultas", help="archivo de consultas (por defecto stdin)")
+    parser.add_argument("--procesos", type=int, default=1,
+                        help="procesos en paralelo (0 = todos los núcleos)")
+    parser.add_argument("--sin-camino", action="store_true", help="no incluir el camino en la salida")
+    args = parser.parse_args(argv)
+
+    parametros = {}
+    if args.beam_width is not None:
+        if args.algoritmo != "beam":
+            parser.error("--beam-width solo aplica a --algoritmo beam")
+        parametros["beam_width"] = args.beam_width
+    if args.epsilon is not None:
+        if args.algoritmo != "dw":
+            parser.error("--epsilon solo aplica a --algoritmo dw")
+        parametros["epsilon"] = args.epsilon
+
+    ruta = os.path.abspath(args.mapa) if os.path.exists(args.mapa) else args.mapa
+    try:
+        grid, hormigas, hongos = load_grid_multiple(ruta, verbose=False)
+    except (OSError, ValueError) as e:
+        print(f"Error al leer el mapa: {e}", file=sys.stderr)
+        return 2
+
+    if args.consultas:
+        entrada = open(args.consultas, encoding="utf-8")
+    elif sys.stdin.isatty():
+        # Sin consultas: de la hormiga al hongo del mapa (los últimos del archivo)
+        if not hormigas or not hongos:
+            print("El mapa no tiene hormiga y hongo; pase consultas por stdin o --consultas", file=sys.stderr)
+            return 2
+        entrada = [f"{hormigas[-1][0]} {hormigas[-1][1]} {hongos[-1][0]} {hongos[-1][1]}"]
+    else:
+        entrada = sys.stdin
+
+    procesos = args.procesos or None
+    try:
+        consultas = leer_consultas(entrada, grid)
+        for resultado in resolver_lote_streaming(grid, consultas, args.algoritmo, procesos, **parametros):
+            sys.stdout.write(como_json(resultado, not args.sin_camino) + "\n")
+            sys.stdout.flush()
+    except BrokenPipeError:
+        # La salida se cerró antes (por ejemplo "| head"): terminar sin traza
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        if args.consultas:
+            entrada.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Núcleo sin interfaz gráfica: lectura de mapas, Grid y búsquedas.
+
+No importa Qt y los módulos se cargan recién cuando se usa el nombre
+(PEP 562), así un proceso que solo lee mapas no paga el costo de importar
+NumPy ni las búsquedas que no usa:
+
+    from proyectoIA.core import load_grid, dynamic_weighting_search
+"""
+from importlib import import_module
+
+# nombre -> módulo (relativo a proyectoIA.core) donde está definido
+_EXPORTADOS = {
+    # Mapas
+    "CellTypes": ".mapa",
+    "ruta_mapa": ".mapa",
+    "parsear_mapa": ".mapa",
+    "load_map": ".mapa",
+    "load_grid": ".mapa",
+    "load_grid_multiple": ".mapa",
+    "guardar_mapa_binario": ".mapa_binario",
+    "cargar_mapa_binario": ".mapa_binario",
+    "cargar_mapa_binario_multiple": ".mapa_binario",
+    "convertir_mapa": ".mapa_binario",
+    # Tablero
+    "Grid": "..algorithms.grid",
+    "como_grid": "..algorithms.grid",
+    "EstadisticasBusqueda": "..algorithms.estadisticas",
+    # Búsquedas
+    "beam_search": "..algorithms.beam_search",
+    "beam_search_acotado": "..algorithms.beam_search",
+    "dynamic_weighting_search": "..algorithms.dynamic",
+    "dynamic_weighting_bidireccional": "..algorithms.dynamic",
+    "dynamic_weighting_anytime": "..algorithms.dynamic",
+    "jump_point_search": "..algorithms.jps",
+    "hpa_search": "..algorithms.hpa",
+    "PlanificadorIncremental": "..algorithms.replanificacion",
+    "CampoDistancias": "..algorithms.campo_distancias",
+    "CampoMultifuente": "..algorithms.multifuente",
+    "caminos_multifuente": "..algorithms.multifuente",
+    "resolver_lote": "..algorithms.lote",
+}
+
+__all__ = sorted(_EXPORTADOS)
+
+
+def __getattr__(nombre):
+    modulo = _EXPORTADOS.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(import_module(modulo, __name__), nombre)
+    # Guardar en el módulo para no volver a pasar por __getattr__
+    globals()[nombre] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTADOS))
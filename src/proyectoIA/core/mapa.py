@@ -0,0 +1,327 @@
+import re
+import os
+import time
+
+from ..algorithms.grid import COSTO_NORMAL, COSTO_VENENO, Grid
+
+# Lectura de mapas sin depender de Qt (los colores están en gui/mapa.py)
+
+# Carpeta con los mapas de texto
+DIRECTORIO_MAPAS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gui", "txt")
+
+# Tipos de celdas
+class CellTypes:
+    EMPTY = 0
+    ANT = 1
+    OBSTACLE = 2
+    OBJECTIVE = 3
+
+# Tamaño de los bloques leídos del archivo (1 MiB)
+TAMANO_BLOQUE = 1 << 20
+
+PATRON_TAMANO = re.compile(r'Tama[ñn]o\((\d+)\s*,\s*(\d+)\)')
+PATRON_COORDENADA = re.compile(r'\((\d+)\s*,\s*(\d+)\)')
+
+
+def ruta_mapa(nombre_archivo="mapa.txt"):
+    """
+    Retorna la ruta del mapa dentro de la carpeta txt/.
+    Si se pide mapa.txt y no existe se crea uno por defecto.
+    """
+    filename = os.path.join(DIRECTORIO_MAPAS, nombre_archivo)
+
+    if os.path.exists(filename):
+        return filename
+
+    if nombre_archivo == "mapa.txt":
+        print("Archivo mapa.txt no encontrado. Creando archivo por defecto...")
+        # Crear el directorio txt si no existe
+        os.makedirs(DIRECTORIO_MAPAS, exist_ok=True)
+        
+        # Crea el archivo mapa.txt si no existe
+        with open(filename, 'w', encoding='utf-8') as file:
+            file.write("Tamaño(6,6)\n")
+            file.write("Hormiga(1,1)\n")
+            file.write("Veneno((2,2),(1,3),(4,3),(2,4),(3,5))\n")
+            file.write("Hongo(5,5)\n")
+
+        print("Archivo creado.")
+        return filename
+
+    # Si no es el archivo por defecto, lanzar la excepción
+    raise FileNotFoundError(f"No se encontró el archivo '{nombre_archivo}' en la carpeta txt/")
+
+
+def _parsear_linea(line):
+    """Interpreta una línea completa y retorna su evento (o None)"""
+    line = line.strip()
+    
+    if not line:
+        return None
+
+    if line.startswith("Tamaño") or line.startswith("Tamano"):
+        # Intentar con y sin tilde
+        match = PATRON_TAMANO.search(line)
+        if match:
+            return ("tamano", int(match.group(1)), int(match.group(2)))
+        return ("error", "No se pudo parsear el tamaño. Formato esperado: Tamaño(n,m)")
+
+    elif line.startswith("Hormiga"):
+        # Hormiga(r,c) o varias en una línea: Hormiga((r,c),(r,c),...)
+        posiciones = _posiciones_base_0(line)
+        if posiciones:
+            return ("hormiga", posiciones)
+        return ("error", "No se pudo parsear la hormiga")
+
+    elif line.startswith("Veneno"):
+        return ("veneno", PATRON_COORDENADA.findall(line))
+
+    elif line.startswith("Hongo"):
+        posiciones = _posiciones_base_0(line)
+        if posiciones:
+            return ("hongo", posiciones)
+        return ("error", "No se pudo parsear el hongo")
+
+    return None
+
+
+def _posiciones_base_0(line):
+    """Coordenadas (r,c) base 1 de una línea como posiciones base 0"""
+    return [(int(r) - 1, int(c) - 1) for r, c in PATRON_COORDENADA.findall(line)]
+
+
+def parsear_mapa(file, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Lee un mapa en formato texto por bloques, sin cargar todo el archivo.
+
+    Genera eventos en el orden del archivo:
+        ("tamano", rows, cols)
+        ("hormiga", [(row, col), ...])                -> posiciones base 0
+        ("hongo", [(row, col), ...])                  -> posiciones base 0
+        ("veneno", [("r", "c"), ...])                  -> coordenadas base 1 sin convertir
+        ("error", mensaje)
+
+    Una línea de venenos muy larga se entrega en varios eventos "veneno"
+    a medida que se lee, cortando siempre después de un ')'.
+    """
+    resto = ""
+    en_veneno = False
+
+    while True:
+        bloque = file.read(tamano_bloque)
+        fin = not bloque
+        datos = resto + bloque if resto else bloque
+        pos = 0
+
+        while True:
+            nl = datos.find("\n", pos)
+
+            if en_veneno:
+                # Continuación de una línea de venenos
+                if nl != -1:
+                    corte = nl
+                elif fin:
+                    corte = len(datos)
+                else:
+                    # Ninguna coordenada cruza un ')': se corta después del último
+                    corte = max(datos.rfind(")", pos) + 1, pos)
+                coords = PATRON_COORDENADA.findall(datos, pos, corte)
+                if coords:
+                    yield ("veneno", coords)
+                if nl == -1:
+                    pos = corte
+                    break
+                en_veneno = False
+                pos = nl + 1
+                continue
+
+            if nl == -1:
+                linea = datos[pos:]
+                if fin:
+                    evento = _parsear_linea(linea)
+                    if evento is not None:
+                        yield evento
+                    pos = len(datos)
+                elif linea.lstrip().startswith("Veneno"):
+                    # Línea de venenos incompleta: se procesa por partes
+                    en_veneno = True
+                    continue
+                break
+
+            evento = _parsear_linea(datos[pos:nl])
+            if evento is not None:
+                yield evento
+            pos = nl + 1
+
+        resto = datos[pos:]
+        if fin:
+            break
+
+
+# Funcion para cargar el mapa a partir de un archivo especificado
+def load_map(nombre_archivo="mapa.txt", verbose=True):
+    """
+    Carga un mapa desde un archivo de texto.
+    
+    Args:
+        nombre_archivo: Nombre del archivo a cargar (por defecto "mapa.txt")
+        verbose: Si es False no imprime nada (errores del archivo incluidos)
+    
+    Returns:
+        tupla (rows, cols, grid_data)
+    """
+    informar = print if verbose else _no_informar
+    informar(f"\n=== CARGANDO MAPA ===")
+    filename = ruta_mapa(nombre_archivo)
+    informar(f"Archivo: {filename}")
+
+    if filename.endswith(".bin"):
+        # Mapa en formato binario (ver mapa_binario.py)
+        from .mapa_binario import grid_data_desde_binario
+        return grid_data_desde_binario(filename)
+
+    # Inicializar variables por defecto
+    rows = 5
+    cols = 5
+    grid_data = {}
+    num_venenos = 0
+
+    t0 = time.perf_counter()
+    with open(filename, 'r', encoding='utf-8') as file:
+        for evento in parsear_mapa(file):
+            tipo = evento[0]
+
+            if tipo == "veneno":
+                coords = evento[1]
+                num_venenos += len(coords)
+                grid_data.update(
+                    ((int(r) - 1, int(c) - 1), CellTypes.OBSTACLE) for r, c in coords
+                )
+
+            elif tipo == "tamano":
+                rows, cols = evento[1], evento[2]
+                informar(f"  -> Tamaño detectado: {rows}x{cols}")
+
+            elif tipo == "hormiga":
+                for posicion in evento[1]:
+                    grid_data[posicion] = CellTypes.ANT
+                    informar(f"  -> Hormiga en posición {posicion}")
+
+            elif tipo == "hongo":
+                for posicion in evento[1]:
+                    grid_data[posicion] = CellTypes.OBJECTIVE
+                    informar(f"  -> Hongo en posición {posicion}")
+
+            else:
+                informar(f"  -> ERROR: {evento[1]}")
+
+    _reportar_lectura(filename, time.perf_counter() - t0, informar)
+
+    informar(f"\n=== MAPA '{nombre_archivo}' CARGADO ===")
+    informar(f"Dimensiones: {rows}x{cols}")
+    informar(f"Venenos: {num_venenos}")
+    informar(f"Elementos en el mapa: {len(grid_data)}")
+    informar(f"================================\n")
+
+    return rows, cols, grid_data
+
+
+def load_grid(nombre_archivo="mapa.txt", verbose=True):
+    """
+    Carga un mapa directamente en un Grid compacto, sin pasar por el
+    diccionario grid_data. Pensado para mapas con millones de venenos.
+
+    Returns:
+        tupla (grid, inicio, meta), inicio y meta son None si no aparecen.
+        Si hay varias hormigas u hongos vale el último de cada uno (ver
+        load_grid_multiple).
+    """
+    grid, hormigas, hongos = load_grid_multiple(nombre_archivo, verbose)
+    inicio = hormigas[-1] if hormigas else None
+    meta = hongos[-1] if hongos else None
+    return grid, inicio, meta
+
+
+def load_grid_multiple(nombre_archivo="mapa.txt", verbose=True):
+    """
+    Igual que load_grid pero con todas las hormigas y todos los hongos.
+
+    Returns:
+        tupla (grid, hormigas, hongos) con listas de posiciones en el orden
+        del archivo (sin repetidas)
+    """
+    informar = print if verbose else _no_informar
+    filename = ruta_mapa(nombre_archivo)
+
+    if filename.endswith(".bin"):
+        from .mapa_binario import cargar_mapa_binario_multiple
+        return cargar_mapa_binario_multiple(filename)
+
+    rows = 5
+    cols = 5
+    hormigas = {}   # dict como conjunto ordenado
+    hongos = {}
+    venenos = []    # bloques de coordenadas leídos antes del tamaño
+
+    t0 = time.perf_counter()
+    grid = None
+    with open(filename, 'r', encoding='utf-8') as file:
+        for evento in parsear_mapa(file):
+            tipo = evento[0]
+            if tipo == "veneno":
+                if grid is None:
+                    venenos.append(evento[1])
+                else:
+                    _marcar_venenos(grid, evento[1])
+            elif tipo == "tamano":
+                rows, cols = evento[1], evento[2]
+                if grid is None:
+                    grid = Grid(rows, cols)
+                    for coords in venenos:
+                        _marcar_venenos(grid, coords)
+                    venenos = []
+            elif tipo == "error":
+                informar(f"  -> ERROR: {evento[1]}")
+            elif tipo == "hormiga":
+                hormigas.update(dict.fromkeys(evento[1]))
+            else:
+                hongos.update(dict.fromkeys(evento[1]))
+
+    if grid is None:
+        grid = Grid(rows, cols)
+        for coords in venenos:
+            _marcar_venenos(grid, coords)
+
+    # Las celdas de hormigas y hongos nunca son veneno
+    hormigas = list(hormigas)
+    hongos = list(hongos)
+    for posicion in hormigas + hongos:
+        grid.costos[grid.indice(posicion)] = COSTO_NORMAL
+
+    _reportar_lectura(filename, time.perf_counter() - t0, informar)
+    return grid, hormigas, hongos
+
+
+def _marcar_venenos(grid, coords):
+    """Marca en el grid un bloque de coordenadas base 1 (como vienen del archivo)"""
+    costos = grid.costos
+    ancho = grid.ancho
+    rows = grid.rows
+    cols = grid.cols
+    for r, c in coords:
+        row = int(r)
+        col = int(c)
+        # Base 1 en el archivo: (row, col) corresponde al índice row * ancho + col
+        if 0 < row <= rows and 0 < col <= cols:
+            costos[row * ancho + col] = COSTO_VENENO
+
+
+def _reportar_lectura(filename, segundos, informar=print):
+    """Imprime el throughput de lectura del archivo"""
+    megas = os.path.getsize(filename) / (1 << 20)
+    velocidad = megas / segundos if segundos > 0 else float("inf")
+    informar(f"Leídos {megas:.2f} MiB en {segundos:.3f} s ({velocidad:.1f} MiB/s)")
+
+
+def _no_informar(*args, **kwargs):
+    """Reemplazo de print cuando verbose=False"""
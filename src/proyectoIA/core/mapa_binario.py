@@ -0,0 +1,154 @@
+import mmap
+import os
+import struct
+import sys
+
+from ..algorithms.grid import COSTO_VENENO, Grid
+from .mapa import CellTypes, load_grid_multiple, ruta_mapa
+
+# Formato binario de mapas (versión 2):
+#   cabecera de TAMANO_CABECERA bytes (little endian)
+#     magic "PIAMAPA\0", versión, rows, cols,
+#     cantidad de hormigas y cantidad de hongos
+#   celdas: el arreglo de costos del Grid tal cual, (rows + 2) * (cols + 2) bytes
+#     en orden row-major con el borde de costo 0
+#   posiciones (row, col) de las hormigas y luego de los hongos, int32
+#
+# Las posiciones van después de las celdas para que las celdas queden siempre
+# en TAMANO_CABECERA. La versión 1 (una hormiga y un hongo en la cabecera,
+# -1 si no existen) se sigue pudiendo leer.
+MAGIC = b"PIAMAPA\0"
+VERSION = 2
+CABECERA = struct.Struct("<8sIIIII")
+CABECERA_V1 = struct.Struct("<8sIIIiiii")
+POSICION = struct.Struct("<ii")
+TAMANO_CABECERA = 64
+EXTENSION_BINARIA = ".bin"
+
+
+def _como_lista(posiciones):
+    """Acepta None, una posición (row, col) o una lista de posiciones"""
+    if posiciones is None:
+        return []
+    if len(posiciones) == 2 and isinstance(posiciones[0], int):
+        return [tuple(posiciones)]
+    return [tuple(posicion) for posicion in posiciones]
+
+
+def guardar_mapa_binario(ruta, grid, inicio=None, meta=None):
+    """
+    Escribe un Grid en formato binario.
+    inicio / meta: posición de la hormiga / del hongo o lista de posiciones
+    """
+    hormigas = _como_lista(inicio)
+    hongos = _como_lista(meta)
+
+    cabecera = CABECERA.pack(MAGIC, VERSION, grid.rows, grid.cols, len(hormigas), len(hongos))
+    with open(ruta, "wb") as file:
+        file.write(cabecera.ljust(TAMANO_CABECERA, b"\0"))
+        file.write(grid.costos)
+        for posicion in hormigas + hongos:
+            file.write(POSICION.pack(*posicion))
+
+
+def convertir_mapa(nombre_archivo, ruta_destino=None):
+    """
+    Convierte un mapa de texto de la carpeta txt/ al formato binario.
+    Por defecto el archivo se guarda al lado del original con extensión .bin
+    """
+    grid, hormigas, hongos = load_grid_multiple(nombre_archivo)
+    if ruta_destino is None:
+        ruta_destino = os.path.splitext(ruta_mapa(nombre_archivo))[0] + EXTENSION_BINARIA
+    guardar_mapa_binario(ruta_destino, grid, hormigas, hongos)
+    print(f"Mapa '{nombre_archivo}' convertido a '{ruta_destino}'")
+    return ruta_destino
+
+
+def cargar_mapa_binario(ruta):
+    """
+    Abre un mapa binario con mmap sin copiar las celdas.
+
+    Returns:
+        tupla (grid, inicio, meta). grid.costos es un memoryview de solo
+        lectura sobre el archivo, se puede pasar directo a las búsquedas.
+        Si hay varias hormigas u hongos vale el último de cada uno.
+    """
+    grid, hormigas, hongos = cargar_mapa_binario_multiple(ruta)
+    inicio = hormigas[-1] if hormigas else None
+    meta = hongos[-1] if hongos else None
+    return grid, inicio, meta
+
+
+def cargar_mapa_binario_multiple(ruta):
+    """Igual que cargar_mapa_binario pero retorna (grid, hormigas, hongos)"""
+    with open(ruta, "rb") as file:
+        memoria = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(memoria) < TAMANO_CABECERA:
+        memoria.close()
+        raise ValueError(f"'{ruta}' no es un mapa binario válido")
+
+    magic, version, rows, cols = struct.unpack_from("<8sIII", memoria)
+    if magic != MAGIC or version not in (1, VERSION):
+        memoria.close()
+        raise ValueError(f"'{ruta}' no es un mapa binario válido (versión {VERSION})")
+
+    tamano = (rows + 2) * (cols + 2)
+    if version == 1:
+        _, _, _, _, ant_row, ant_col, hongo_row, hongo_col = CABECERA_V1.unpack_from(memoria)
+        hormigas = [(ant_row, ant_col)] if ant_row >= 0 else []
+        hongos = [(hongo_row, hongo_col)] if hongo_row >= 0 else []
+        num_posiciones = 0
+    else:
+        _, _, _, _, num_hormigas, num_hongos = CABECERA.unpack_from(memoria)
+        num_posiciones = num_hormigas + num_hongos
+
+    fin_celdas = TAMANO_CABECERA + tamano
+    if len(memoria) < fin_celdas + num_posiciones * POSICION.size:
+        memoria.close()
+        raise ValueError(f"'{ruta}' está incompleto: se esperaban {tamano} celdas")
+
+    if version != 1:
+        posiciones = [POSICION.unpack_from(memoria, fin_celdas + i * POSICION.size)
+                      for i in range(num_posiciones)]
+        hormigas = posiciones[:num_hormigas]
+        hongos = posiciones[num_hormigas:]
+
+    # El memoryview mantiene vivo el mmap mientras exista el grid
+    costos = memoryview(memoria)[TAMANO_CABECERA:fin_celdas]
+    grid = Grid(rows, cols, costos)
+    return grid, hormigas, hongos
+
+
+def grid_data_desde_binario(ruta):
+    """
+    Construye (rows, cols, grid_data) como load_map a partir de un mapa binario,
+    para la interfaz gráfica.
+    """
+    grid, hormigas, hongos = cargar_mapa_binario_multiple(ruta)
+
+    grid_data = {}
+    for posicion in hormigas:
+        grid_data[posicion] = CellTypes.ANT
+
+    # Buscar los venenos con find en lugar de recorrer celda por celda
+    costos = grid.costos.obj
+    veneno = bytes([COSTO_VENENO])
+    fin = TAMANO_CABECERA + grid.size
+    indice = costos.find(veneno, TAMANO_CABECERA, fin)
+    while indice != -1:
+        grid_data[grid.posicion(indice - TAMANO_CABECERA)] = CellTypes.OBSTACLE
+        indice = costos.find(veneno, indice + 1, fin)
+
+    for posicion in hongos:
+        grid_data[posicion] = CellTypes.OBJECTIVE
+
+    return grid.rows, grid.cols, grid_data
+
+
+# Uso: python -m proyectoIA.core.mapa_binario mapa.txt [destino.bin]
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python -m proyectoIA.core.mapa_binario <mapa.txt> [destino.bin]")
+        sys.exit(1)
+    convertir_mapa(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
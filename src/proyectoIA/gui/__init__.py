@@ -1,3 +1,9 @@
-from .app import run_gui
+__all__ = ['run_gui']
 
-__all__ = ['run_gui']
\ No newline at end of file
+
+def __getattr__(nombre):
+    # Se importa al usarse: importar proyectoIA.gui.mapa no debe cargar QtWidgets
+    if nombre == "run_gui":
+        from .app import run_gui
+        return run_gui
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
@@ -0,0 +1,144 @@
+import math
+from collections import OrderedDict
+
+from PySide6.QtCore import QRectF, Qt
+from PySide6.QtGui import QImage, QPainter, QPen, QPixmap
+from PySide6.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
+
+from .mapa import CellTypes, color_map
+
+# Lado de un tile en píxeles de su nivel de detalle
+TAMANO_TILE = 256
+# Máximo de tiles guardados en caché (LRU)
+MAX_TILES = 256
+# Píxeles de pantalla por celda a partir de los cuales se dibujan los bordes
+MIN_PIXELES_BORDES = 4
+
+
+# Item que dibuja todo el tablero.
+# Cada celda es un píxel de un QImage indexado (el índice es el tipo de celda)
+# que se escala a cell_size al pintar, en lugar de un QGraphicsRectItem por celda.
+#
+# El dibujo se hace por tiles y solo para la parte visible. Con poco zoom se usan
+# niveles de detalle reducidos: en el nivel k cada píxel resume un bloque de
+# 2^k x 2^k celdas (promedio de colores). Los tiles se guardan en caché por nivel.
+class GridItem(QGraphicsItem):
+    def __init__(self, rows, cols, cell_size, grid_data):
+        super().__init__()
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+
+        self.imagen = QImage(cols, rows, QImage.Format_Indexed8)
+        self.imagen.setColorTable([color_map[tipo].rgb() for tipo in sorted(color_map)])
+        self.imagen.fill(CellTypes.EMPTY)
+
+        # Escribir directo en el buffer del QImage
+        bits = self.imagen.bits()
+        bytes_por_linea = self.imagen.bytesPerLine()
+        for (row, col), cell_type in grid_data.items():
+            if 0 <= row < rows and 0 <= col < cols:
+                bits[row * bytes_por_linea + col] = cell_type
+
+        # Caché de tiles: (nivel, tile_row, tile_col) -> QPixmap
+        self.tiles = OrderedDict()
+
+        # Necesario para recibir exposedRect en paint
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+
+    def boundingRect(self):
+        return QRectF(0, 0, self.cols * self.cell_size, self.rows * self.cell_size)
+
+    def set_celda(self, posicion, cell_type):
+        """Cambia el tipo de una celda y repinta solo esa celda"""
+        row, col = posicion
+        self.imagen.setPixel(col, row, cell_type)
+
+        # Invalidar los tiles que contienen la celda en todos los niveles
+        for clave in [c for c in self.tiles if c[1] == row // (TAMANO_TILE << c[0])
+                      and c[2] == col // (TAMANO_TILE << c[0])]:
+            del self.tiles[clave]
+
+        self.update(QRectF(col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size))
+
+    def celdas_visibles(self, rect):
+        """Rango de filas y columnas que cubre un rectángulo de la escena"""
+        size = self.cell_size
+        col0 = max(0, int(rect.left() // size))
+        row0 = max(0, int(rect.top() // size))
+        col1 = min(self.cols, int(math.ceil(rect.right() / size)))
+        row1 = min(self.rows, int(math.ceil(rect.bottom() / size)))
+        return row0, col0, row1, col1
+
+    def nivel_detalle(self, pixeles_por_celda):
+        """Nivel de detalle para que cada píxel del tile ocupe al menos un píxel de pantalla"""
+        if pixeles_por_celda >= 1:
+            return 0
+        nivel = int(math.log2(1 / pixeles_por_celda))
+        # No tiene sentido un tile más grande que todo el mapa
+        maximo = max(0, math.ceil(math.log2(max(self.rows, self.cols) / TAMANO_TILE)))
+        return min(nivel, maximo)
+
+    def tile(self, nivel, tile_row, tile_col):
+        """Retorna (desde la caché si es posible) el pixmap de un tile"""
+        clave = (nivel, tile_row, tile_col)
+        pixmap = self.tiles.get(clave)
+        if pixmap is not None:
+            self.tiles.move_to_end(clave)
+            return pixmap
+
+        celdas_tile = TAMANO_TILE << nivel
+        row = tile_row * celdas_tile
+        col = tile_col * celdas_tile
+        filas = min(celdas_tile, self.rows - row)
+        columnas = min(celdas_tile, self.cols - col)
+
+        imagen = self.imagen.copy(col, row, columnas, filas)
+        if nivel > 0:
+            # Reducir promediando cada bloque de 2^nivel x 2^nivel celdas
+            bloque = 1 << nivel
+            imagen = imagen.convertToFormat(QImage.Format_RGB32).scaled(
+                (columnas + bloque - 1) >> nivel,
+                (filas + bloque - 1) >> nivel,
+                Qt.IgnoreAspectRatio,
+                Qt.SmoothTransformation,
+            )
+
+        pixmap = QPixmap.fromImage(imagen)
+        self.tiles[clave] = pixmap
+        if len(self.tiles) > MAX_TILES:
+            self.tiles.popitem(last=False)
+        return pixmap
+
+    def paint(self, painter, option, widget=None):
+        row0, col0, row1, col1 = self.celdas_visibles(option.exposedRect)
+        if row0 >= row1 or col0 >= col1:
+            return
+
+        size = self.cell_size
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        pixeles_por_celda = lod * size
+        nivel = self.nivel_detalle(pixeles_por_celda)
+        celdas_tile = TAMANO_TILE << nivel
+
+        # Celdas nítidas al hacer zoom
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, False)
+
+        # Dibujar solo los tiles visibles
+        for tile_row in range(row0 // celdas_tile, (row1 - 1) // celdas_tile + 1):
+            for tile_col in range(col0 // celdas_tile, (col1 - 1) // celdas_tile + 1):
+                pixmap = self.tile(nivel, tile_row, tile_col)
+                row = tile_row * celdas_tile
+                col = tile_col * celdas_tile
+                filas = min(celdas_tile, self.rows - row)
+                columnas = min(celdas_tile, self.cols - col)
+                destino = QRectF(col * size, row * size, columnas * size, filas * size)
+                painter.drawPixmap(destino, pixmap, QRectF(pixmap.rect()))
+
+        # Bordes de las celdas, solo si se distinguen en pantalla
+        if pixeles_por_celda >= MIN_PIXELES_BORDES:
+            painter.setPen(QPen(Qt.black, 0))
+            for row in range(row0, row1 + 1):
+                painter.drawLine(col0 * size, row * size, col1 * size, row * size)
+            for col in range(col0, col1 + 1):
+                painter.drawLine(col * size, row0 * size, col * size, row1 * size)
@@ -1,12 +1,25 @@
+import os
+import sqlite3
 import sys
 from ..algorithms.beam_search import beam_search
-from ..algorithms.dynamic import dynamic_weighting_search
-from PySide6.QtCore import QTimer
-
-from .mapa import (
+from ..algorithms.dynamic import (
+    dynamic_weighting_anytime,
+    dynamic_weighting_bidireccional,
+    dynamic_weighting_search,
+)
+from ..algorithms.cache_campos import CacheCampos
+from ..algorithms.cache_resultados import CacheResultados
+from ..algorithms.jps import jump_point_search
+from ..algorithms.hpa import cargar_jerarquia, hpa_search
+from PySide6.QtCore import QTimer, QThreadPool
+from .worker import AnytimeWorker, SearchWorker
+from .grid_item import GridItem
+
+from ..core.mapa import (
+    load_grid,
     load_map,
+    ruta_mapa,
     CellTypes,
-    color_map,
 )
 from PySide6.QtWidgets import (
     QMainWindow,
@@ -16,7 +29,6 @@ from PySide6.QtWidgets import (
     QSpinBox,
     QVBoxLayout,
     QHBoxLayout,
-    QGraphicsRectItem,
     QPushButton,
     QGraphicsTextItem,
     QLineEdit,
@@ -25,7 +37,6 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt
 from PySide6.QtGui import (
     QWheelEvent,
-    QBrush,
     QFont,
 )
 
@@ -40,6 +51,12 @@ class ZoomableGridView(QGraphicsView):
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
         self.setDragMode(QGraphicsView.ScrollHandDrag)
 
+        # El tablero se dibuja por tiles visibles (ver GridItem), Qt no necesita
+        # guardar el estado del painter ni ajustar por antialiasing
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState)
+        self.setOptimizationFlag(QGraphicsView.DontAdjustForAntialiasing)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+
     # Zoom con la rueda del mouse
     def wheelEvent(self, event: QWheelEvent):
         zoom_in_factor = 1.25
@@ -69,6 +86,30 @@ class GridWidget(QWidget):
 
         self.ant_item = None
         self.mushroom_item = None
+        self.grid_item = None
+
+        # Celdas pintadas por la animación (se restauran al animar otro camino)
+        self.celdas_animadas = set()
+
+        # Búsqueda en curso (se ejecuta fuera del hilo de la interfaz)
+        self.thread_pool = QThreadPool.globalInstance()
+        self.worker = None
+        # Referencias a los workers vivos (incluye los cancelados que aún no terminan)
+        self.workers = set()
+
+        # Campos de distancias ya calculados (por mapa y hongo)
+        self.cache_campos = CacheCampos()
+
+        # Jerarquía HPA* del mapa actual: (ruta, mtime_ns, grid, jerarquia)
+        self.jerarquia_actual = None
+
+        # Caminos de beam / dynamic weighting guardados entre ejecuciones
+        # (~/.cache/proyectoIA); sin caché si no se puede abrir
+        try:
+            self.cache_resultados = CacheResultados()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Caché de resultados desactivada: {e}")
+            self.cache_resultados = None
 
         # Nombre del archivo actual
         self.nombre_archivo_actual = "mapa.txt"
@@ -92,6 +133,35 @@ class GridWidget(QWidget):
         self.btn_dw = QPushButton("Iniciar Dynamic Weighting")
         self.btn_dw.clicked.connect(self.iniciar_dw)
 
+        # Boton iniciar la búsqueda óptima desde la hormiga y el hongo a la vez
+        self.btn_dw_bi = QPushButton("Camino óptimo bidireccional")
+        self.btn_dw_bi.clicked.connect(self.iniciar_dw_bidireccional)
+
+        # Boton iniciar Dynamic Weighting anytime (muestra caminos cada vez mejores)
+        self.btn_dw_anytime = QPushButton("Dynamic Weighting anytime")
+        self.btn_dw_anytime.clicked.connect(self.iniciar_dw_anytime)
+
+        # Boton iniciar Jump Point Search (óptimo, salta las zonas sin veneno)
+        self.btn_jps = QPushButton("Iniciar Jump Point Search")
+        self.btn_jps.clicked.connect(self.iniciar_jps)
+
+        # Boton iniciar búsqueda jerárquica (la jerarquía se guarda junto al mapa)
+        self.btn_hpa = QPushButton("Iniciar HPA*")
+        self.btn_hpa.clicked.connect(self.iniciar_hpa)
+
+        # Boton camino óptimo con el campo de distancias (se guarda en caché)
+        self.btn_campo = QPushButton("Camino óptimo")
+        self.btn_campo.clicked.connect(self.iniciar_campo)
+
+        # Boton cancelar la búsqueda en curso
+        self.btn_cancelar = QPushButton("Cancelar búsqueda")
+        self.btn_cancelar.clicked.connect(self.cancelar_busqueda)
+        self.btn_cancelar.setEnabled(False)
+
+        # Progreso de la búsqueda
+        self.label_progreso = QLabel("")
+        self.label_progreso.setWordWrap(True)
+
         # Campo de texto para nombre de archivo
         self.label_archivo = QLabel("Nombre del archivo:")
         self.input_archivo = QLineEdit()
@@ -110,6 +180,13 @@ class GridWidget(QWidget):
         self.panel = QVBoxLayout()
         self.panel.addWidget(self.btn_beam)
         self.panel.addWidget(self.btn_dw)
+        self.panel.addWidget(self.btn_dw_bi)
+        self.panel.addWidget(self.btn_dw_anytime)
+        self.panel.addWidget(self.btn_jps)
+        self.panel.addWidget(self.btn_hpa)
+        self.panel.addWidget(self.btn_campo)
+        self.panel.addWidget(self.btn_cancelar)
+        self.panel.addWidget(self.label_progreso)
         self.panel.addSpacing(20)  # Espaciado
         self.panel.addWidget(self.label_archivo)
         self.panel.addWidget(self.input_archivo)
@@ -141,55 +218,51 @@ class GridWidget(QWidget):
         self.scene.clear()
         self.ant_item = None
         self.mushroom_item = None
+        self.celdas_animadas = set()
         
         width = self.cols * self.cell_size
         height = self.rows * self.cell_size
         self.scene.setSceneRect(0, 0, width, height)
 
-        for row in range(self.rows):
-            for col in range(self.cols):
-                cell_type = self.temp_grid_data.get((row, col), CellTypes.EMPTY)
-                color = color_map[cell_type]
-
-                rect = QGraphicsRectItem(col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size)
-                rect.setBrush(QBrush(color))
-                self.scene.addItem(rect)
-                
-                if cell_type == CellTypes.ANT:
-                    self.ant_item = QGraphicsTextItem("🐜")
-                    font = QFont()
-                    font.setPointSize(int(self.cell_size * 0.8))
-                    self.ant_item.setFont(font)
-                    # Center the emoji in the cell
-                    self.ant_item.setPos(
-                        col * self.cell_size + self.cell_size * 0.1,
-                        row * self.cell_size - self.cell_size * 0.2
-                    )
-                    self.scene.addItem(self.ant_item)
-                
-                elif cell_type == CellTypes.OBJECTIVE:
-                    self.mushroom_item = QGraphicsTextItem("🍄")
-                    font = QFont()
-                    font.setPointSize(int(self.cell_size * 0.8))
-                    self.mushroom_item.setFont(font)
-                    # Center the emoji in the cell
-                    self.mushroom_item.setPos(
-                        col * self.cell_size + self.cell_size * 0.1,
-                        row * self.cell_size - self.cell_size * 0.2
-                    )
-                    self.mushroom_item.setZValue(1)
-                    self.scene.addItem(self.mushroom_item)
+        # Todo el tablero es un solo item
+        self.grid_item = GridItem(self.rows, self.cols, self.cell_size, self.temp_grid_data)
+        self.scene.addItem(self.grid_item)
+
+        for pos, cell_type in self.temp_grid_data.items():
+            if cell_type == CellTypes.ANT:
+                self.ant_item = self.crear_emoji("🐜", pos)
+            elif cell_type == CellTypes.OBJECTIVE:
+                self.mushroom_item = self.crear_emoji("🍄", pos)
+                self.mushroom_item.setZValue(1)
+
+    def crear_emoji(self, texto, pos):
+        item = QGraphicsTextItem(texto)
+        font = QFont()
+        font.setPointSize(int(self.cell_size * 0.8))
+        item.setFont(font)
+        self.mover_emoji(item, pos)
+        self.scene.addItem(item)
+        return item
+
+    def mover_emoji(self, item, pos):
+        # Center the emoji in the cell
+        row, col = pos
+        item.setPos(
+            col * self.cell_size + self.cell_size * 0.1,
+            row * self.cell_size - self.cell_size * 0.2
+        )
 
     def cargar_mapa_especifico(self):
         """Carga un mapa específico según el nombre ingresado por el usuario"""
         nombre_archivo = self.input_archivo.text().strip()
         
-        # Si no tiene extensión, agregar .txt
-        if not nombre_archivo.endswith('.txt'):
+        # Si no tiene extensión, agregar .txt (los mapas binarios usan .bin)
+        if not nombre_archivo.endswith(('.txt', '.bin')):
             nombre_archivo += '.txt'
         
         try:
             self.timer_animacion.stop()
+            self.cancelar_busqueda()
             self.rows, self.cols, self.grid_data = load_map(nombre_archivo)
             self.nombre_archivo_actual = nombre_archivo
             self.temp_grid_data = self.grid_data.copy()
@@ -204,44 +277,153 @@ class GridWidget(QWidget):
     # Funcion para reiniciar el mapa
     def reiniciar(self):
         self.timer_animacion.stop()
+        self.cancelar_busqueda()
         self.rows, self.cols, self.grid_data = load_map(self.nombre_archivo_actual)
         self.temp_grid_data = self.grid_data.copy()
         self.redraw_grid()
         print(f"Mapa '{self.nombre_archivo_actual}' reiniciado")
 
     def iniciar_beam(self):
-        try:
-            self.timer_animacion.stop()
-
-            inicio, meta, obstaculos = self.extraer_datos_mapa()
-            
-            print(f"   Inicio: {inicio}, Meta: {meta}, Obstáculos: {len(obstaculos)}")
-            
-            camino = beam_search(self.rows, inicio, meta, obstaculos)
-            
-            if camino:
-                print(f"Camino encontrado con {len(camino)-1} pasos")
-                self.animar_camino(camino)
-            else:
-                print("No se encontró un camino")
-        except Exception as e:
-            print(f"Error: {e}")
+        self.iniciar_busqueda(self.con_cache(beam_search, "beam"))
 
     def iniciar_dw(self):
+        self.iniciar_busqueda(self.con_cache(dynamic_weighting_search, "dw"))
+
+    def con_cache(self, funcion, algoritmo):
+        """La búsqueda leyendo primero de la caché persistente (si se pudo abrir)"""
+        if self.cache_resultados is None:
+            return funcion
+        return self.cache_resultados.envolver(funcion, algoritmo)
+
+    def iniciar_dw_bidireccional(self):
+        self.iniciar_busqueda(dynamic_weighting_bidireccional)
+
+    def iniciar_dw_anytime(self):
+        self.iniciar_busqueda(dynamic_weighting_anytime, AnytimeWorker)
+
+    def iniciar_jps(self):
+        self.iniciar_busqueda(jump_point_search)
+
+    def iniciar_hpa(self):
+        self.iniciar_busqueda(self.camino_hpa)
+
+    def camino_hpa(self, n, inicio, meta, obstaculos, progreso=None):
+        """
+        Búsqueda jerárquica sobre el mapa actual. La jerarquía se carga del
+        archivo .hpa junto al mapa (o se construye y se guarda) la primera vez
+        y se reutiliza mientras el archivo del mapa no cambie.
+        """
+        ruta = ruta_mapa(self.nombre_archivo_actual)
+        mtime = os.stat(ruta).st_mtime_ns
+        actual = self.jerarquia_actual
+        if actual is None or actual[:2] != (ruta, mtime):
+            grid = load_grid(ruta, verbose=False)[0]
+            actual = (ruta, mtime, grid, cargar_jerarquia(ruta, grid))
+            self.jerarquia_actual = actual
+        grid, jerarquia = actual[2], actual[3]
+        return hpa_search(n, inicio, meta, grid, jerarquia=jerarquia, progreso=progreso)
+
+    def iniciar_campo(self):
+        self.iniciar_busqueda(self.camino_optimo)
+
+    def camino_optimo(self, n, inicio, meta, obstaculos, progreso=None):
+        """
+        Camino óptimo bajando por el campo de distancias del mapa actual.
+        El campo se calcula una sola vez por mapa y hongo; las siguientes
+        consultas lo reutilizan mientras el archivo no cambie.
+        """
+        ruta = ruta_mapa(self.nombre_archivo_actual)
+        campo = self.cache_campos.campo_archivo(
+            ruta, meta, lambda ruta: load_grid(ruta, verbose=False)[0]
+        )
+        return campo.camino(inicio)
+
+    def iniciar_busqueda(self, funcion, clase_worker=SearchWorker):
+        """Lanza la búsqueda en un hilo del pool para no congelar la ventana"""
+        if self.worker is not None:
+            print("Ya hay una búsqueda en curso")
+            return
+
         try:
             self.timer_animacion.stop()
             inicio, meta, obstaculos = self.extraer_datos_mapa()
-            print(f"   Inicio: {inicio}, Meta: {meta}, Obstáculos: {len(obstaculos)}")
-            
-            camino = dynamic_weighting_search(self.rows, inicio, meta, obstaculos)
-            
-            if camino:
-                print(f"Camino encontrado con {len(camino)-1} pasos")
-                self.animar_camino(camino)
-            else:
-                print("No se encontró un camino")
         except Exception as e:
             print(f"Error: {e}")
+            return
+
+        print(f"   Inicio: {inicio}, Meta: {meta}, Obstáculos: {len(obstaculos)}")
+
+        worker = clase_worker(funcion, (self.rows, self.cols), inicio, meta, obstaculos)
+        # Se pasa el worker para ignorar resultados de búsquedas ya reemplazadas
+        worker.signals.progreso.connect(lambda e, f, w=worker: self.mostrar_progreso(w, e, f))
+        worker.signals.terminado.connect(lambda camino, w=worker: self.busqueda_terminada(w, camino))
+        worker.signals.parcial.connect(lambda peso, camino, w=worker: self.camino_parcial(w, peso, camino))
+        worker.signals.cancelado.connect(lambda w=worker: self.busqueda_cancelada(w))
+        worker.signals.error.connect(lambda mensaje, w=worker: self.busqueda_error(w, mensaje))
+
+        self.worker = worker
+        self.workers.add(worker)
+        self.set_busqueda_activa(True)
+        self.label_progreso.setText("Buscando...")
+        self.thread_pool.start(worker)
+
+    def cancelar_busqueda(self):
+        if self.worker is not None:
+            self.worker.cancelar()
+            self.worker = None
+            self.set_busqueda_activa(False)
+            self.label_progreso.setText("Búsqueda cancelada")
+
+    def set_busqueda_activa(self, activa):
+        self.btn_beam.setEnabled(not activa)
+        self.btn_dw.setEnabled(not activa)
+        self.btn_dw_bi.setEnabled(not activa)
+        self.btn_dw_anytime.setEnabled(not activa)
+        self.btn_jps.setEnabled(not activa)
+        self.btn_hpa.setEnabled(not activa)
+        self.btn_campo.setEnabled(not activa)
+        self.btn_cancelar.setEnabled(activa)
+
+    def mostrar_progreso(self, worker, expandidos, frontera):
+        if worker is self.worker:
+            self.label_progreso.setText(f"Nodos expandidos: {expandidos}\nFrontera: {frontera}")
+
+    def busqueda_terminada(self, worker, camino):
+        self.workers.discard(worker)
+        if worker is not self.worker:
+            return
+        self.worker = None
+        self.set_busqueda_activa(False)
+
+        if camino:
+            print(f"Camino encontrado con {len(camino)-1} pasos")
+            self.label_progreso.setText(f"Camino encontrado con {len(camino)-1} pasos")
+            # Una búsqueda anytime ya está animando su último camino
+            if camino is not getattr(worker, "ultimo_camino", None):
+                self.animar_camino(camino)
+        else:
+            print("No se encontró un camino")
+            self.label_progreso.setText("No se encontró un camino")
+
+    def camino_parcial(self, worker, peso, camino):
+        """Camino intermedio de una búsqueda anytime: se anima mientras llega uno mejor"""
+        if worker is not self.worker:
+            return
+        print(f"Camino con {len(camino)-1} pasos (peso {peso:g})")
+        self.label_progreso.setText(f"Camino con {len(camino)-1} pasos (peso {peso:g}), mejorando...")
+        self.animar_camino(camino)
+
+    def busqueda_cancelada(self, worker):
+        self.workers.discard(worker)
+        print("Búsqueda cancelada")
+
+    def busqueda_error(self, worker, mensaje):
+        self.workers.discard(worker)
+        print(f"Error: {mensaje}")
+        if worker is self.worker:
+            self.worker = None
+            self.set_busqueda_activa(False)
+            self.label_progreso.setText(f"Error: {mensaje}")
         
     def extraer_datos_mapa(self):
         
@@ -282,21 +464,20 @@ class GridWidget(QWidget):
         for pos, cell_type in list(self.temp_grid_data.items()):
             if cell_type == CellTypes.ANT:
                 self.temp_grid_data[pos] = CellTypes.EMPTY
+                self.celdas_animadas.add(pos)
         
-        self.redraw_grid()
+        # Repintar solo las celdas que cambiaron
+        for pos in self.celdas_animadas:
+            self.grid_item.set_celda(pos, self.temp_grid_data.get(pos, CellTypes.EMPTY))
+        self.celdas_animadas = set()
         
         if len(camino) > 0:
             start_pos = camino[0]
-            self.ant_item = QGraphicsTextItem("🐜")
-            font = QFont()
-            font.setPointSize(int(self.cell_size * 0.8))
-            self.ant_item.setFont(font)
-            self.ant_item.setPos(
-                start_pos[1] * self.cell_size + self.cell_size * 0.1,
-                start_pos[0] * self.cell_size - self.cell_size * 0.2
-            )
+            if self.ant_item is None:
+                self.ant_item = self.crear_emoji("🐜", start_pos)
+            else:
+                self.mover_emoji(self.ant_item, start_pos)
             self.ant_item.setZValue(1)
-            self.scene.addItem(self.ant_item)
         
         # Iniciar animación
         self.timer_animacion.start(self.velocidad_animacion)
@@ -318,19 +499,12 @@ class GridWidget(QWidget):
             self.temp_grid_data[posicion_actual] = CellTypes.ANT
             
             # Redraw only the current cell
-            row, col = posicion_actual
-            color = color_map[CellTypes.ANT]
-            rect = QGraphicsRectItem(col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size)
-            rect.setBrush(QBrush(color))
-            self.scene.addItem(rect)
+            self.grid_item.set_celda(posicion_actual, CellTypes.ANT)
+            self.celdas_animadas.add(posicion_actual)
         
         # Move the ant emoji to the new position
         if self.ant_item:
-            self.ant_item.setPos(
-                posicion_actual[1] * self.cell_size + self.cell_size * 0.1,
-                posicion_actual[0] * self.cell_size - self.cell_size * 0.2
-            )
-            self.ant_item.setZValue(1)
+            self.mover_emoji(self.ant_item, posicion_actual)
         
         # Avanzar al siguiente paso
         self.indice_animacion += 1
@@ -341,4 +515,4 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Hormigas vs Venenos")
-        self.setCentralWidget(GridWidget())
\ No newline at end of file
+        self.setCentralWidget(GridWidget())
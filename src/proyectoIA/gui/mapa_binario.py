@@ -0,0 +1,16 @@
+# El formato binario vive en core/mapa_binario.py; se reexporta para el
+# código existente
+from ..core.mapa_binario import (  # noqa: F401
+    CABECERA,
+    CABECERA_V1,
+    EXTENSION_BINARIA,
+    MAGIC,
+    POSICION,
+    TAMANO_CABECERA,
+    VERSION,
+    cargar_mapa_binario,
+    cargar_mapa_binario_multiple,
+    convertir_mapa,
+    grid_data_desde_binario,
+    guardar_mapa_binario,
+)
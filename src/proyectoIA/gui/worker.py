@@ -0,0 +1,68 @@
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+
+# Señales del worker (QRunnable no hereda de QObject)
+class SearchSignals(QObject):
+    progreso = Signal(int, int)    # nodos expandidos, tamaño de la frontera
+    terminado = Signal(object)     # camino encontrado o None
+    parcial = Signal(float, object)  # peso y camino de una búsqueda anytime
+    cancelado = Signal()
+    error = Signal(str)
+
+
+# Ejecuta una búsqueda en un hilo del QThreadPool
+class SearchWorker(QRunnable):
+    def __init__(self, funcion, *args):
+        """
+        funcion: beam_search o dynamic_weighting_search
+        args: argumentos posicionales de la búsqueda (n, inicio, meta, obstaculos)
+        """
+        super().__init__()
+        self.funcion = funcion
+        self.args = args
+        self.signals = SearchSignals()
+        self.cancelar_solicitado = False
+
+    def cancelar(self):
+        self.cancelar_solicitado = True
+
+    # Callback de progreso de la búsqueda, retorna True para cancelarla
+    def reportar_progreso(self, expandidos, frontera):
+        self.signals.progreso.emit(expandidos, frontera)
+        return self.cancelar_solicitado
+
+    def run(self):
+        try:
+            camino = self.funcion(*self.args, progreso=self.reportar_progreso)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+            return
+
+        if self.cancelar_solicitado:
+            self.signals.cancelado.emit()
+        else:
+            self.signals.terminado.emit(camino)
+
+
+# Ejecuta una búsqueda anytime (generador de (peso, camino)) y emite cada
+# camino mejorado apenas llega; al final emite terminado con el último
+class AnytimeWorker(SearchWorker):
+    def __init__(self, funcion, *args):
+        super().__init__(funcion, *args)
+        self.ultimo_camino = None
+
+    def run(self):
+        try:
+            for peso, camino in self.funcion(*self.args, progreso=self.reportar_progreso):
+                self.ultimo_camino = camino
+                self.signals.parcial.emit(peso, camino)
+                if self.cancelar_solicitado:
+                    break
+        except Exception as e:
+            self.signals.error.emit(str(e))
+            return
+
+        if self.cancelar_solicitado:
+            self.signals.cancelado.emit()
+        else:
+            self.signals.terminado.emit(self.ultimo_camino)
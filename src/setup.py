@@ -7,5 +7,11 @@ setup(
     packages=find_packages(where="src"),
     install_requires=[
         "PySide6",
+        "numpy",
     ],
+    entry_points={
+        "console_scripts": [
+            "proyectoIA=proyectoIA.cli:main",
+        ],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""
+Utilidades de los tests: mapas aleatorios chicos y el costo óptimo de
+referencia calculado con CampoDistancias (Dijkstra por frentes de onda).
+"""
+import random
+
+from proyectoIA.algorithms.campo_distancias import CampoDistancias
+from proyectoIA.algorithms.grid import Grid
+
+
+def mapas(semilla, cantidad, max_lado=30, max_densidad=0.6):
+    """Genera (grid, inicio, meta) con tableros rectangulares aleatorios"""
+    rnd = random.Random(semilla)
+    for _ in range(cantidad):
+        rows, cols = rnd.randint(1, max_lado), rnd.randint(1, max_lado)
+        densidad = rnd.random() * max_densidad
+        obstaculos = [(r, c) for r in range(rows) for c in range(cols) if rnd.random() < densidad]
+        inicio = (rnd.randrange(rows), rnd.randrange(cols))
+        meta = (rnd.randrange(rows), rnd.randrange(cols))
+        yield Grid.desde_obstaculos(rows, cols, obstaculos), inicio, meta
+
+
+def costo_camino(grid, camino):
+    """Suma el costo de entrar a cada celda del camino (sin contar el inicio)"""
+    return sum(grid.costos[grid.indice(posicion)] for posicion in camino[1:])
+
+
+def es_camino(grid, camino, inicio, meta):
+    """True si camino va de inicio a meta por celdas vecinas dentro del tablero"""
+    pasos = zip(camino, camino[1:])
+    return (camino[0] == inicio and camino[-1] == meta
+            and all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in pasos)
+            and all(0 <= row < grid.rows and 0 <= col < grid.cols for row, col in camino))
+
+
+def costo_optimo(grid, inicio, meta):
+    return CampoDistancias((grid.rows, grid.cols), meta, grid).distancia(inicio)
@@ -0,0 +1,47 @@
+"""
+dynamic_weighting_anytime debe entregar caminos cada vez más baratos y
+terminar con uno óptimo (comparado con CampoDistancias).
+
+Uso (desde la carpeta src):
+    python -m pytest -q tests
+"""
+import random
+import unittest
+
+from proyectoIA.algorithms.campo_distancias import CampoDistancias
+from proyectoIA.algorithms.dynamic import dynamic_weighting_anytime
+from proyectoIA.algorithms.grid import Grid
+
+from oraculo import costo_camino, es_camino
+
+
+class TestAnytime(unittest.TestCase):
+
+    def test_costos_decrecientes_y_ultimo_optimo(self):
+        rnd = random.Random(27)
+        for _ in range(300):
+            rows, cols = rnd.randint(1, 30), rnd.randint(1, 30)
+            densidad = rnd.random() * 0.6
+            obstaculos = [(r, c) for r in range(rows) for c in range(cols) if rnd.random() < densidad]
+            grid = Grid.desde_obstaculos(rows, cols, obstaculos)
+            inicio = (rnd.randrange(rows), rnd.randrange(cols))
+            meta = (rnd.randrange(rows), rnd.randrange(cols))
+            epsilon = rnd.choice((1, 3, 4))
+            with self.subTest(rows=rows, cols=cols, inicio=inicio, meta=meta, epsilon=epsilon):
+                entregas = list(dynamic_weighting_anytime((rows, cols), inicio, meta, grid, epsilon=epsilon))
+                self.assertTrue(entregas)
+                costos = [costo_camino(grid, camino) for _, camino in entregas]
+                for costo_anterior, costo in zip(costos, costos[1:]):
+                    self.assertLess(costo, costo_anterior)
+                for _, camino in entregas:
+                    self.assertTrue(es_camino(grid, camino, inicio, meta))
+                self.assertEqual(costos[-1], CampoDistancias((rows, cols), meta, grid).distancia(inicio))
+
+    def test_decremento_invalido(self):
+        for decremento in (0, -1, float("nan")):
+            with self.assertRaises(ValueError):
+                dynamic_weighting_anytime(5, (0, 0), (4, 4), [], decremento=decremento)
+
+
+if __name__ == "__main__":
+    unittest.main()
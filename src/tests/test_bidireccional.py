@@ -0,0 +1,43 @@
+"""
+dynamic_weighting_bidireccional (MM) debe retornar caminos de costo óptimo.
+
+Uso (desde la carpeta src):
+    python -m pytest -q tests
+"""
+import random
+import unittest
+
+from proyectoIA.algorithms.dynamic import dynamic_weighting_bidireccional
+
+from oraculo import costo_camino, costo_optimo, es_camino, mapas
+
+
+class TestBidireccional(unittest.TestCase):
+
+    def comprobar(self, semilla, cantidad, max_lado):
+        for grid, inicio, meta in mapas(semilla, cantidad, max_lado):
+            with self.subTest(rows=grid.rows, cols=grid.cols, inicio=inicio, meta=meta):
+                camino = dynamic_weighting_bidireccional((grid.rows, grid.cols), inicio, meta, grid)
+                self.assertTrue(es_camino(grid, camino, inicio, meta))
+                self.assertEqual(costo_camino(grid, camino), costo_optimo(grid, inicio, meta))
+
+    def test_optimo_mapas_chicos(self):
+        self.comprobar(11, 300, 30)
+
+    def test_optimo_mapas_medianos(self):
+        self.comprobar(12, 20, 80)
+
+    def test_buffers_reutilizados(self):
+        # Varias consultas sobre el mismo Grid reutilizan sus buffers
+        grid, _, _ = next(mapas(13, 1, 40))
+        rnd = random.Random(14)
+        for _ in range(40):
+            inicio = (rnd.randrange(grid.rows), rnd.randrange(grid.cols))
+            meta = (rnd.randrange(grid.rows), rnd.randrange(grid.cols))
+            with self.subTest(inicio=inicio, meta=meta):
+                camino = dynamic_weighting_bidireccional((grid.rows, grid.cols), inicio, meta, grid)
+                self.assertEqual(costo_camino(grid, camino), costo_optimo(grid, inicio, meta))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+Las búsquedas sobre Grid deben retornar exactamente los mismos caminos que
+las versiones originales basadas en tuplas, sets y diccionarios (copiadas
+abajo sin los prints).
+
+Uso (desde la carpeta src):
+    python -m pytest -q tests
+    python -m unittest discover tests
+"""
+import heapq
+import random
+import unittest
+
+from proyectoIA.algorithms.beam_search import beam_search, calcular_beam_width
+from proyectoIA.algorithms.dynamic import dynamic_weighting_search
+from proyectoIA.algorithms.grid import Grid
+
+
+def manhattan(pos1, pos2):
+    return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
+
+
+def dynamic_weighting_original(n, inicio, meta, obstaculos, epsilon=3):
+    obstaculos = set(obstaculos)
+    N = n * n
+    open_list = [(0, inicio, 0)]
+    came_from = {inicio: None}
+    g_score = {inicio: 0}
+    closed_set = set()
+    while open_list:
+        f_actual, actual, depth = heapq.heappop(open_list)
+        if actual in closed_set:
+            continue
+        closed_set.add(actual)
+        if actual == meta:
+            camino = []
+            while actual is not None:
+                camino.append(actual)
+                actual = came_from[actual]
+            camino.reverse()
+            return camino
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            sucesor = (actual[0] + dx, actual[1] + dy)
+            if not (0 <= sucesor[0] < n and 0 <= sucesor[1] < n):
+                continue
+            tentative_g = g_score[actual] + (3 if sucesor in obstaculos else 1)
+            if sucesor not in g_score or tentative_g < g_score[sucesor]:
+                g_score[sucesor] = tentative_g
+                came_from[sucesor] = actual
+                h = manhattan(sucesor, meta)
+                f = tentative_g + h + epsilon * (1 - (depth / N)) * h
+                heapq.heappush(open_list, (f, sucesor, depth + 1))
+    return None
+
+
+def beam_search_original(n, inicio, meta, obstaculos):
+    obstaculos_set = set(obstaculos)
+    beamWidth = calcular_beam_width(n, len(obstaculos))
+    closedList = [[inicio, None, 0, manhattan(inicio, meta)]]
+    visitados = {inicio}
+    if inicio == meta:
+        return [inicio]
+
+    def reconstruir(indice_actual):
+        camino = []
+        while indice_actual is not None:
+            camino.append(closedList[indice_actual][0])
+            indice_actual = closedList[indice_actual][1]
+        camino.reverse()
+        return camino
+
+    openList = [0]
+    iteracion = 0
+    mejor_h_previo = manhattan(inicio, meta)
+    iteraciones_sin_mejora = 0
+    while openList and iteracion < n * n * 2:
+        iteracion += 1
+        todos_sucesores = []
+        for indice_nodo in openList:
+            posicion_actual, _, g_actual, _ = closedList[indice_nodo]
+            for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                posicion = (posicion_actual[0] + dx, posicion_actual[1] + dy)
+                if not (0 <= posicion[0] < n and 0 <= posicion[1] < n):
+                    continue
+                g_n = g_actual + (3 if posicion in obstaculos_set else 1)
+                h_n = manhattan(posicion, meta)
+                if posicion == meta:
+                    closedList.append([posicion, indice_nodo, g_n, h_n])
+                    return reconstruir(len(closedList) - 1)
+                if posicion not in visitados:
+                    todos_sucesores.append((posicion, indice_nodo, g_n, h_n, g_n + h_n))
+                    visitados.add(posicion)
+        if not todos_sucesores:
+            return None
+        todos_sucesores.sort(key=lambda x: x[4])
+        mejores_sucesores = todos_sucesores[:beamWidth]
+        mejor_h_actual = min(s[3] for s in mejores_sucesores)
+        if mejor_h_actual >= mejor_h_previo:
+            iteraciones_sin_mejora += 1
+            if iteraciones_sin_mejora > beamWidth * 2:
+                return None
+        else:
+            iteraciones_sin_mejora = 0
+            mejor_h_previo = mejor_h_actual
+        openList = []
+        for posicion, indice_padre, g_n, h_n, f_n in mejores_sucesores:
+            closedList.append([posicion, indice_padre, g_n, h_n])
+            openList.append(len(closedList) - 1)
+    return None
+
+
+def casos(semilla, cantidad):
+    """Tableros aleatorios (n, inicio, meta, obstaculos)"""
+    rnd = random.Random(semilla)
+    for _ in range(cantidad):
+        n = rnd.randint(1, 30)
+        densidad = rnd.random() * 0.6
+        obstaculos = [(r, c) for r in range(n) for c in range(n) if rnd.random() < densidad]
+        inicio = (rnd.randrange(n), rnd.randrange(n))
+        meta = (rnd.randrange(n), rnd.randrange(n))
+        yield n, inicio, meta, obstaculos
+
+
+class TestEquivalencia(unittest.TestCase):
+
+    def test_dynamic_weighting(self):
+        for n, inicio, meta, obstaculos in casos(1, 300):
+            with self.subTest(n=n, inicio=inicio, meta=meta):
+                esperado = dynamic_weighting_original(n, inicio, meta, obstaculos)
+                self.assertEqual(dynamic_weighting_search(n, inicio, meta, obstaculos), esperado)
+
+    def test_beam_search(self):
+        for n, inicio, meta, obstaculos in casos(2, 300):
+            with self.subTest(n=n, inicio=inicio, meta=meta):
+                esperado = beam_search_original(n, inicio, meta, obstaculos)
+                self.assertEqual(beam_search(n, inicio, meta, obstaculos), esperado)
+
+    def test_buffers_reutilizados(self):
+        # Varias consultas sobre el mismo Grid reutilizan sus buffers
+        rnd = random.Random(3)
+        n = 40
+        obstaculos = [(r, c) for r in range(n) for c in range(n) if rnd.random() < 0.3]
+        grid = Grid.desde_obstaculos(n, n, obstaculos)
+        for _ in range(50):
+            inicio = (rnd.randrange(n), rnd.randrange(n))
+            meta = (rnd.randrange(n), rnd.randrange(n))
+            with self.subTest(inicio=inicio, meta=meta):
+                self.assertEqual(dynamic_weighting_search(n, inicio, meta, grid),
+                                 dynamic_weighting_original(n, inicio, meta, obstaculos))
+                self.assertEqual(beam_search(n, inicio, meta, grid),
+                                 beam_search_original(n, inicio, meta, obstaculos))
+
+
+if __name__ == "__main__":
+    unittest.main()
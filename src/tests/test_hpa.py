@@ -0,0 +1,80 @@
+"""
+hpa_search debe retornar caminos válidos de costo al menos el óptimo (y
+óptimo si todo el mapa es un solo cluster). La jerarquía debe tener los
+costos exactos dentro de cada cluster y sobrevivir a guardar / cargar.
+
+Uso (desde la carpeta src):
+    python -m pytest -q tests
+"""
+import os
+import tempfile
+import unittest
+
+from proyectoIA.algorithms.grid import Grid
+from proyectoIA.algorithms.hpa import (
+    Jerarquia, cargar_jerarquia, distancias_en_cluster, hpa_search, ruta_jerarquia,
+)
+
+from oraculo import costo_camino, costo_optimo, es_camino, mapas
+
+
+class TestHPA(unittest.TestCase):
+
+    def test_caminos_validos(self):
+        for grid, inicio, meta in mapas(31, 150, 40):
+            for tamano_cluster in (3, 8):
+                jerarquia = Jerarquia.construir(grid, tamano_cluster)
+                with self.subTest(rows=grid.rows, cols=grid.cols, inicio=inicio, meta=meta,
+                                  tamano_cluster=tamano_cluster):
+                    camino = hpa_search((grid.rows, grid.cols), inicio, meta, grid, jerarquia=jerarquia)
+                    self.assertTrue(es_camino(grid, camino, inicio, meta))
+                    self.assertGreaterEqual(costo_camino(grid, camino), costo_optimo(grid, inicio, meta))
+
+    def test_un_cluster_es_optimo(self):
+        for grid, inicio, meta in mapas(32, 100, 20):
+            jerarquia = Jerarquia.construir(grid, 20)
+            with self.subTest(rows=grid.rows, cols=grid.cols, inicio=inicio, meta=meta):
+                camino = hpa_search((grid.rows, grid.cols), inicio, meta, grid, jerarquia=jerarquia)
+                self.assertEqual(costo_camino(grid, camino), costo_optimo(grid, inicio, meta))
+
+    def test_aristas_internas_exactas(self):
+        # Las aristas entre transiciones de un cluster valen lo mismo que un
+        # Dijkstra dentro del cluster desde el origen
+        for grid, _, _ in mapas(33, 40, 40):
+            jerarquia = Jerarquia.construir(grid, 6)
+            for cluster, transiciones in jerarquia.transiciones.items():
+                limites = jerarquia.limites(cluster)
+                for origen in transiciones:
+                    esperado = distancias_en_cluster(grid, origen, limites, transiciones)
+                    internas = {destino: costo for destino, costo in jerarquia.aristas[origen]
+                                if destino in esperado}
+                    with self.subTest(rows=grid.rows, cols=grid.cols, cluster=cluster, origen=origen):
+                        self.assertEqual(internas, {d: c for d, c in esperado.items() if d != origen})
+
+    def test_guardar_y_cargar(self):
+        grid, _, _ = next(mapas(34, 1, 60))
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta_mapa = os.path.join(carpeta, "mapa.txt")
+            construida = cargar_jerarquia(ruta_mapa, grid, 8)
+            cargada = Jerarquia.cargar(ruta_jerarquia(ruta_mapa))
+            self.assertEqual(cargada.aristas, construida.aristas)
+            self.assertEqual(cargada.transiciones, construida.transiciones)
+            self.assertEqual((cargada.rows, cargada.cols, cargada.tamano_cluster, cargada.huella),
+                             (construida.rows, construida.cols, construida.tamano_cluster, construida.huella))
+
+            # Un archivo dañado se rechaza y cargar_jerarquia lo reconstruye
+            with open(ruta_jerarquia(ruta_mapa), "r+b") as file:
+                file.truncate(100)
+            with self.assertRaises(ValueError):
+                Jerarquia.cargar(ruta_jerarquia(ruta_mapa))
+            self.assertEqual(cargar_jerarquia(ruta_mapa, grid, 8).aristas, construida.aristas)
+
+    def test_jerarquia_de_otro_mapa(self):
+        grid = Grid.desde_obstaculos(20, 20, [(3, 3)])
+        otro = Grid.desde_obstaculos(20, 20, [(4, 4)])
+        with self.assertRaises(ValueError):
+            hpa_search((20, 20), (0, 0), (19, 19), otro, jerarquia=Jerarquia.construir(grid, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""
+jump_point_search debe retornar caminos celda por celda de costo óptimo,
+también cuando las líneas con veneno se buscan en varios bloques.
+
+Uso (desde la carpeta src):
+    python -m pytest -q tests
+"""
+import unittest
+from unittest import mock
+
+from proyectoIA.algorithms import jps
+from proyectoIA.algorithms.grid import Grid
+
+from oraculo import costo_camino, costo_optimo, es_camino, mapas
+
+
+class TestJumpPointSearch(unittest.TestCase):
+
+    def comprobar(self, semilla, cantidad, max_lado, max_densidad=0.6):
+        for grid, inicio, meta in mapas(semilla, cantidad, max_lado, max_densidad):
+            with self.subTest(rows=grid.rows, cols=grid.cols, inicio=inicio, meta=meta):
+                camino = jps.jump_point_search((grid.rows, grid.cols), inicio, meta, grid)
+                self.assertTrue(es_camino(grid, camino, inicio, meta))
+                self.assertEqual(costo_camino(grid, camino), costo_optimo(grid, inicio, meta))
+
+    def test_optimo(self):
+        self.comprobar(21, 300, 30)
+
+    def test_optimo_pocos_venenos(self):
+        # El caso para el que existe: zonas grandes de costo uniforme
+        self.comprobar(22, 100, 60, 0.02)
+
+    def test_bloques_chicos(self):
+        # Con bloques de pocas celdas cada fila queda en un bloque distinto
+        # (o varias filas por bloque) y el resultado no debe cambiar
+        for bloque in (1, 7, 64):
+            with mock.patch.object(jps, "BLOQUE_CELDAS", bloque):
+                self.comprobar(23, 60, 25)
+
+    def test_lineas_interesantes(self):
+        grid = Grid.desde_obstaculos(10, 12, [(4, 7)])
+        filas, columnas = jps.lineas_interesantes(grid, (0, 0), (9, 11))
+        self.assertEqual(filas, [0, 3, 4, 5, 9])
+        self.assertEqual(columnas, [0, 6, 7, 8, 11])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Lectura de mapas: el parser por bloques debe dar los mismos eventos que
+interpretar el archivo línea por línea con cualquier tamaño de bloque, y el
+formato binario debe conservar el tablero, las hormigas y los hongos.
+
+Uso (desde la carpeta src):
+    python -m pytest -q tests
+"""
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from proyectoIA.algorithms.grid import COSTO_NORMAL, Grid
+from proyectoIA.core.mapa import _parsear_linea, load_grid_multiple, parsear_mapa
+from proyectoIA.core.mapa_binario import (
+    CABECERA_V1, TAMANO_CABECERA, cargar_mapa_binario_multiple, guardar_mapa_binario,
+)
+
+
+def texto_aleatorio(rnd):
+    """Mapa de texto con líneas de venenos largas, espacios y líneas vacías"""
+    rows, cols = rnd.randint(1, 40), rnd.randint(1, 40)
+    lineas = [rnd.choice(("Tamaño", "Tamano")) + f"({rows},{cols})"]
+    for _ in range(rnd.randint(0, 4)):
+        tipo = rnd.choice(("Hormiga", "Hongo", "Veneno", "Veneno", ""))
+        if not tipo:
+            lineas.append(rnd.choice(("", "   ", "# comentario")))
+            continue
+        coords = [(rnd.randint(1, rows), rnd.randint(1, cols)) for _ in range(rnd.randint(1, 60))]
+        separador = rnd.choice((",", ", ", " ,"))
+        lineas.append(tipo + "(" + separador.join(f"({r},{rnd.choice(('', ' '))}{c})" for r, c in coords) + ")")
+    lineas.append(f"Hormiga({rnd.randint(1, rows)},{rnd.randint(1, cols)})")
+    lineas.append(f"Hongo({rnd.randint(1, rows)},{rnd.randint(1, cols)})")
+    rnd.shuffle(lineas)
+    final = rnd.choice(("", "\n"))
+    return "\n".join(lineas) + final
+
+
+def normalizar(eventos):
+    """Junta los eventos "veneno" seguidos (una línea larga llega en partes)"""
+    resultado = []
+    for evento in eventos:
+        if evento[0] == "veneno" and resultado and resultado[-1][0] == "veneno":
+            resultado[-1] = ("veneno", resultado[-1][1] + list(evento[1]))
+        else:
+            resultado.append(evento if evento[0] != "veneno" else ("veneno", list(evento[1])))
+    return resultado
+
+
+class TestParser(unittest.TestCase):
+
+    def test_bloques(self):
+        rnd = random.Random(51)
+        for caso in range(150):
+            texto = texto_aleatorio(rnd)
+            esperado = normalizar(filter(None, map(_parsear_linea, texto.split("\n"))))
+            for tamano_bloque in (1, 2, 3, 5, 8, 13, 64, 1 << 20):
+                with self.subTest(caso=caso, tamano_bloque=tamano_bloque):
+                    eventos = parsear_mapa(io.StringIO(texto), tamano_bloque)
+                    self.assertEqual(normalizar(eventos), esperado)
+
+    def test_load_grid_multiple(self):
+        rnd = random.Random(52)
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta = os.path.join(carpeta, "mapa.txt")
+            for caso in range(40):
+                texto = texto_aleatorio(rnd)
+                with open(ruta, "w", encoding="utf-8") as file:
+                    file.write(texto)
+
+                # Referencia: el mapa interpretado línea por línea
+                rows, cols, venenos, hormigas, hongos = 5, 5, [], {}, {}
+                for evento in filter(None, map(_parsear_linea, texto.split("\n"))):
+                    if evento[0] == "tamano":
+                        rows, cols = evento[1], evento[2]
+                    elif evento[0] == "veneno":
+                        venenos += [(int(r) - 1, int(c) - 1) for r, c in evento[1]]
+                    elif evento[0] == "hormiga":
+                        hormigas.update(dict.fromkeys(evento[1]))
+                    elif evento[0] == "hongo":
+                        hongos.update(dict.fromkeys(evento[1]))
+                esperado = Grid.desde_obstaculos(rows, cols, venenos)
+                for posicion in list(hormigas) + list(hongos):
+                    esperado.costos[esperado.indice(posicion)] = COSTO_NORMAL
+
+                with self.subTest(caso=caso):
+                    grid, leidas, leidos = load_grid_multiple(ruta, verbose=False)
+                    self.assertEqual((grid.rows, grid.cols), (rows, cols))
+                    self.assertEqual(bytes(grid.costos), bytes(esperado.costos))
+                    self.assertEqual((leidas, leidos), (list(hormigas), list(hongos)))
+
+
+class TestMapaBinario(unittest.TestCase):
+
+    def test_ida_y_vuelta(self):
+        rnd = random.Random(53)
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta_texto = os.path.join(carpeta, "mapa.txt")
+            ruta = os.path.join(carpeta, "mapa.bin")
+            for caso in range(30):
+                with open(ruta_texto, "w", encoding="utf-8") as file:
+                    file.write(texto_aleatorio(rnd))
+                grid, hormigas, hongos = load_grid_multiple(ruta_texto, verbose=False)
+                guardar_mapa_binario(ruta, grid, hormigas, hongos)
+
+                with self.subTest(caso=caso):
+                    leido, leidas, leidos = cargar_mapa_binario_multiple(ruta)
+                    self.assertEqual((leido.rows, leido.cols), (grid.rows, grid.cols))
+                    self.assertEqual(bytes(leido.costos), bytes(grid.costos))
+                    self.assertEqual((leidas, leidos), (hormigas, hongos))
+                    del leido
+
+    def test_version_1(self):
+        grid = Grid.desde_obstaculos(4, 6, [(1, 2), (3, 5)])
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta = os.path.join(carpeta, "v1.bin")
+            cabecera = CABECERA_V1.pack(b"PIAMAPA\0", 1, 4, 6, 0, 0, -1, -1)
+            with open(ruta, "wb") as file:
+                file.write(cabecera.ljust(TAMANO_CABECERA, b"\0"))
+                file.write(grid.costos)
+            leido, hormigas, hongos = cargar_mapa_binario_multiple(ruta)
+            self.assertEqual(bytes(leido.costos), bytes(grid.costos))
+            self.assertEqual((hormigas, hongos), ([(0, 0)], []))
+            del leido
+
+    def test_archivo_invalido(self):
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta = os.path.join(carpeta, "malo.bin")
+            with open(ruta, "wb") as file:
+                file.write(b"no es un mapa".ljust(TAMANO_CABECERA, b"\0"))
+            with self.assertRaises(ValueError):
+                cargar_mapa_binario_multiple(ruta)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+PlanificadorIncremental (D* Lite) debe mantener el camino óptimo después
+de agregar y quitar venenos y de mover la hormiga por el camino.
+
+Uso (desde la carpeta src):
+    python -m pytest -q tests
+"""
+import random
+import unittest
+
+from proyectoIA.algorithms.grid import COSTO_NORMAL, COSTO_VENENO, Grid
+from proyectoIA.algorithms.replanificacion import PlanificadorIncremental
+
+from oraculo import costo_camino, costo_optimo, es_camino, mapas
+
+
+class TestReplanificacion(unittest.TestCase):
+
+    def comprobar(self, planificador, grid, inicio, meta):
+        camino = planificador.camino()
+        self.assertTrue(es_camino(grid, camino, inicio, meta))
+        self.assertEqual(costo_camino(grid, camino), costo_optimo(grid, inicio, meta))
+        return camino
+
+    def test_ediciones_y_avance(self):
+        rnd = random.Random(41)
+        for grid, inicio, meta in mapas(42, 60, 25):
+            rows, cols = grid.rows, grid.cols
+            # Copia propia: el planificador no modifica el Grid que recibe
+            editado = Grid(rows, cols, bytearray(grid.costos))
+            planificador = PlanificadorIncremental((rows, cols), inicio, meta, grid)
+            with self.subTest(rows=rows, cols=cols, inicio=inicio, meta=meta):
+                camino = self.comprobar(planificador, editado, inicio, meta)
+                for _ in range(15):
+                    if rnd.random() < 0.3 and len(camino) > 1:
+                        # La hormiga avanza unos pasos por el camino
+                        inicio = camino[min(len(camino) - 1, rnd.randint(1, 3))]
+                        planificador.mover_inicio(inicio)
+                    else:
+                        posicion = (rnd.randrange(rows), rnd.randrange(cols))
+                        costo = rnd.choice((COSTO_NORMAL, COSTO_VENENO))
+                        planificador.cambiar_costo(posicion, costo)
+                        editado.cambiar_costo(posicion, costo)
+                    camino = self.comprobar(planificador, editado, inicio, meta)
+                self.assertEqual(bytes(planificador.costos), bytes(editado.costos))
+
+    def test_no_modifica_el_grid(self):
+        grid = Grid.desde_obstaculos(5, 5, [])
+        planificador = PlanificadorIncremental(5, (0, 0), (4, 4), grid)
+        planificador.agregar_veneno((2, 2))
+        self.assertEqual(grid.contar_venenos(), 0)
+
+    def test_costo_invalido(self):
+        planificador = PlanificadorIncremental(5, (0, 0), (4, 4), [])
+        for costo in (0, 2, 4):
+            with self.assertRaises(ValueError):
+                planificador.cambiar_costo((1, 1), costo)
+        self.assertEqual(len(planificador.camino()), 9)
+
+
+if __name__ == "__main__":
+    unittest.main()